@@ -6,34 +6,35 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from dotenv import load_dotenv
+from app.config import configure_app
+from app.utils.db_routing import RoutingSession
+from app.utils.json_provider import OrjsonProvider
+from app.utils.metrics import metrics
+from app.utils.profiler import profiler
+from app.utils.rate_limit import RateLimiter
 import os
 
 # Charger les variables d'environnement
 load_dotenv()
 
 # Initialiser les extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
-limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=["200 per day", "50 per hour"]
-)
+limiter = RateLimiter()
 
 def create_app():
     """Créer et configurer l'application Flask"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
-    # Configuration
-    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key')
-    app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'uploads')
-    app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 16777216))
+    # Configuration (variables d'environnement, voir app/config)
+    configure_app(app)
+    
+    # Mesures et profilage des requêtes (avant le limiteur pour mesurer aussi les 429)
+    metrics.init_app(app)
+    profiler.init_app(app)
     
     # Initialiser les extensions avec l'app
     db.init_app(app)
@@ -41,6 +42,29 @@ def create_app():
     jwt.init_app(app)
     limiter.init_app(app)
     
+    # Cache partagé (Redis si REDIS_URL, sinon LRU en mémoire)
+    from app.utils.cache import init_cache
+    init_cache(app)
+    
+    # File de tâches asynchrones (mode eager sans CELERY_BROKER_URL)
+    from app.tasks import init_celery
+    init_celery(app)
+    
+    # Vérifications de santé en arrière-plan (sonde /health/ready)
+    from app.utils.health import health as health_monitor
+    health_monitor.init_app(app)
+    
+    # Charger current_user depuis le cache des profils pour les routes @jwt_required
+    from app.services.auth_service import AuthService
+    
+    @jwt.user_lookup_loader
+    def load_current_user(_jwt_header, jwt_data):
+        return AuthService.get_user_profile(jwt_data['sub'])
+    
+    @jwt.user_lookup_error_loader
+    def current_user_not_found(_jwt_header, _jwt_data):
+        return {'error': 'Utilisateur non trouvé'}, 404
+    
     # Configurer CORS
     CORS(app, origins=os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(','))
     
@@ -52,20 +76,26 @@ def create_app():
     from app.models.planning import Planning
     from app.models.session import Session
     from app.models.notification import Notification
+    from app.models.statistics import DailyStat, TaskStat
     
     # Importer et enregistrer les blueprints (routes)
-    from app.api import auth
+    from app.api import auth, planning, schedules, jobs, notifications, statistics, tasks, subjects, health, export, calendar, sync
     app.register_blueprint(auth.bp)
+    app.register_blueprint(planning.bp)
+    app.register_blueprint(schedules.bp)
+    app.register_blueprint(jobs.bp)
+    app.register_blueprint(notifications.bp)
+    app.register_blueprint(statistics.bp)
+    app.register_blueprint(tasks.bp)
+    app.register_blueprint(subjects.bp)
+    app.register_blueprint(health.bp)
+    app.register_blueprint(export.bp)
+    app.register_blueprint(calendar.bp)
+    app.register_blueprint(sync.bp)
     
     # TODO: Décommenter après création des autres routes
-    # from app.api import users, subjects, tasks, schedules, planning, notifications, statistics
+    # from app.api import users
     # app.register_blueprint(users.bp)
-    # app.register_blueprint(subjects.bp)
-    # app.register_blueprint(tasks.bp)
-    # app.register_blueprint(schedules.bp)
-    # app.register_blueprint(planning.bp)
-    # app.register_blueprint(notifications.bp)
-    # app.register_blueprint(statistics.bp)
     
     # Route de test
     @app.route('/')
@@ -76,8 +106,8 @@ def create_app():
             'version': '1.0.0'
         }
     
-    @app.route('/health')
-    def health():
-        return {'status': 'healthy'}, 200
+    @app.errorhandler(429)
+    def too_many_requests(e):
+        return {'error': 'Trop de requêtes', 'details': e.description}, 429
     
     return app
@@ -5,7 +5,8 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import (
     jwt_required, 
     get_jwt_identity,
-    create_access_token
+    create_access_token,
+    current_user
 )
 from app.services.auth_service import AuthService
 from datetime import timedelta
@@ -158,6 +159,9 @@ def refresh():
 def get_current_user():
     """
     Récupérer le profil de l'utilisateur connecté
+
+    Lu sur la base principale : le profil relu après une invalidation est
+    remis en cache, une réplique en retard y remettrait l'ancienne version.
     
     Headers:
         Authorization: Bearer <access_token>
@@ -168,17 +172,9 @@ def get_current_user():
         404: Utilisateur non trouvé
     """
     try:
-        # Récupérer l'ID de l'utilisateur depuis le token (c'est une string)
-        user_id = get_jwt_identity()
-        
-        # Récupérer l'utilisateur (le service gère la conversion)
-        user = AuthService.get_user_by_id(user_id)
-        
-        if not user:
-            return jsonify({'error': 'Utilisateur non trouvé'}), 404
-        
+        # current_user est chargé par le user_lookup_loader (profil en cache)
         return jsonify({
-            'user': user.to_dict()
+            'user': current_user.to_dict()
         }), 200
         
     except Exception as e:
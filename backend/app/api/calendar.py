@@ -0,0 +1,93 @@
+"""
+Routes API pour le flux iCalendar des plannings
+"""
+from flask import Blueprint, Response, request, jsonify, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.calendar_service import CalendarService
+
+# Créer le Blueprint
+bp = Blueprint('calendar', __name__, url_prefix='/api/calendar')
+
+
+@bp.route('/token', methods=['GET'])
+@jwt_required()
+def feed_url():
+    """
+    URL du flux .ics de l'utilisateur connecté (à ajouter dans son agenda)
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Returns:
+        200: {"token": "...", "url": "https://.../api/calendar/<token>.ics"}
+        404: Utilisateur non trouvé
+    """
+    try:
+        token = CalendarService.make_token(get_jwt_identity())
+        return jsonify({'token': token, 'url': url_for('calendar.feed', token=token, _external=True)}), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/token', methods=['POST'])
+@jwt_required()
+def regenerate_token():
+    """
+    Régénérer l'URL du flux .ics (l'ancienne URL cesse de fonctionner)
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Returns:
+        200: {"token": "...", "url": "https://.../api/calendar/<token>.ics"}
+        404: Utilisateur non trouvé
+    """
+    try:
+        token = CalendarService.regenerate_token(get_jwt_identity())
+        return jsonify({'token': token, 'url': url_for('calendar.feed', token=token, _external=True)}), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/<token>.ics', methods=['GET'])
+def feed(token):
+    """
+    Flux iCalendar : cours de l'emploi du temps et sessions des plannings actifs
+
+    Authentifié par le jeton de l'URL (les agendas n'envoient pas d'en-tête
+    Authorization). Réponse conditionnelle : si l'en-tête If-None-Match
+    correspond à la version en cache, la réponse 304 est renvoyée sans
+    requête SQL ; sinon le flux est lu dans le cache.
+
+    Returns:
+        200: Calendrier text/calendar
+        304: Aucun changement depuis le dernier appel
+        404: Jeton invalide ou régénéré
+    """
+    try:
+        user_id = CalendarService.user_for_token(token)
+        version = CalendarService.get_version(user_id)
+        etag = f"calendar-{user_id}-{version}"
+
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(
+                CalendarService.get_feed(user_id, version), mimetype='text/calendar'
+            )
+            response.headers['Content-Disposition'] = 'inline; filename="planning.ics"'
+
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
@@ -0,0 +1,90 @@
+"""
+Routes API pour l'export et l'import des données de l'utilisateur
+"""
+import gzip
+import io
+from datetime import date
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.export_service import ExportService
+from app.utils.db_routing import read_replica, replica_stream
+
+# Créer le Blueprint
+bp = Blueprint('export', __name__, url_prefix='/api/export')
+
+
+def _open_upload(stream):
+    """Lecteur ligne par ligne d'un envoi NDJSON, décompressé s'il est en gzip"""
+    reader = stream if hasattr(stream, 'peek') else io.BufferedReader(stream)
+    if reader.peek(2)[:2] == b'\x1f\x8b':
+        return gzip.GzipFile(fileobj=reader)
+    return reader
+
+
+@bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def export_data():
+    """
+    Télécharger toutes les données de l'utilisateur connecté (NDJSON en flux)
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Query:
+        format: ndjson (par défaut) ou gzip
+
+    Returns:
+        200: Fichier NDJSON ou NDJSON compressé, envoyé par blocs
+        400: Format inconnu
+    """
+    try:
+        user_id = get_jwt_identity()
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in ('ndjson', 'gzip'):
+            raise ValueError("Le format doit être ndjson ou gzip")
+
+        compress = export_format == 'gzip'
+        chunks = ExportService.stream_export(user_id, compress=compress)
+        filename = f"export-{user_id}-{date.today().isoformat()}.ndjson{'.gz' if compress else ''}"
+        return Response(
+            stream_with_context(replica_stream(chunks)),
+            mimetype='application/gzip' if compress else 'application/x-ndjson',
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_data():
+    """
+    Importer un export (NDJSON ou gzip) dans le compte de l'utilisateur connecté
+
+    Les données s'ajoutent à celles du compte, avec de nouveaux IDs.
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Body:
+        Fichier d'export brut, ou multipart/form-data avec le champ file
+
+    Returns:
+        200: Nombre de lignes importées par table
+        400: Fichier invalide (rien n'est importé)
+    """
+    try:
+        user_id = get_jwt_identity()
+        upload = request.files.get('file')
+        stream = upload.stream if upload is not None else request.stream
+        counts = ExportService.import_records(user_id, _open_upload(stream))
+        return jsonify({'message': 'Données importées', 'imported': counts}), 200
+
+    except (ValueError, OSError, EOFError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
@@ -0,0 +1,42 @@
+"""
+Routes des sondes de santé (liveness et readiness)
+
+- /health/live : le processus répond (aucune vérification externe). Un échec
+  doit entraîner le redémarrage du conteneur.
+- /health/ready : dernier état des vérifications d'arrière-plan
+  (app/utils/health.py). Un échec retire le pod du trafic sans le redémarrer.
+- /health : alias de /health/live, conservé pour les sondes existantes.
+
+Les sondes ne sont pas soumises à la limitation de débit et ne touchent ni la
+base ni Redis.
+"""
+from flask import Blueprint
+from app.utils.health import health
+
+# Créer le Blueprint
+bp = Blueprint('health', __name__, url_prefix='/health')
+
+
+@bp.route('', methods=['GET'])
+@bp.route('/live', methods=['GET'])
+def live():
+    """
+    Sonde de vivacité
+
+    Returns:
+        200: Le processus traite les requêtes
+    """
+    return {'status': 'healthy'}, 200
+
+
+@bp.route('/ready', methods=['GET'])
+def ready():
+    """
+    Sonde de disponibilité
+
+    Returns:
+        200: Base, Redis et file de tâches disponibles
+        503: Une vérification échoue, est en retard ou n'a pas encore eu lieu
+    """
+    is_ready, body = health.readiness()
+    return body, 200 if is_ready else 503
@@ -0,0 +1,84 @@
+"""
+Routes API pour suivre les traitements asynchrones
+"""
+import uuid
+from flask import Blueprint, jsonify, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.tasks import celery
+
+# Créer le Blueprint
+bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+
+def new_job_id(user_id):
+    """
+    ID d'un traitement mis en file pour un utilisateur (task_id Celery)
+
+    L'ID commence par celui du propriétaire : get_job vérifie la propriété
+    dans tous les états, y compris en attente, quand Celery ne connaît encore
+    ni les arguments ni le résultat du traitement.
+    """
+    return f"{int(user_id)}-{uuid.uuid4()}"
+
+
+def _job_owner(job_id):
+    """ID du propriétaire inscrit dans l'ID d'un traitement (None si absent)"""
+    owner, separator, _rest = job_id.partition('-')
+    return int(owner) if separator and owner.isdigit() else None
+
+
+def job_accepted(job, **extra):
+    """
+    Réponse 202 renvoyée quand un traitement est mis en file
+
+    Args:
+        job: Résultat Celery (AsyncResult) du traitement
+        **extra: Champs supplémentaires de la réponse
+
+    Returns:
+        tuple: Réponse JSON et code 202
+    """
+    status_url = url_for('jobs.get_job', job_id=job.id)
+    response = jsonify({
+        'message': 'Traitement en cours',
+        'job_id': job.id,
+        'status_url': status_url,
+        **extra
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+
+@bp.route('/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """
+    Consulter l'état d'un traitement asynchrone
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Returns:
+        200: État du traitement (pending, started, success, failure) et résultat
+        404: Traitement non trouvé ou d'un autre utilisateur (quel que soit son état)
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        if _job_owner(job_id) != user_id:
+            return jsonify({'error': 'Traitement non trouvé'}), 404
+
+        job = celery.AsyncResult(job_id)
+        payload = {'job_id': job_id, 'status': job.state.lower()}
+
+        if job.successful():
+            result = job.result or {}
+            if result.get('user_id') != user_id:
+                return jsonify({'error': 'Traitement non trouvé'}), 404
+            payload['result'] = result
+        elif job.failed():
+            payload['error'] = str(job.result)
+
+        return jsonify(payload), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
@@ -0,0 +1,119 @@
+"""
+Routes API pour les notifications
+"""
+from flask import Blueprint, request, jsonify, make_response
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.notification_service import NotificationService
+from app.utils.db_routing import read_replica
+from app.utils.pagination import parse_limit
+
+# Créer le Blueprint
+bp = Blueprint('notifications', __name__, url_prefix='/api/notifications')
+
+
+@bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def list_notifications():
+    """
+    Lister les notifications de l'utilisateur connecté, les plus récentes d'abord
+
+    Query:
+        lue: "true" ou "false" pour filtrer sur l'état de lecture
+        unread: "true" pour ne renvoyer que les non lues (équivaut à lue=false)
+        limit: Taille de la page (50 par défaut, 200 au plus)
+        cursor: Curseur "next_cursor" de la page précédente
+
+    Returns:
+        200: {"notifications": [...], "next_cursor": "..." ou null}
+        400: Curseur invalide
+    """
+    try:
+        user_id = get_jwt_identity()
+        lue = request.args.get('lue')
+        if lue is not None:
+            lue = lue.lower() == 'true'
+        elif request.args.get('unread', 'false').lower() == 'true':
+            lue = False
+
+        page = NotificationService.list_notifications(
+            user_id,
+            lue=lue,
+            limit=parse_limit(request.args.get('limit', type=int)),
+            cursor=request.args.get('cursor')
+        )
+        return jsonify(page), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/unread', methods=['GET'])
+@jwt_required()
+def unread_summary():
+    """
+    Nombre de notifications non lues et notifications récentes (polling)
+
+    Réponse conditionnelle : si l'en-tête If-None-Match correspond à la
+    version en cache, la réponse 304 est renvoyée sans requête SQL. Le
+    résumé est lu sur la base principale : il est remis en cache sous la
+    nouvelle version, une réplique en retard y remettrait l'ancien contenu.
+
+    Headers:
+        Authorization: Bearer <access_token>
+        If-None-Match: ETag reçu lors du dernier appel (optionnel)
+
+    Returns:
+        200: {"unread": 3, "recent": [...]}
+        304: Aucun changement depuis le dernier appel
+    """
+    try:
+        user_id = get_jwt_identity()
+        etag = f"notifications-{user_id}-{NotificationService.get_version(user_id)}"
+
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+        else:
+            response = jsonify(NotificationService.get_unread_summary(user_id))
+
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/read', methods=['POST'])
+@jwt_required()
+def mark_as_read():
+    """
+    Marquer des notifications comme lues
+
+    Body:
+        {
+            "ids": [1, 2, 3]
+        }
+        Sans "ids", toutes les notifications non lues sont marquées.
+
+    Returns:
+        200: Nombre de notifications marquées
+        400: Erreur de validation
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+        ids = data.get('ids')
+
+        if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, int) for i in ids)):
+            raise ValueError("Le champ ids doit être une liste d'entiers")
+
+        updated = NotificationService.mark_as_read(user_id, ids)
+        return jsonify({'message': 'Notifications marquées comme lues', 'updated': updated}), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
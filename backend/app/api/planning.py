@@ -0,0 +1,223 @@
+"""
+Routes API pour les plannings d'étude
+"""
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.planning_service import PlanningService
+from app.api.jobs import job_accepted, new_job_id
+from app.tasks.jobs import generate_planning
+from app.utils.db_routing import read_replica
+from app.utils.idempotency import idempotent
+from app.utils.pagination import parse_limit
+
+# Créer le Blueprint
+bp = Blueprint('planning', __name__, url_prefix='/api/planning')
+
+
+@bp.route('/generate', methods=['POST'])
+@jwt_required()
+def generate():
+    """
+    Lancer la génération d'un planning d'étude à partir des tâches ouvertes
+    et de l'emploi du temps
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Body:
+        {
+            "date_debut": "2025-09-01",
+            "date_fin": "2026-01-31",
+            "titre": "Semestre 1"
+        }
+
+    Returns:
+        202: Génération lancée (suivre le job via /api/jobs/<job_id>)
+        400: Erreur de validation
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json() or {}
+
+        # Valider avant de mettre en file
+        date_debut, date_fin = PlanningService.parse_period(data.get('date_debut'), data.get('date_fin'))
+
+        job = generate_planning.apply_async(
+            (int(user_id), date_debut.isoformat(), date_fin.isoformat(), data.get('titre')),
+            task_id=new_job_id(user_id)
+        )
+        return job_accepted(job)
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def list_plannings():
+    """
+    Lister les plannings de l'utilisateur connecté
+
+    Returns:
+        200: Liste des plannings avec leurs sessions
+    """
+    try:
+        user_id = get_jwt_identity()
+        plannings = PlanningService.get_user_plannings(user_id)
+        return jsonify({'plannings': plannings}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/<int:planning_id>', methods=['GET'])
+@read_replica
+@jwt_required()
+def get_planning(planning_id):
+    """
+    Récupérer un planning de l'utilisateur connecté
+
+    Returns:
+        200: Planning avec ses sessions
+        404: Planning non trouvé
+    """
+    try:
+        user_id = get_jwt_identity()
+        planning = PlanningService.get_planning(user_id, planning_id)
+
+        if not planning:
+            return jsonify({'error': 'Planning non trouvé'}), 404
+
+        return jsonify({'planning': planning}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/sessions', methods=['GET'])
+@read_replica
+@jwt_required()
+def list_sessions():
+    """
+    Lister les sessions d'un planning, par date et heure
+
+    Query:
+        planning_id: ID du planning (par défaut le planning actif)
+        completee: "true" ou "false" pour filtrer sur la complétion
+        date_debut: Premier jour (AAAA-MM-JJ)
+        limit: Taille de la page (50 par défaut, 200 au plus)
+        cursor: Curseur "next_cursor" de la page précédente
+
+    Returns:
+        200: {"planning_id": 1, "sessions": [...], "next_cursor": "..." ou null}
+        400: Paramètre ou curseur invalide
+        404: Planning non trouvé
+    """
+    try:
+        user_id = get_jwt_identity()
+        completee = request.args.get('completee')
+        if completee is not None:
+            completee = completee.lower() == 'true'
+
+        page = PlanningService.list_sessions(
+            user_id,
+            planning_id=request.args.get('planning_id', type=int),
+            completee=completee,
+            date_debut=request.args.get('date_debut'),
+            limit=parse_limit(request.args.get('limit', type=int)),
+            cursor=request.args.get('cursor')
+        )
+        if page is None:
+            return jsonify({'error': 'Planning non trouvé'}), 404
+
+        return jsonify(page), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/tasks/<int:task_id>/replan', methods=['POST'])
+@jwt_required()
+def replan_task(task_id):
+    """
+    Replanifier les sessions touchées par la modification d'une tâche
+
+    Seules les sessions de la tâche (et, si nécessaire, celles des tâches moins
+    urgentes dans la même fenêtre) sont déplacées dans le planning actif.
+
+    Returns:
+        200: Diff des sessions insérées, mises à jour et supprimées
+        404: Tâche non trouvée
+    """
+    try:
+        user_id = get_jwt_identity()
+        diff = PlanningService.replan_task(user_id, task_id)
+        return jsonify(diff), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/sessions/<int:session_id>/complete', methods=['POST'])
+@jwt_required()
+def complete_session(session_id):
+    """
+    Marquer une session d'étude comme complétée (ou non)
+
+    Body:
+        {"completee": true}
+
+    Returns:
+        200: Session mise à jour
+        404: Session non trouvée
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+        session = PlanningService.set_session_completed(user_id, session_id, data.get('completee', True))
+        return jsonify({'session': session}), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/sessions/complete', methods=['POST'])
+@jwt_required()
+@idempotent
+def complete_sessions():
+    """
+    Marquer plusieurs sessions comme complétées (ou non) en une transaction
+
+    Headers:
+        Idempotency-Key: Clé optionnelle (voir POST /api/tasks/bulk)
+
+    Body:
+        {"sessions": [{"id": 1, "completee": true}, {"id": 2, "completee": false}]}
+
+    Returns:
+        200: {"updated": [...], "unchanged": [ids], "errors": [...]}
+        400: Corps invalide ou trop d'éléments
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+        items = data.get('sessions') if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            return jsonify({'error': 'Le champ sessions doit être une liste'}), 400
+
+        result = PlanningService.set_sessions_completed(user_id, items)
+        return jsonify(result), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
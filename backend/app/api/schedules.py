@@ -0,0 +1,83 @@
+"""
+Routes API pour les emplois du temps
+"""
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.schedule_service import ScheduleService
+from app.api.jobs import job_accepted, new_job_id
+from app.tasks.jobs import import_schedule_courses
+from app.utils.db_routing import read_replica
+
+# Créer le Blueprint
+bp = Blueprint('schedules', __name__, url_prefix='/api/schedules')
+
+
+@bp.route('/upload', methods=['POST'])
+@jwt_required()
+def upload():
+    """
+    Importer un emploi du temps PDF
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Body (multipart/form-data):
+        file: Fichier PDF de l'emploi du temps
+
+    Returns:
+        202: Analyse lancée (suivre le job via /api/jobs/<job_id>)
+        400: Fichier invalide
+    """
+    try:
+        user_id = get_jwt_identity()
+        schedule, digest = ScheduleService.create_schedule(user_id, request.files.get('file'))
+
+        job = import_schedule_courses.apply_async((schedule.id, digest), task_id=new_job_id(user_id))
+        return job_accepted(job, schedule_id=schedule.id)
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def list_schedules():
+    """
+    Lister les emplois du temps de l'utilisateur connecté
+
+    Returns:
+        200: Liste des emplois du temps (sans les cours)
+    """
+    try:
+        user_id = get_jwt_identity()
+        return jsonify({'schedules': ScheduleService.get_user_schedules(user_id)}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/<int:schedule_id>', methods=['GET'])
+@read_replica
+@jwt_required()
+def get_schedule(schedule_id):
+    """
+    Récupérer un emploi du temps avec ses cours
+
+    Returns:
+        200: Emploi du temps
+        404: Emploi du temps non trouvé
+    """
+    try:
+        user_id = get_jwt_identity()
+        schedule = ScheduleService.get_schedule(user_id, schedule_id)
+
+        if not schedule:
+            return jsonify({'error': 'Emploi du temps non trouvé'}), 404
+
+        return jsonify({'schedule': schedule}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
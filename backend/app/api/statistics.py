@@ -0,0 +1,43 @@
+"""
+Routes API pour les statistiques d'étude
+"""
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.planning_service import PlanningService
+from app.services.statistics_service import StatisticsService
+from app.utils.db_routing import read_replica
+
+# Créer le Blueprint
+bp = Blueprint('statistics', __name__, url_prefix='/api/statistics')
+
+
+@bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def dashboard():
+    """
+    Statistiques du tableau de bord (lues dans les agrégats précalculés)
+
+    Query:
+        date_debut: Premier jour (AAAA-MM-JJ, par défaut il y a 30 jours)
+        date_fin: Dernier jour (AAAA-MM-JJ, par défaut aujourd'hui)
+
+    Returns:
+        200: Temps d'étude par matière, taux de complétion, série quotidienne
+             et tâches en retard par priorité
+        400: Dates invalides
+    """
+    try:
+        user_id = get_jwt_identity()
+        date_debut = request.args.get('date_debut')
+        date_fin = request.args.get('date_fin')
+        if date_debut or date_fin:
+            date_debut, date_fin = PlanningService.parse_period(date_debut, date_fin)
+
+        statistics = StatisticsService.get_dashboard(user_id, date_debut, date_fin)
+        return jsonify(statistics), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
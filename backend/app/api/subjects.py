@@ -0,0 +1,41 @@
+"""
+Routes API pour les matières
+"""
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.subject_service import SubjectService
+from app.utils.db_routing import read_replica
+from app.utils.pagination import parse_limit
+
+# Créer le Blueprint
+bp = Blueprint('subjects', __name__, url_prefix='/api/subjects')
+
+
+@bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def list_subjects():
+    """
+    Lister les matières de l'utilisateur connecté, par titre
+
+    Query:
+        limit: Taille de la page (50 par défaut, 200 au plus)
+        cursor: Curseur "next_cursor" de la page précédente
+
+    Returns:
+        200: {"subjects": [...], "next_cursor": "..." ou null}
+        400: Curseur invalide
+    """
+    try:
+        user_id = get_jwt_identity()
+        page = SubjectService.list_subjects(
+            user_id,
+            limit=parse_limit(request.args.get('limit', type=int)),
+            cursor=request.args.get('cursor')
+        )
+        return jsonify(page), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
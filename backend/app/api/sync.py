@@ -0,0 +1,44 @@
+"""
+Routes API pour la synchronisation incrémentale des clients hors ligne
+"""
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.sync_service import SyncService
+
+# Créer le Blueprint
+bp = Blueprint('sync', __name__, url_prefix='/api/sync')
+
+
+@bp.route('', methods=['GET'])
+@jwt_required()
+def sync():
+    """
+    Lignes modifiées et supprimées depuis le dernier appel
+
+    Pas de @read_replica : une réplique en retard ferait avancer les curseurs
+    au-delà de lignes qu'elle n'a pas encore reçues.
+
+    Query:
+        subjects, tasks, schedules, courses, plannings, sessions,
+        notifications, deleted: Curseurs renvoyés par l'appel précédent
+            (absents au premier appel)
+
+    Le client applique d'abord les suppressions puis les lignes modifiées
+    (remplacées par ID), enregistre les nouveaux curseurs et rappelle tout
+    de suite la route tant que has_more est vrai. Si reset est vrai, il
+    efface ses données locales avant d'appliquer la réponse.
+
+    Returns:
+        200: {"reset": false, "has_more": false, "cursors": {...},
+              "changes": {"tasks": {"changed": [...], "deleted": [ids]}, ...}}
+        400: Curseur invalide
+    """
+    try:
+        user_id = get_jwt_identity()
+        result = SyncService.sync(user_id, request.args.to_dict())
+        return jsonify(result), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
@@ -0,0 +1,91 @@
+"""
+Routes API pour les tâches
+"""
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.task_service import TaskService
+from app.utils.db_routing import read_replica
+from app.utils.idempotency import idempotent
+from app.utils.pagination import parse_limit
+
+# Créer le Blueprint
+bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
+
+
+@bp.route('', methods=['GET'])
+@read_replica
+@jwt_required()
+def list_tasks():
+    """
+    Lister les tâches de l'utilisateur connecté, par échéance croissante
+
+    Query:
+        etat: Filtrer sur l'état (à faire, en cours, terminée)
+        subject_id: Filtrer sur la matière
+        limit: Taille de la page (50 par défaut, 200 au plus)
+        cursor: Curseur "next_cursor" de la page précédente
+
+    Returns:
+        200: {"tasks": [...], "next_cursor": "..." ou null}
+        400: Filtre ou curseur invalide
+    """
+    try:
+        user_id = get_jwt_identity()
+        page = TaskService.list_tasks(
+            user_id,
+            etat=request.args.get('etat'),
+            subject_id=request.args.get('subject_id', type=int),
+            limit=parse_limit(request.args.get('limit', type=int)),
+            cursor=request.args.get('cursor')
+        )
+        return jsonify(page), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
+
+
+@bp.route('/bulk', methods=['POST'])
+@jwt_required()
+@idempotent
+def bulk_tasks():
+    """
+    Créer, modifier et supprimer des tâches en une seule transaction
+
+    Headers:
+        Idempotency-Key: Clé optionnelle ; une requête renvoyée avec la même
+            clé reçoit la réponse du premier passage sans nouvelle écriture
+
+    Body:
+        {
+            "create": [{"titre": "...", "date_limite": "2025-06-01T18:00", "priorite": 3, ...}],
+            "update": [{"id": 12, "etat": "terminée"}],
+            "delete": [15, 16]
+        }
+
+    Returns:
+        200: {"created": [...], "updated": [...], "unchanged": [...], "deleted": [...], "errors": [...]}
+        400: Corps invalide ou trop d'éléments
+    """
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Corps JSON requis'}), 400
+        operations = {name: data.get(name) or [] for name in ('create', 'update', 'delete')}
+        if not all(isinstance(items, list) for items in operations.values()):
+            return jsonify({'error': 'Les champs create, update et delete doivent être des listes'}), 400
+
+        result = TaskService.bulk_write(
+            user_id,
+            create=operations['create'],
+            update_items=operations['update'],
+            delete_ids=operations['delete']
+        )
+        return jsonify(result), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
@@ -0,0 +1,147 @@
+"""
+Configuration de l'application à partir des variables d'environnement
+
+Les variables sont lues à l'appel de configure_app() (et non à l'import), ce
+qui permet de créer plusieurs applications avec des environnements différents
+dans un même processus (tests, benchmarks).
+
+Base de données :
+    DATABASE_URL          Base principale (lectures et écritures)
+    DATABASE_REPLICA_URL  Réplique en lecture seule (optionnelle), utilisée par
+                          les routes décorées avec @read_replica
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING      Options du pool (ignorées pour SQLite)
+    DB_REPLICA_POOL_SIZE, DB_REPLICA_MAX_OVERFLOW  Pool de la réplique
+                          (par défaut, mêmes valeurs que la base principale)
+"""
+import os
+from app.utils.rate_limit import storage_uri
+
+# Clé du bind SQLAlchemy de la réplique en lecture
+REPLICA_BIND = 'replica'
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)) == 'True'
+
+
+def engine_options(url, prefix='DB_'):
+    """
+    Options du moteur SQLAlchemy pour une URL
+
+    SQLite n'utilise pas de pool de connexions réseau : aucune option n'est
+    renvoyée (Flask-SQLAlchemy choisit lui-même le pool adapté).
+
+    Args:
+        url: URL de la base
+        prefix: Préfixe des variables d'environnement ('DB_' ou 'DB_REPLICA_')
+
+    Returns:
+        dict: Arguments de create_engine
+    """
+    if not url or url.startswith('sqlite'):
+        return {}
+
+    def setting(name, default):
+        return _env_int(f'{prefix}{name}', _env_int(f'DB_{name}', default))
+
+    return {
+        'pool_size': setting('POOL_SIZE', 5),
+        'max_overflow': setting('MAX_OVERFLOW', 10),
+        'pool_timeout': setting('POOL_TIMEOUT', 10),
+        'pool_recycle': setting('POOL_RECYCLE', 1800),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True)
+    }
+
+
+def configure_app(app):
+    """
+    Renseigner app.config à partir de l'environnement
+
+    Args:
+        app: Application Flask
+    """
+    config = app.config
+
+    config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
+    config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key')
+
+    # Base principale et réplique en lecture (pool dimensionné par gunicorn.conf.py)
+    database_url = os.getenv('DATABASE_URL')
+    replica_url = os.getenv('DATABASE_REPLICA_URL')
+    config['SQLALCHEMY_DATABASE_URI'] = database_url
+    config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(database_url)
+    config['SQLALCHEMY_BINDS'] = {}
+    if replica_url:
+        config['SQLALCHEMY_BINDS'][REPLICA_BIND] = {
+            'url': replica_url,
+            **engine_options(replica_url, prefix='DB_REPLICA_')
+        }
+
+    # Emplois du temps PDF
+    config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'uploads')
+    config['MAX_CONTENT_LENGTH'] = _env_int('MAX_CONTENT_LENGTH', 16777216)
+    config['PDF_IMPORT_WORKERS'] = _env_int('PDF_IMPORT_WORKERS', os.cpu_count() or 1)
+    config['PDF_CACHE_FOLDER'] = os.getenv(
+        'PDF_CACHE_FOLDER', os.path.join(config['UPLOAD_FOLDER'], 'timetable_cache')
+    )
+    config['PDF_CACHE_MAX_BYTES'] = _env_int('PDF_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+
+    # Modèle de prédiction de la charge de travail (app/ml/workload.py)
+    config['WORKLOAD_MODEL_PATH'] = os.getenv(
+        'WORKLOAD_MODEL_PATH', os.path.join(config['UPLOAD_FOLDER'], 'models', 'workload.joblib')
+    )
+
+    # File de tâches et cache
+    config['CELERY_BROKER_URL'] = os.getenv('CELERY_BROKER_URL')
+    config['CELERY_RESULT_BACKEND'] = os.getenv('CELERY_RESULT_BACKEND')
+    config['CELERY_TASK_ALWAYS_EAGER'] = _env_bool('CELERY_TASK_ALWAYS_EAGER', False)
+    config['REDIS_URL'] = os.getenv('REDIS_URL')
+    config['CACHE_MAX_ENTRIES'] = _env_int('CACHE_MAX_ENTRIES', 10000)
+    config['USER_CACHE_TTL'] = _env_int('USER_CACHE_TTL', 30)
+
+    # Mots de passe
+    config['PASSWORD_HASHER'] = os.getenv('PASSWORD_HASHER', 'scrypt')
+    config['PASSWORD_HASH_COST'] = _env_int('PASSWORD_HASH_COST', 0) or None
+    # Threads de hachage par processus (gunicorn.conf.py répartit les CPU entre workers)
+    config['PASSWORD_HASH_WORKERS'] = _env_int('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+
+    # Limitation de débit
+    config['RATELIMIT_STORAGE_URI'] = storage_uri({
+        'RATELIMIT_STORAGE_URI': os.getenv('RATELIMIT_STORAGE_URI'),
+        'REDIS_URL': config['REDIS_URL']
+    })
+    config['RATELIMIT_STORAGE_OPTIONS'] = {'socket_timeout': 0.2, 'socket_connect_timeout': 0.2}
+    config['RATELIMIT_STRATEGY'] = os.getenv('RATELIMIT_STRATEGY', 'sliding-window-counter')
+    config['RATELIMIT_KEY_PREFIX'] = 'sa-limits'
+    config['RATELIMIT_ENABLED'] = _env_bool('RATELIMIT_ENABLED', True)
+    config['RATELIMIT_DEFAULT'] = os.getenv('RATELIMIT_DEFAULT', '200 per day;50 per hour')
+
+    # Écritures groupées (/api/tasks/bulk, /api/planning/sessions/complete)
+    config['BULK_MAX_ITEMS'] = _env_int('BULK_MAX_ITEMS', 500)
+    config['IDEMPOTENCY_TTL'] = _env_int('IDEMPOTENCY_TTL', 86400)
+
+    # Synchronisation incrémentale (/api/sync)
+    config['SYNC_PAGE_SIZE'] = _env_int('SYNC_PAGE_SIZE', 500)
+    config['SYNC_LAG_SECONDS'] = _env_int('SYNC_LAG_SECONDS', 10)
+    config['SYNC_TOMBSTONE_DAYS'] = _env_int('SYNC_TOMBSTONE_DAYS', 30)
+
+    # Sonde de disponibilité (/health/ready)
+    config['HEALTH_CHECK_INTERVAL'] = float(os.getenv('HEALTH_CHECK_INTERVAL', 2))
+    config['HEALTH_MAX_QUEUE_DEPTH'] = _env_int('HEALTH_MAX_QUEUE_DEPTH', 100)
+
+    # Flux iCalendar des plannings (/api/calendar)
+    config['CALENDAR_TIMEZONE'] = os.getenv('CALENDAR_TIMEZONE', 'Europe/Paris')
+    config['CALENDAR_COURSE_WEEKS'] = _env_int('CALENDAR_COURSE_WEEKS', 16)
+    config['CALENDAR_CACHE_TTL'] = _env_int('CALENDAR_CACHE_TTL', 86400)
+
+    # Métriques Prometheus (/metrics) et profilage des requêtes lentes
+    config['METRICS_ENABLED'] = _env_bool('METRICS_ENABLED', False)
+    config['PROFILE_SLOW_REQUEST_MS'] = _env_int('PROFILE_SLOW_REQUEST_MS', 0)
+    config['PROFILE_INTERVAL_MS'] = _env_int('PROFILE_INTERVAL_MS', 5)
+    config['PROFILE_DIR'] = os.getenv('PROFILE_DIR', 'profiles')
@@ -0,0 +1,354 @@
+"""
+Moteur de génération de planning d'étude
+
+Le temps libre d'un planning est représenté par un bitset (un entier Python) :
+chaque bit correspond à un créneau de SLOT_MINUTES minutes entre date_debut et
+date_fin. Les cours de l'emploi du temps, répétés chaque semaine, sont retirés
+par masque ; la recherche d'un bloc libre de k créneaux consécutifs se fait par
+décalages et ET logiques sur l'entier entier, sans parcourir les créneaux un à un.
+"""
+import math
+import unicodedata
+from datetime import datetime, time, timedelta
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_WEEK = 7 * SLOTS_PER_DAY
+
+# Jours de la semaine tels que saisis dans Course.jour (index = date.weekday())
+JOURS = ['lundi', 'mardi', 'mercredi', 'jeudi', 'vendredi', 'samedi', 'dimanche']
+
+# Nombre d'heures d'étude par défaut selon la priorité (1=Basse, 3=Moyenne, 5=Haute)
+DEFAULT_HOURS_BY_PRIORITY = {1: 2, 2: 3, 3: 4, 4: 5, 5: 6}
+
+ETAT_TERMINEE = 'terminée'
+
+
+def normalize_jour(jour):
+    """
+    Convertir un nom de jour ('Lundi', 'MERCREDI', 'Mer.') en index 0-6
+
+    Returns:
+        int: Index du jour (0 = lundi) ou None si inconnu
+    """
+    if not jour:
+        return None
+    text = unicodedata.normalize('NFKD', jour).encode('ascii', 'ignore').decode().strip().lower()
+    text = text.rstrip('.')
+    for index, name in enumerate(JOURS):
+        if len(text) >= 3 and name.startswith(text[:3]):
+            return index
+    return None
+
+
+def time_to_slot(value, round_up=False):
+    """Convertir une heure en index de créneau dans la journée"""
+    minutes = value.hour * 60 + value.minute
+    if round_up:
+        return -(-minutes // SLOT_MINUTES)
+    return minutes // SLOT_MINUTES
+
+
+def slot_to_time(slot):
+    """Convertir un index de créneau dans la journée en heure"""
+    if slot >= SLOTS_PER_DAY:
+        return time(23, 59)
+    minutes = slot * SLOT_MINUTES
+    return time(minutes // 60, minutes % 60)
+
+
+def _repeat(pattern, period, count):
+    """Répéter un motif de `period` bits `count` fois (par doublement)"""
+    result, width, done = 0, period, 0
+    block, block_count = pattern, 1
+    while count:
+        if count & 1:
+            result |= block << (done * width)
+            done += block_count
+        block |= block << (block_count * width)
+        block_count *= 2
+        count >>= 1
+    return result
+
+
+def _mask(start, length):
+    """Masque de `length` bits à partir de `start`"""
+    return ((1 << length) - 1) << start if length > 0 else 0
+
+
+class FreeTime:
+    """Temps libre d'une période sous forme de bitset de créneaux"""
+
+    def __init__(self, date_debut, date_fin, day_start=time(8, 0), day_end=time(22, 0)):
+        """
+        Args:
+            date_debut: Premier jour de la période (inclus)
+            date_fin: Dernier jour de la période (inclus)
+            day_start: Début des heures d'étude dans la journée
+            day_end: Fin des heures d'étude dans la journée
+        """
+        if date_fin < date_debut:
+            raise ValueError("La date de fin doit être postérieure à la date de début")
+
+        self.date_debut = date_debut
+        self.n_days = (date_fin - date_debut).days + 1
+        self.size = self.n_days * SLOTS_PER_DAY
+
+        # Les heures hors [day_start, day_end[ ne sont jamais libres : un bloc
+        # libre ne peut donc pas chevaucher deux journées.
+        first = time_to_slot(day_start, round_up=True)
+        last = min(time_to_slot(day_end), SLOTS_PER_DAY - 1)
+        day_mask = _mask(first, last - first)
+        self.bits = _repeat(day_mask, SLOTS_PER_DAY, self.n_days)
+
+    # Conversions créneau <-> date/heure
+
+    def slot_of(self, value):
+        """Index du créneau contenant une date ou un datetime (borné à la période)"""
+        if isinstance(value, datetime):
+            days = (value.date() - self.date_debut).days
+            slot = days * SLOTS_PER_DAY + time_to_slot(value.time(), round_up=True)
+        else:
+            slot = (value - self.date_debut).days * SLOTS_PER_DAY
+        return max(0, min(slot, self.size))
+
+    def slot_to_datetime(self, slot):
+        """Convertir un index de créneau en (date, heure)"""
+        days, offset = divmod(slot, SLOTS_PER_DAY)
+        return self.date_debut + timedelta(days=days), slot_to_time(offset)
+
+    # Blocage du temps occupé
+
+    def block_weekly(self, slots):
+        """
+        Retirer des créneaux récurrents chaque semaine (cours de l'emploi du temps)
+
+        Args:
+            slots: Itérable de (jour 0-6, heure_debut, heure_fin)
+        """
+        week = 0
+        for jour, heure_debut, heure_fin in slots:
+            start = time_to_slot(heure_debut)
+            end = time_to_slot(heure_fin, round_up=True)
+            week |= _mask(jour * SLOTS_PER_DAY + start, end - start)
+        if not week:
+            return
+
+        # Aligner la semaine sur le jour de la semaine de date_debut
+        offset = self.date_debut.weekday() * SLOTS_PER_DAY
+        n_weeks = (self.size + offset) // SLOTS_PER_WEEK + 1
+        busy = _repeat(week, SLOTS_PER_WEEK, n_weeks) >> offset
+        self.bits &= ~busy
+
+    def block(self, jour, heure_debut, heure_fin):
+        """Retirer un intervalle ponctuel (une session existante)"""
+        base = (jour - self.date_debut).days * SLOTS_PER_DAY
+        if base < 0 or base >= self.size:
+            return
+        start = base + time_to_slot(heure_debut)
+        end = base + time_to_slot(heure_fin, round_up=True)
+        self.reserve(start, end - start)
+
+    def reserve(self, start, length):
+        """Marquer `length` créneaux comme occupés à partir de `start`"""
+        self.bits &= ~_mask(start, length)
+
+    def release(self, start, length):
+        """Rendre `length` créneaux libres à partir de `start`"""
+        self.bits |= _mask(start, length)
+
+    # Recherche
+
+    def runs(self, length):
+        """Bitset des créneaux de départ d'un bloc libre de `length` créneaux"""
+        runs, have = self.bits, 1
+        while have < length:
+            step = min(have, length - have)
+            runs &= runs >> step
+            have += step
+        return runs
+
+    def find(self, length, lo=0, hi=None, runs=None):
+        """
+        Trouver le premier bloc libre de `length` créneaux dans [lo, hi[
+
+        Returns:
+            int: Index du premier créneau du bloc ou None
+        """
+        hi = self.size if hi is None else min(hi, self.size)
+        if hi - lo < length:
+            return None
+        if runs is None:
+            runs = self.runs(length)
+        candidates = (runs >> lo) & ((1 << (hi - length - lo + 1)) - 1)
+        if not candidates:
+            return None
+        return lo + (candidates & -candidates).bit_length() - 1
+
+
+def estimate_hours(task):
+    """Nombre d'heures d'étude estimé pour une tâche selon sa priorité"""
+    priorite = task.priorite or 1
+    return DEFAULT_HOURS_BY_PRIORITY.get(priorite, 4)
+
+
+class StudyPlanner:
+    """Répartir les tâches ouvertes d'un utilisateur dans son temps libre"""
+
+    def __init__(self, session_minutes=90, day_start=time(8, 0), day_end=time(22, 0),
+                 estimator=estimate_hours):
+        """
+        Args:
+            session_minutes: Durée d'une session d'étude
+            day_start: Début des heures d'étude dans la journée
+            day_end: Fin des heures d'étude dans la journée
+            estimator: Fonction tâche -> nombre d'heures d'étude nécessaires
+        """
+        self.session_slots = max(1, session_minutes // SLOT_MINUTES)
+        self.day_start = day_start
+        self.day_end = day_end
+        self.estimator = estimator
+
+    def free_time(self, date_debut, date_fin, courses=(), sessions=()):
+        """
+        Construire le temps libre d'une période
+
+        Args:
+            date_debut: Premier jour du planning
+            date_fin: Dernier jour du planning
+            courses: Cours (Course) répétés chaque semaine
+            sessions: Sessions déjà placées à conserver
+
+        Returns:
+            FreeTime: Le temps libre restant
+        """
+        free = FreeTime(date_debut, date_fin, self.day_start, self.day_end)
+        weekly = []
+        for course in courses:
+            jour = normalize_jour(course.jour)
+            if jour is not None:
+                weekly.append((jour, course.heure_debut, course.heure_fin))
+        free.block_weekly(weekly)
+        for session in sessions:
+            free.block(session.date, session.heure_debut, session.heure_fin)
+        return free
+
+    @staticmethod
+    def order_tasks(tasks):
+        """Trier les tâches ouvertes : échéance la plus proche puis priorité la plus haute"""
+        open_tasks = [task for task in tasks if task.etat != ETAT_TERMINEE]
+        return sorted(open_tasks, key=lambda t: (t.date_limite, -(t.priorite or 1), t.id or 0))
+
+    def sessions_needed(self, task, hours=None):
+        """Nombre de sessions à planifier pour une tâche"""
+        if hours is None:
+            hours = self.estimator(task)
+        return max(1, math.ceil(hours * 60 / (self.session_slots * SLOT_MINUTES)))
+
+    def place_task(self, free, task, count, lo=0):
+        """
+        Placer `count` sessions d'une tâche avant son échéance
+
+        Les sessions sont d'abord réparties à raison d'une par jour ; s'il
+        manque de la place, les jours déjà utilisés sont réutilisés.
+
+        Returns:
+            list: Index des créneaux de départ des sessions placées
+        """
+        length = self.session_slots
+        hi = free.slot_of(task.date_limite)
+        runs = free.runs(length)
+        placed = []
+        spread, cursor = True, lo
+
+        while len(placed) < count:
+            start = free.find(length, cursor, hi, runs)
+            if start is None:
+                if not spread:
+                    break
+                # Deuxième passe : autoriser plusieurs sessions le même jour
+                spread, cursor = False, lo
+                continue
+
+            free.reserve(start, length)
+            # Les départs qui chevauchent le bloc réservé ne sont plus valides
+            runs &= ~_mask(max(0, start - length + 1), 2 * length - 1)
+            placed.append(start)
+
+            if spread:
+                cursor = (start // SLOTS_PER_DAY + 1) * SLOTS_PER_DAY
+            else:
+                cursor = start + length
+
+        return sorted(placed)
+
+    def session_row(self, free, task, start):
+        """Construire les colonnes d'une session à partir d'un créneau"""
+        jour, heure_debut = free.slot_to_datetime(start)
+        _, heure_fin = free.slot_to_datetime(start + self.session_slots)
+        subject = getattr(task, 'subject', None)
+        return {
+            'task_id': task.id,
+            'date': jour,
+            'heure_debut': heure_debut,
+            'heure_fin': heure_fin,
+            'matiere': subject.titre if subject else task.titre,
+            'description': f"Révision : {task.titre}",
+            'completee': False,
+        }
+
+    def repack(self, free, demands, lo=0):
+        """
+        Placer un sous-ensemble de tâches dans un temps libre déjà construit
+
+        Utilisé par la replanification incrémentale : seules les sessions
+        libérées sont replacées, le reste du planning reste dans `free`.
+
+        Args:
+            free: Temps libre (FreeTime) dont les sessions à replacer ont été retirées
+            demands: Liste de (tâche, nombre de sessions)
+            lo: Premier créneau utilisable
+
+        Returns:
+            tuple: ({task_id: [créneaux de départ]}, liste des tâches incomplètes)
+        """
+        counts = {task.id: count for task, count in demands}
+        placements, unscheduled = {}, []
+        for task in self.order_tasks([task for task, _ in demands]):
+            count = counts[task.id]
+            placed = self.place_task(free, task, count, lo) if count else []
+            if len(placed) < count:
+                unscheduled.append(task)
+            placements[task.id] = placed
+        return placements, unscheduled
+
+    def plan(self, tasks, date_debut, date_fin, courses=(), sessions=(), now=None, hours=None):
+        """
+        Générer les sessions d'étude d'un planning
+
+        Args:
+            tasks: Tâches de l'utilisateur (les tâches terminées sont ignorées)
+            date_debut: Premier jour du planning
+            date_fin: Dernier jour du planning
+            courses: Cours de l'emploi du temps (créneaux occupés chaque semaine)
+            sessions: Sessions existantes à conserver
+            now: Instant à partir duquel planifier (par défaut maintenant)
+            hours: Dictionnaire optionnel {task_id: heures} remplaçant l'estimateur
+
+        Returns:
+            tuple: (liste de dictionnaires de sessions, liste des tâches non planifiées)
+        """
+        free = self.free_time(date_debut, date_fin, courses, sessions)
+        lo = free.slot_of(max(now or datetime.utcnow(), datetime.combine(date_debut, time.min)))
+
+        rows, unscheduled = [], []
+        for task in self.order_tasks(tasks):
+            task_hours = hours.get(task.id) if hours else None
+            count = self.sessions_needed(task, task_hours)
+            placed = self.place_task(free, task, count, lo)
+            if len(placed) < count:
+                unscheduled.append(task)
+            rows.extend(self.session_row(free, task, start) for start in placed)
+
+        rows.sort(key=lambda row: (row['date'], row['heure_debut']))
+        return rows, unscheduled
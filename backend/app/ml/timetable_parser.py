@@ -0,0 +1,280 @@
+"""
+Extraction des cours d'un emploi du temps PDF
+
+Chaque page est ouverte seule (pdfplumber avec `pages=[n]`) dans un processus
+du pool : la mémoire d'un worker est bornée par une page, pas par le document.
+Les pages sont lues dans l'ordre avec un nombre limité de pages en cours.
+"""
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import time
+
+import fitz
+import pdfplumber
+from pdfminer.psparser import PSException
+
+from app.ml.planner import JOURS, normalize_jour
+
+# À incrémenter quand l'extraction change (invalide le cache des PDF analysés)
+PARSER_VERSION = 1
+
+# Erreurs levées par la lecture d'un PDF illisible : pdfminer (PSException),
+# PyMuPDF (RuntimeError, dont fitz.FileDataError), fichier absent ou tronqué
+# (OSError) et structures internes incohérentes
+PARSE_ERRORS = (PSException, RuntimeError, OSError, ValueError, KeyError, TypeError)
+
+# Noms affichés dans Course.jour
+JOURS_AFFICHES = [jour.capitalize() for jour in JOURS]
+
+TIME_RE = re.compile(r'(\d{1,2})\s*[hH:.]\s*(\d{2})?')
+RANGE_RE = re.compile(r'(\d{1,2}\s*[hH:.]\s*\d{0,2})\s*(?:-|–|à|a|/)\s*(\d{1,2}\s*[hH:.]\s*\d{0,2})')
+ROOM_RE = re.compile(r'\b(salle|amphi|labo|bloc|room|[a-z]\d{1,3}\b)', re.IGNORECASE)
+TEACHER_RE = re.compile(r'\b(m\.|mme|mr|dr|pr|prof)\b', re.IGNORECASE)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class PDFReadError(Exception):
+    """PDF illisible : levée par iter_courses à la place des erreurs de PARSE_ERRORS"""
+
+
+def parse_time(text):
+    """Convertir '8h30', '08:30' ou '10H' en objet time"""
+    match = TIME_RE.search(text or '')
+    if not match:
+        return None
+    hours, minutes = int(match.group(1)), int(match.group(2) or 0)
+    if hours > 23 or minutes > 59:
+        return None
+    return time(hours, minutes)
+
+
+def parse_range(text):
+    """Convertir '08:30 - 10:00' en (heure_debut, heure_fin)"""
+    match = RANGE_RE.search(text or '')
+    if not match:
+        return None
+    debut, fin = parse_time(match.group(1)), parse_time(match.group(2))
+    if not debut or not fin or fin <= debut:
+        return None
+    return debut, fin
+
+
+def _clean(cell):
+    return ' '.join((cell or '').split())
+
+
+def _day_columns(row):
+    """Colonnes d'une ligne d'en-tête contenant des noms de jours"""
+    columns = {}
+    for index, cell in enumerate(row):
+        text = _clean(cell)
+        if text and len(text) <= 12:
+            jour = normalize_jour(text)
+            if jour is not None:
+                columns[index] = jour
+    return columns
+
+
+def split_cell(text):
+    """
+    Découper le contenu d'une case en (matiere, salle, enseignant)
+
+    La première ligne est la matière ; parmi les suivantes, une salle est
+    reconnue par son libellé (Salle, Amphi, Labo, A12...), le reste est
+    considéré comme l'enseignant.
+    """
+    lines = [_clean(line) for line in (text or '').splitlines() if _clean(line)]
+    if not lines:
+        return None
+    matiere, salle, enseignant = lines[0], None, None
+    for line in lines[1:]:
+        if salle is None and ROOM_RE.search(line) and not TEACHER_RE.search(line):
+            salle = line
+        elif enseignant is None:
+            enseignant = line
+    return matiere[:100], salle[:50] if salle else None, enseignant[:100] if enseignant else None
+
+
+def _parse_grid(table, header_index, day_columns):
+    """Tableau en grille : jours en colonnes, plages horaires en lignes"""
+    courses = []
+    open_cells = {}
+    for row in table[header_index + 1:]:
+        if not row:
+            continue
+        slot = parse_range(_clean(row[0]))
+        if not slot:
+            continue
+        for column, jour in day_columns.items():
+            cell = row[column] if column < len(row) else None
+            if cell is None and column in open_cells:
+                # Case fusionnée : le cours se prolonge sur ce créneau
+                open_cells[column][2] = slot[1]
+                continue
+            open_cells.pop(column, None)
+            parts = split_cell(cell)
+            if parts:
+                course = [JOURS_AFFICHES[jour], slot[0], slot[1], *parts]
+                open_cells[column] = course
+                courses.append(course)
+    return [tuple(course) for course in courses]
+
+
+def _parse_list(table):
+    """Tableau en liste : une ligne par cours (jour, horaires, matière, salle, enseignant)"""
+    courses = []
+    for row in table:
+        cells = [_clean(cell) for cell in row]
+        if not cells or normalize_jour(cells[0]) is None or len(cells) < 3:
+            continue
+        jour = JOURS_AFFICHES[normalize_jour(cells[0])]
+        slot = parse_range(cells[1])
+        rest = cells[2:]
+        if not slot:
+            debut, fin = parse_time(cells[1]), parse_time(cells[2])
+            if not debut or not fin or fin <= debut:
+                continue
+            slot, rest = (debut, fin), cells[3:]
+        rest = rest + [''] * (3 - len(rest))
+        if not rest[0]:
+            continue
+        courses.append((jour, slot[0], slot[1], rest[0][:100], rest[1][:50] or None, rest[2][:100] or None))
+    return courses
+
+
+def extract_courses(tables):
+    """
+    Convertir les tableaux d'une page en tuples de cours
+
+    Args:
+        tables: Tableaux extraits par pdfplumber (listes de lignes)
+
+    Returns:
+        list: Tuples (jour, heure_debut, heure_fin, matiere, salle, enseignant)
+    """
+    courses = []
+    for table in tables:
+        for index, row in enumerate(table[:5]):
+            day_columns = _day_columns(row)
+            if len(day_columns) >= 2:
+                courses.extend(_parse_grid(table, index, day_columns))
+                break
+        else:
+            courses.extend(_parse_list(table))
+    return courses
+
+
+def parse_page(path, page_number):
+    """
+    Extraire les cours d'une seule page (exécuté dans un processus du pool)
+
+    Args:
+        path: Chemin du fichier PDF
+        page_number: Index de la page (à partir de 0)
+
+    Returns:
+        list: Tuples de cours de la page
+    """
+    with pdfplumber.open(path, pages=[page_number + 1]) as pdf:
+        tables = pdf.pages[0].extract_tables()
+    return extract_courses(tables)
+
+
+def page_count(path):
+    """Nombre de pages du PDF (lecture de la table des pages uniquement)"""
+    with fitz.open(path) as document:
+        return document.page_count
+
+
+def _get_pool(workers):
+    """Pool de processus partagé par toutes les importations du worker"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def _reset_pool(pool):
+    """Abandonner un pool dont un processus s'est arrêté brutalement (inutilisable ensuite)"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_courses(path, workers=None):
+    """
+    Parcourir les cours d'un PDF page par page
+
+    Les pages sont traitées en parallèle par le pool de processus, avec au plus
+    2 × workers pages en cours ; les résultats sont rendus dans l'ordre des pages
+    et les doublons (en-têtes répétés d'une page à l'autre) sont ignorés.
+
+    Args:
+        path: Chemin du fichier PDF
+        workers: Nombre de processus (1 = dans le processus courant)
+
+    Yields:
+        tuple: (jour, heure_debut, heure_fin, matiere, salle, enseignant)
+
+    Raises:
+        PDFReadError: Si le PDF est illisible
+        BrokenProcessPool: Si un processus du pool s'arrête encore après un
+            remplacement du pool (erreur du serveur, pas du fichier)
+    """
+    workers = workers or os.cpu_count() or 1
+    seen = set()
+    try:
+        n_pages = page_count(path)
+        if workers <= 1 or n_pages <= 1:
+            pages = (parse_page(path, number) for number in range(n_pages))
+        else:
+            pages = _iter_parallel(path, n_pages, workers)
+
+        for courses in pages:
+            for course in courses:
+                if course not in seen:
+                    seen.add(course)
+                    yield course
+    except BrokenProcessPool:
+        raise
+    except PARSE_ERRORS as e:
+        raise PDFReadError(str(e)) from e
+
+
+def _iter_parallel(path, n_pages, workers, retries=1):
+    """
+    Soumettre les pages au pool en gardant au plus 2 × workers pages en cours
+
+    Si un processus du pool s'arrête brutalement, le pool est remplacé et la
+    lecture reprend à la première page non rendue (`retries` fois au plus).
+    """
+    first = 0
+    while True:
+        pool = _get_pool(workers)
+        pending = deque()
+        try:
+            for number in range(first, n_pages):
+                pending.append(pool.submit(parse_page, path, number))
+                if len(pending) >= 2 * workers:
+                    courses = pending.popleft().result()
+                    first += 1
+                    yield courses
+            while pending:
+                courses = pending.popleft().result()
+                first += 1
+                yield courses
+            return
+        except BrokenProcessPool:
+            _reset_pool(pool)
+            if not retries:
+                raise
+            retries -= 1
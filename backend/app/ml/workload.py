@@ -0,0 +1,246 @@
+"""
+Prédiction de la charge de travail (heures d'étude nécessaires par tâche)
+
+Le modèle (HistGradientBoostingRegressor, perte de Poisson) apprend sur les
+tâches terminées le temps réellement étudié (minutes des sessions
+complétées) à partir de la priorité, de la longueur de la description et de
+l'historique de l'utilisateur : taux de complétion de ses sessions et temps
+moyen par tâche, globalement et pour la matière.
+
+Les caractéristiques sont calculées en une passe vectorisée (pandas) sur la
+table des sessions ; la prédiction d'une liste de tâches est un seul appel à
+predict. Le modèle entraîné est enregistré avec joblib et rechargé en
+mmap_mode='r' : les tableaux des arbres sont projetés en mémoire, partagés
+entre workers par le cache de pages du système et chargés sans copie.
+"""
+import os
+import threading
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from flask import current_app
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sqlalchemy import select
+
+from app import db
+from app.ml.planner import ETAT_TERMINEE, estimate_hours
+from app.models.planning import Planning
+from app.models.session import Session
+from app.models.task import Task
+
+# À incrémenter quand les caractéristiques changent (les anciens modèles sont ignorés)
+MODEL_VERSION = 1
+
+FEATURES = [
+    'priorite',
+    'description_len',
+    'user_completion',
+    'user_mean_hours',
+    'subject_completion',
+    'subject_mean_hours',
+]
+
+# Nombre minimal de tâches terminées pour entraîner un modèle
+MIN_TRAINING_TASKS = 30
+
+# Bornes des prédictions (heures)
+MIN_HOURS, MAX_HOURS = 0.5, 40.0
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _task_frame(*criteria):
+    """Tâches (une ligne par tâche) lues en une requête"""
+    rows = db.session.execute(
+        select(
+            Task.id, Task.user_id, Task.subject_id, Task.priorite, Task.etat,
+            Task.description
+        ).where(*criteria)
+    ).all()
+    frame = pd.DataFrame(rows, columns=['task_id', 'user_id', 'subject_id', 'priorite', 'etat', 'description'])
+    frame['subject_id'] = frame['subject_id'].fillna(0).astype(np.int64)
+    frame['priorite'] = frame['priorite'].fillna(1).astype(np.float64)
+    frame['description_len'] = frame.pop('description').fillna('').str.len().astype(np.float64)
+    frame['terminee'] = (frame.pop('etat') == ETAT_TERMINEE).to_numpy()
+    return frame
+
+
+def _session_frame(*criteria):
+    """Sessions rattachées à une tâche, avec leur durée en minutes"""
+    rows = db.session.execute(
+        select(Session.task_id, Session.heure_debut, Session.heure_fin, Session.completee)
+        .join(Planning, Planning.id == Session.planning_id)
+        .where(Session.task_id.isnot(None), *criteria)
+    ).all()
+    frame = pd.DataFrame(rows, columns=['task_id', 'heure_debut', 'heure_fin', 'completee'])
+
+    def minutes(column):
+        # Au plus 1440 heures distinctes : conversion des valeurs uniques puis indexation
+        codes, uniques = pd.factorize(frame[column])
+        values = np.fromiter((t.hour * 60 + t.minute for t in uniques), dtype=np.int64, count=len(uniques))
+        return values[codes]
+
+    frame['completee'] = frame['completee'].fillna(False).astype(bool)
+    frame['minutes_etudiees'] = np.where(frame['completee'], minutes('heure_fin') - minutes('heure_debut'), 0)
+    return frame[['task_id', 'completee', 'minutes_etudiees']]
+
+
+def build_features(tasks, sessions):
+    """
+    Construire la matrice de caractéristiques (sans boucle sur les lignes)
+
+    L'historique d'une tâche exclut ses propres sessions : à l'entraînement,
+    le temps à prédire n'entre pas dans ses caractéristiques, et à
+    l'inférence les sessions déjà planifiées ne faussent pas les taux.
+
+    Args:
+        tasks: DataFrame de _task_frame
+        sessions: DataFrame de _session_frame
+
+    Returns:
+        DataFrame: tasks complété par FEATURES et 'heures' (temps étudié)
+    """
+    per_task = sessions.groupby('task_id').agg(
+        n_sessions=('completee', 'size'),
+        n_completees=('completee', 'sum'),
+        minutes=('minutes_etudiees', 'sum')
+    )
+    frame = tasks.join(per_task, on='task_id')
+    frame[['n_sessions', 'n_completees', 'minutes']] = frame[['n_sessions', 'n_completees', 'minutes']].fillna(0)
+    frame['heures'] = frame['minutes'] / 60.0
+    frame['labellisee'] = frame['terminee'] & (frame['n_completees'] > 0)
+    frame['h_label'] = np.where(frame['labellisee'], frame['heures'], 0.0)
+    frame['n_label'] = frame['labellisee'].astype(np.float64)
+
+    for level, keys in (('user', ['user_id']), ('subject', ['user_id', 'subject_id'])):
+        own = frame[['n_sessions', 'n_completees', 'h_label', 'n_label']]
+        totals = frame.groupby(keys)[own.columns].transform('sum') - own
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame[f'{level}_completion'] = np.where(
+                totals['n_sessions'] > 0, totals['n_completees'] / totals['n_sessions'], np.nan
+            )
+            frame[f'{level}_mean_hours'] = np.where(
+                totals['n_label'] > 0, totals['h_label'] / totals['n_label'], np.nan
+            )
+
+    # Tâches sans matière : pas d'historique de matière
+    frame.loc[frame['subject_id'] == 0, ['subject_completion', 'subject_mean_hours']] = np.nan
+    return frame
+
+
+class WorkloadModel:
+    """Modèle entraîné et ses métadonnées"""
+
+    def __init__(self, estimator, trained_at=None, n_samples=0):
+        self.estimator = estimator
+        self.trained_at = trained_at or datetime.utcnow()
+        self.n_samples = n_samples
+        self.version = MODEL_VERSION
+        self.features = list(FEATURES)
+
+    def predict(self, frame):
+        """Heures prédites pour chaque ligne de build_features (un seul predict)"""
+        values = frame[self.features].to_numpy(dtype=np.float64)
+        return np.clip(self.estimator.predict(values), MIN_HOURS, MAX_HOURS)
+
+    def save(self, path):
+        """Enregistrer le modèle (écriture atomique)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path):
+        """Charger le modèle en projetant ses tableaux en mémoire (lecture seule)"""
+        model = joblib.load(path, mmap_mode='r')
+        if getattr(model, 'version', None) != MODEL_VERSION:
+            return None
+        return model
+
+
+def model_path():
+    """Chemin du modèle (WORKLOAD_MODEL_PATH)"""
+    return current_app.config['WORKLOAD_MODEL_PATH']
+
+
+def get_model():
+    """
+    Modèle courant, rechargé seulement si le fichier a changé
+
+    Returns:
+        WorkloadModel | None: None si aucun modèle n'a encore été entraîné
+    """
+    path = model_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, WorkloadModel.load(path))
+            _cache[path] = cached
+        return cached[1]
+
+
+def train(min_tasks=MIN_TRAINING_TASKS, save=True):
+    """
+    Entraîner le modèle sur toutes les tâches terminées
+
+    Args:
+        min_tasks: Nombre minimal de tâches terminées avec sessions complétées
+        save: Enregistrer le modèle dans WORKLOAD_MODEL_PATH
+
+    Returns:
+        dict: Nombre d'exemples et erreur absolue moyenne (heures), ou
+            'skipped' si les données sont insuffisantes
+    """
+    frame = build_features(_task_frame(), _session_frame())
+    labelled = frame[frame['labellisee']]
+    if len(labelled) < min_tasks:
+        return {'skipped': True, 'samples': int(len(labelled))}
+
+    X = labelled[FEATURES].to_numpy(dtype=np.float64)
+    y = labelled['heures'].to_numpy(dtype=np.float64)
+    estimator = HistGradientBoostingRegressor(loss='poisson', max_iter=200, learning_rate=0.1, random_state=0)
+    estimator.fit(X, y)
+
+    model = WorkloadModel(estimator, n_samples=len(labelled))
+    if save:
+        model.save(model_path())
+    mae = float(np.mean(np.abs(model.predict(labelled) - y)))
+    return {'skipped': False, 'samples': int(len(labelled)), 'mae_hours': round(mae, 3)}
+
+
+def predict_hours(user_id, tasks):
+    """
+    Heures d'étude prévues pour les tâches d'un utilisateur
+
+    Sans modèle entraîné, l'estimation par priorité du planificateur est
+    utilisée.
+
+    Args:
+        user_id: ID de l'utilisateur
+        tasks: Tâches à estimer
+
+    Returns:
+        dict: {task_id: heures}
+    """
+    hours = {task.id: estimate_hours(task) for task in tasks}
+    model = get_model() if tasks else None
+    if model is None:
+        return hours
+
+    frame = build_features(
+        _task_frame(Task.user_id == user_id),
+        _session_frame(Planning.user_id == user_id)
+    )
+    frame = frame[frame['task_id'].isin(list(hours))]
+    if not frame.empty:
+        hours.update(zip(frame['task_id'].tolist(), model.predict(frame).tolist()))
+    return hours
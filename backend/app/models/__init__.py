@@ -8,6 +8,8 @@ from app.models.schedule import Schedule, Course
 from app.models.planning import Planning
 from app.models.session import Session
 from app.models.notification import Notification
+from app.models.statistics import DailyStat, TaskStat
+from app.models.deletion import Deletion
 
 __all__ = [
     "User",
@@ -18,4 +20,7 @@ __all__ = [
     "Planning",
     "Session",
     "Notification",
+    "DailyStat",
+    "TaskStat",
+    "Deletion",
 ]
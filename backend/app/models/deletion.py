@@ -0,0 +1,34 @@
+"""
+Modèle Deletion (trace d'une suppression, pour la synchronisation)
+"""
+from app import db
+from datetime import datetime
+
+
+class Deletion(db.Model):
+    """Ligne supprimée, conservée SYNC_TOMBSTONE_DAYS jours pour les clients synchronisés"""
+    
+    __tablename__ = 'deletions'
+    __table_args__ = (
+        # Suppressions d'un utilisateur depuis un curseur (voir SyncService)
+        db.Index('idx_deletions_user_deleted', 'user_id', 'deleted_at', 'id'),
+        # Purge des traces expirées
+        db.Index('idx_deletions_deleted_at', 'deleted_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    entity = db.Column(db.String(30), nullable=False)  # Nom de la table : tasks, sessions...
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convertir l'objet en dictionnaire"""
+        return {
+            'entity': self.entity,
+            'id': self.entity_id,
+            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None
+        }
+    
+    def __repr__(self):
+        return f'<Deletion {self.entity} {self.entity_id}>'
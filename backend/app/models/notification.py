@@ -2,6 +2,7 @@
 Modèle Notification
 """
 from app import db
+from sqlalchemy import text
 from datetime import datetime
 
 
@@ -9,14 +10,28 @@ class Notification(db.Model):
     """Modèle pour les notifications envoyées aux utilisateurs"""
     
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # Liste paginée des plus récentes (voir NotificationService.list_notifications)
+        db.Index('idx_notifications_user_created', 'user_id', 'created_at', 'id'),
+        # Compteur et liste des non lues (index partiel)
+        db.Index(
+            'idx_notifications_user_unread', 'user_id', 'created_at', 'id',
+            postgresql_where=text('lue IS false'), sqlite_where=text('lue IS 0')
+        ),
+        # Notifications récentes par date d'envoi et dédoublonnage des rappels
+        db.Index('idx_notifications_user_date_envoi', 'user_id', 'date_envoi', 'id'),
+        # Synchronisation incrémentale (voir SyncService)
+        db.Index('idx_notifications_user_updated', 'user_id', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     type = db.Column(db.String(50), nullable=False)  # rappel, conseil, alerte
     message = db.Column(db.Text, nullable=False)
     date_envoi = db.Column(db.DateTime, nullable=False)
-    lue = db.Column(db.Boolean, default=False, index=True)
+    lue = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_dict(self):
         """Convertir l'objet en dictionnaire"""
@@ -27,13 +42,18 @@ class Notification(db.Model):
             'message': self.message,
             'date_envoi': self.date_envoi.isoformat() if self.date_envoi else None,
             'lue': self.lue,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def mark_as_read(self):
-        """Marquer la notification comme lue"""
+        """
+        Marquer la notification comme lue
+
+        Le commit est laissé à l'appelant ; pour plusieurs notifications,
+        utiliser NotificationService.mark_as_read (une seule requête UPDATE).
+        """
         self.lue = True
-        db.session.commit()
     
     def __repr__(self):
         return f'<Notification {self.type} - User {self.user_id}>'
@@ -2,6 +2,7 @@
 Modèle Planning
 """
 from app import db
+from sqlalchemy import text
 from datetime import datetime
 
 
@@ -9,6 +10,17 @@ class Planning(db.Model):
     """Modèle pour les plannings d'étude générés"""
     
     __tablename__ = 'plannings'
+    __table_args__ = (
+        # Plannings d'un utilisateur (voir app.utils.serialization.load_plannings)
+        db.Index('idx_plannings_user_date_debut', 'user_id', 'date_debut', 'id'),
+        # Synchronisation incrémentale (voir SyncService)
+        db.Index('idx_plannings_user_updated', 'user_id', 'updated_at', 'id'),
+        # Planning actif d'un utilisateur (index partiel)
+        db.Index(
+            'idx_plannings_user_actif', 'user_id', 'id',
+            postgresql_where=text('actif IS true'), sqlite_where=text('actif IS 1')
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -17,12 +29,18 @@ class Planning(db.Model):
     date_fin = db.Column(db.Date, nullable=False)
     actif = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relations
     sessions = db.relationship('Session', backref='planning', lazy='dynamic', cascade='all, delete-orphan')
     
     def to_dict(self):
         """Convertir l'objet en dictionnaire"""
+        # Utiliser le graphe préchargé (app.utils.serialization) s'il existe
+        sessions = getattr(self, '_preloaded_sessions', None)
+        if sessions is None:
+            sessions = self.sessions
+        
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -31,7 +49,8 @@ class Planning(db.Model):
             'date_fin': self.date_fin.isoformat() if self.date_fin else None,
             'actif': self.actif,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'sessions': [session.to_dict() for session in self.sessions]
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'sessions': [session.to_dict() for session in sessions]
         }
     
     def __repr__(self):
@@ -9,11 +9,17 @@ class Schedule(db.Model):
     """Modèle pour les emplois du temps importés"""
     
     __tablename__ = 'schedules'
+    __table_args__ = (
+        db.Index('idx_schedules_user_date_import', 'user_id', 'date_import'),
+        # Synchronisation incrémentale (voir SyncService)
+        db.Index('idx_schedules_user_updated', 'user_id', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     fichier_pdf = db.Column(db.String(255))
     date_import = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relations
     courses = db.relationship('Course', backref='schedule', lazy='dynamic', cascade='all, delete-orphan')
@@ -25,6 +31,7 @@ class Schedule(db.Model):
             'user_id': self.user_id,
             'fichier_pdf': self.fichier_pdf,
             'date_import': self.date_import.isoformat() if self.date_import else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'courses': [course.to_dict() for course in self.courses]
         }
     
@@ -36,6 +43,10 @@ class Course(db.Model):
     """Modèle pour les cours extraits de l'emploi du temps"""
     
     __tablename__ = 'courses'
+    __table_args__ = (
+        # Cours d'un emploi du temps et synchronisation incrémentale (voir SyncService)
+        db.Index('idx_courses_schedule_updated', 'schedule_id', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     schedule_id = db.Column(db.Integer, db.ForeignKey('schedules.id'), nullable=False)
@@ -45,6 +56,7 @@ class Course(db.Model):
     matiere = db.Column(db.String(100), nullable=False)
     salle = db.Column(db.String(50))
     enseignant = db.Column(db.String(100))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_dict(self):
         """Convertir l'objet en dictionnaire"""
@@ -56,7 +68,8 @@ class Course(db.Model):
             'heure_fin': self.heure_fin.strftime('%H:%M') if self.heure_fin else None,
             'matiere': self.matiere,
             'salle': self.salle,
-            'enseignant': self.enseignant
+            'enseignant': self.enseignant,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def __repr__(self):
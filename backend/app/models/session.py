@@ -2,6 +2,7 @@
 Modèle Session (Session d'étude)
 """
 from app import db
+from sqlalchemy import text
 from datetime import datetime
 
 
@@ -9,9 +10,21 @@ class Session(db.Model):
     """Modèle pour les sessions d'étude planifiées"""
     
     __tablename__ = 'sessions'
+    __table_args__ = (
+        # Liste paginée par date et heure (voir PlanningService.list_sessions)
+        db.Index('idx_sessions_planning_date', 'planning_id', 'date', 'heure_debut', 'id'),
+        db.Index('idx_sessions_task_id', 'task_id'),
+        # Synchronisation incrémentale (voir SyncService)
+        db.Index('idx_sessions_planning_updated', 'planning_id', 'updated_at', 'id'),
+        # Balayage des rappels (index partiel : sessions non complétées)
+        db.Index(
+            'idx_sessions_pending_date', 'date', 'id',
+            postgresql_where=text('completee IS false'), sqlite_where=text('completee IS 0')
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    planning_id = db.Column(db.Integer, db.ForeignKey('plannings.id'), nullable=False, index=True)
+    planning_id = db.Column(db.Integer, db.ForeignKey('plannings.id'), nullable=False)
     task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'))
     date = db.Column(db.Date, nullable=False, index=True)
     heure_debut = db.Column(db.Time, nullable=False)
@@ -20,6 +33,7 @@ class Session(db.Model):
     description = db.Column(db.Text)
     completee = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_dict(self):
         """Convertir l'objet en dictionnaire"""
@@ -34,7 +48,8 @@ class Session(db.Model):
             'matiere': self.matiere,
             'description': self.description,
             'completee': self.completee,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def __repr__(self):
@@ -0,0 +1,56 @@
+"""
+Modèles des statistiques précalculées (agrégats par utilisateur et par jour)
+"""
+from app import db
+
+
+class DailyStat(db.Model):
+    """Sessions d'étude agrégées par utilisateur, jour et matière"""
+
+    __tablename__ = 'daily_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    jour = db.Column(db.Date, primary_key=True)
+    subject_id = db.Column(db.Integer, primary_key=True, default=0)  # 0 = sans matière
+    sessions_planifiees = db.Column(db.Integer, nullable=False, default=0)
+    sessions_completees = db.Column(db.Integer, nullable=False, default=0)
+    minutes_planifiees = db.Column(db.Integer, nullable=False, default=0)
+    minutes_etudiees = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        """Convertir l'objet en dictionnaire"""
+        return {
+            'jour': self.jour.isoformat() if self.jour else None,
+            'subject_id': self.subject_id or None,
+            'sessions_planifiees': self.sessions_planifiees,
+            'sessions_completees': self.sessions_completees,
+            'minutes_planifiees': self.minutes_planifiees,
+            'minutes_etudiees': self.minutes_etudiees
+        }
+
+    def __repr__(self):
+        return f'<DailyStat {self.user_id} {self.jour} {self.subject_id}>'
+
+
+class TaskStat(db.Model):
+    """Tâches agrégées par utilisateur, jour d'échéance et priorité"""
+
+    __tablename__ = 'task_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    jour = db.Column(db.Date, primary_key=True)  # Jour de date_limite
+    priorite = db.Column(db.Integer, primary_key=True)
+    taches_ouvertes = db.Column(db.Integer, nullable=False, default=0)
+    taches_terminees = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        """Convertir l'objet en dictionnaire"""
+        return {
+            'jour': self.jour.isoformat() if self.jour else None,
+            'priorite': self.priorite,
+            'taches_ouvertes': self.taches_ouvertes,
+            'taches_terminees': self.taches_terminees
+        }
+
+    def __repr__(self):
+        return f'<TaskStat {self.user_id} {self.jour} {self.priorite}>'
@@ -9,6 +9,12 @@ class Subject(db.Model):
     """Modèle pour les matières étudiées"""
     
     __tablename__ = 'subjects'
+    __table_args__ = (
+        # Liste paginée par titre (voir SubjectService.list_subjects)
+        db.Index('idx_subjects_user_titre', 'user_id', 'titre', 'id'),
+        # Synchronisation incrémentale (voir SyncService)
+        db.Index('idx_subjects_user_updated', 'user_id', 'updated_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -16,6 +22,7 @@ class Subject(db.Model):
     description = db.Column(db.Text)
     couleur = db.Column(db.String(7), default='#0ea5e9')  # Couleur hex pour l'UI
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relations
     tasks = db.relationship('Task', backref='subject', lazy='dynamic')
@@ -28,7 +35,8 @@ class Subject(db.Model):
             'titre': self.titre,
             'description': self.description,
             'couleur': self.couleur,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def __repr__(self):
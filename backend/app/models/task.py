@@ -2,6 +2,7 @@
 Modèle Task (Tâche/Examen)
 """
 from app import db
+from sqlalchemy import text
 from datetime import datetime
 
 
@@ -9,9 +10,22 @@ class Task(db.Model):
     """Modèle pour les tâches et examens"""
     
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Listes paginées par échéance (voir TaskService.list_tasks)
+        db.Index('idx_tasks_user_date_limite', 'user_id', 'date_limite', 'id'),
+        db.Index('idx_tasks_user_etat_date_limite', 'user_id', 'etat', 'date_limite', 'id'),
+        db.Index('idx_tasks_user_subject_date_limite', 'user_id', 'subject_id', 'date_limite', 'id'),
+        # Synchronisation incrémentale (voir SyncService)
+        db.Index('idx_tasks_user_updated', 'user_id', 'updated_at', 'id'),
+        # Balayage des échéances à venir (index partiel : tâches non terminées)
+        db.Index(
+            'idx_tasks_open_date_limite', 'date_limite', 'id',
+            postgresql_where=text("etat <> 'terminée'"), sqlite_where=text("etat != 'terminée'")
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     subject_id = db.Column(db.Integer, db.ForeignKey('subjects.id'))
     titre = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -3,28 +3,7 @@ Modèle User (Utilisateur)
 """
 from app import db
 from datetime import datetime
-try:
-    from werkzeug.security import generate_password_hash, check_password_hash
-except Exception:
-    # Fallback simple implementation using PBKDF2-HMAC-SHA256 if werkzeug is not available.
-    # This provides compatible generate_password_hash/check_password_hash signatures used in this file.
-    import hashlib
-    import hmac
-    import os
-    import base64
-
-    def generate_password_hash(password, method='pbkdf2:sha256', salt_length=8):
-        salt = base64.b64encode(os.urandom(salt_length)).decode('utf-8')
-        dk = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), 100000)
-        return f'pbkdf2:sha256${salt}${base64.b64encode(dk).decode()}'
-
-    def check_password_hash(pwhash, password):
-        try:
-            _method, salt, hashb64 = pwhash.split('$', 2)
-            dk = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), 100000)
-            return hmac.compare_digest(base64.b64encode(dk).decode(), hashb64)
-        except Exception:
-            return False
+from app.utils.hashers import hash_password, verify_password, needs_rehash
 
 
 class User(db.Model):
@@ -39,6 +18,7 @@ class User(db.Model):
     mot_de_passe = db.Column(db.String(255), nullable=False)
     niveau = db.Column(db.String(50))  # Ex: Licence 1, Master 2, etc.
     langue = db.Column(db.String(10), default='fr')
+    calendar_nonce = db.Column(db.String(32))  # Secret des URL du flux .ics (régénérable)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -50,12 +30,16 @@ class User(db.Model):
     notifications = db.relationship('Notification', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     
     def set_password(self, password):
-        """Hasher le mot de passe"""
-        self.mot_de_passe = generate_password_hash(password)
+        """Hasher le mot de passe (algorithme et coût configurés)"""
+        self.mot_de_passe = hash_password(password)
     
     def check_password(self, password):
         """Vérifier le mot de passe"""
-        return check_password_hash(self.mot_de_passe, password)
+        return verify_password(self.mot_de_passe, password)
+    
+    def password_needs_rehash(self):
+        """Le hachage stocké diffère-t-il de l'algorithme ou du coût configurés ?"""
+        return needs_rehash(self.mot_de_passe)
     
     def to_dict(self):
         """Convertir l'objet en dictionnaire"""
@@ -4,9 +4,39 @@ Gère l'inscription, la connexion et la gestion des tokens JWT
 """
 from app import db
 from app.models.user import User
+from app.utils.cache import LocalCache
+from app.utils.db_routing import primary
+from flask import g, current_app, has_request_context
 from flask_jwt_extended import create_access_token, create_refresh_token
 from datetime import timedelta
 
+# Cache des profils propre au processus. L'invalidation explicite ne touche que
+# le processus courant : la durée de vie courte (USER_CACHE_TTL) borne le délai
+# pendant lequel les autres workers peuvent servir un profil périmé.
+_profile_cache = LocalCache(max_entries=10000)
+
+
+class CachedUser:
+    """Profil utilisateur en lecture seule, servi par le cache (current_user)"""
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getattr__(self, name):
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def to_dict(self):
+        """Convertir l'objet en dictionnaire"""
+        return dict(self._data)
+
+    def __repr__(self):
+        return f'<CachedUser {self._data.get("email")}>'
+
 
 class AuthService:
     """Service pour gérer l'authentification des utilisateurs"""
@@ -98,6 +128,11 @@ class AuthService:
         if not user or not user.check_password(password):
             raise ValueError("Email ou mot de passe incorrect")
         
+        # Refaire le hachage si l'algorithme ou le coût configurés ont changé
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+        
         # Générer les tokens JWT (IMPORTANT: convertir user.id en string)
         access_token = create_access_token(
             identity=str(user.id),  # ← Convertir en string
@@ -130,6 +165,59 @@ class AuthService:
             user_id = int(user_id)
         return User.query.get(user_id)
     
+    @staticmethod
+    def get_user_profile(user_id):
+        """
+        Récupérer le profil d'un utilisateur via le cache
+
+        Ordre de recherche : cache de la requête (flask.g), cache du processus
+        (durée USER_CACHE_TTL, 0 pour le désactiver), puis base principale,
+        y compris dans une vue @read_replica : le profil lu est remis en cache
+        pour les requêtes suivantes.
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+
+        Returns:
+            CachedUser: Le profil ou None
+        """
+        # Convertir en int si c'est une string
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        request_cache = g.setdefault('user_profiles', {}) if has_request_context() else {}
+        if user_id in request_cache:
+            return request_cache[user_id]
+
+        profile = _profile_cache.get(user_id)
+        if profile is None:
+            with primary():
+                # populate_existing : ne pas réutiliser un objet déjà lu sur la réplique
+                user = db.session.get(User, user_id, populate_existing=True)
+            if user is None:
+                return None
+            profile = user.to_dict()
+            ttl = current_app.config['USER_CACHE_TTL']
+            if ttl:
+                _profile_cache.set(user_id, profile, ttl=ttl)
+
+        request_cache[user_id] = CachedUser(profile)
+        return request_cache[user_id]
+
+    @staticmethod
+    def invalidate_user(user_id):
+        """
+        Retirer un utilisateur des caches de profil (requête et processus)
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        _profile_cache.delete(user_id)
+        if has_request_context():
+            g.setdefault('user_profiles', {}).pop(user_id, None)
+
     @staticmethod
     def update_user_profile(user_id, **kwargs):
         """
@@ -160,6 +248,7 @@ class AuthService:
                 setattr(user, field, kwargs[field])
         
         db.session.commit()
+        AuthService.invalidate_user(user_id)
         return user.to_dict()
     
     @staticmethod
@@ -197,5 +286,6 @@ class AuthService:
         # Mettre à jour le mot de passe
         user.set_password(new_password)
         db.session.commit()
+        AuthService.invalidate_user(user_id)
         
         return True
\ No newline at end of file
@@ -0,0 +1,302 @@
+"""
+Service du flux iCalendar (.ics) des plannings et des emplois du temps
+
+Le flux d'un utilisateur contient les cours de ses emplois du temps (un
+événement hebdomadaire RRULE par cours) et les sessions de ses plannings
+actifs. Les clients de calendrier l'interrogent toutes les quelques minutes :
+
+1. le jeton de l'URL est vérifié par signature, puis son nonce est comparé
+   à celui de l'utilisateur (lu dans le cache ; régénérer le jeton change
+   le nonce et révoque l'ancienne URL) ;
+2. la version du calendrier de l'utilisateur est lue dans le cache : si elle
+   correspond à l'ETag du client, la réponse est 304 ;
+3. sinon le flux complet de cette version est lu dans le cache ;
+4. sinon il est assemblé à partir de sections en cache, une par emploi du
+   temps et une par planning : seules les sections modifiées sont relues
+   dans la base et reformatées.
+
+Toute écriture sur les sessions, les cours ou les plannings appelle
+CalendarService.invalidate() après son commit : la version du calendrier et
+celle des sections concernées changent. Chaque version est lue avant les
+données qu'elle couvre, si bien qu'un rendu concurrent d'une écriture ne
+peut être enregistré que sous l'ancienne version.
+"""
+import hmac
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import select, update
+
+from app import db
+from app.models.planning import Planning
+from app.models.schedule import Course, Schedule
+from app.models.session import Session
+from app.models.task import Task
+from app.models.user import User
+from app.utils import ics
+from app.utils.cache import get_cache
+
+# Sel de signature des jetons de flux (distinct des autres usages de SECRET_KEY)
+TOKEN_SALT = 'calendar-feed'
+
+# Avertissement « cache non partagé » déjà journalisé par ce processus
+_unshared_cache_logged = False
+
+
+def _check_shared_cache(cache):
+    """
+    Signaler une invalidation qui ne sera pas vue des autres processus
+
+    Avec des workers Celery séparés (pas de mode eager), une invalidation
+    écrite dans le cache en mémoire d'un processus laisse les autres servir
+    l'ancien flux jusqu'à CALENDAR_CACHE_TTL : REDIS_URL doit être configuré
+    pour tous les processus.
+    """
+    global _unshared_cache_logged
+    if _unshared_cache_logged or cache.shared:
+        return
+    celery = current_app.extensions.get('celery')
+    if celery is None or celery.conf.task_always_eager:
+        return
+    _unshared_cache_logged = True
+    current_app.logger.error(
+        "Flux .ics : cache en mémoire avec des workers Celery séparés, les invalidations "
+        "ne sont pas partagées entre processus (configurer REDIS_URL)"
+    )
+
+
+class CalendarService:
+    """Service pour générer et mettre en cache le flux .ics d'un utilisateur"""
+
+    @staticmethod
+    def _serializer():
+        return URLSafeSerializer(current_app.config['SECRET_KEY'], salt=TOKEN_SALT)
+
+    @staticmethod
+    def _nonce(user_id):
+        """Nonce courant des jetons d'un utilisateur (None s'il n'en a pas)"""
+        cache = get_cache()
+        key = f"calendar:{user_id}:nonce"
+        nonce = cache.get(key)
+        if nonce is None:
+            nonce = db.session.execute(
+                select(User.calendar_nonce).where(User.id == user_id)
+            ).scalar()
+            if nonce is not None:
+                cache.set(key, nonce, ttl=current_app.config['CALENDAR_CACHE_TTL'])
+        return nonce
+
+    @staticmethod
+    def _set_nonce(user_id, only_if_missing=False):
+        """Enregistrer un nouveau nonce et renvoyer le nonce courant"""
+        statement = update(User).where(User.id == user_id).values(calendar_nonce=secrets.token_urlsafe(16))
+        if only_if_missing:
+            # Deux premières demandes simultanées : la seconde garde le nonce de la première
+            statement = statement.where(User.calendar_nonce.is_(None))
+        db.session.execute(statement)
+        db.session.commit()
+        get_cache().delete(f"calendar:{user_id}:nonce")
+        nonce = CalendarService._nonce(user_id)
+        if nonce is None:
+            raise ValueError("Utilisateur non trouvé")
+        return nonce
+
+    @staticmethod
+    def make_token(user_id):
+        """
+        Jeton de l'URL du flux d'un utilisateur
+
+        Le jeton signe l'ID et le nonce de l'utilisateur (créé à la première
+        demande) : il reste valable jusqu'à regenerate_token().
+
+        Raises:
+            ValueError: Si l'utilisateur n'existe pas
+        """
+        user_id = int(user_id)
+        nonce = CalendarService._nonce(user_id) or CalendarService._set_nonce(user_id, only_if_missing=True)
+        return CalendarService._serializer().dumps([user_id, nonce])
+
+    @staticmethod
+    def regenerate_token(user_id):
+        """
+        Nouveau jeton de flux ; les URL données auparavant cessent de fonctionner
+
+        Raises:
+            ValueError: Si l'utilisateur n'existe pas
+        """
+        user_id = int(user_id)
+        nonce = CalendarService._set_nonce(user_id)
+        return CalendarService._serializer().dumps([user_id, nonce])
+
+    @staticmethod
+    def user_for_token(token):
+        """
+        Utilisateur d'un jeton de flux
+
+        Raises:
+            ValueError: Si le jeton est invalide ou a été régénéré
+        """
+        try:
+            payload = CalendarService._serializer().loads(token)
+        except BadSignature:
+            raise ValueError("Jeton de calendrier invalide")
+        if not (isinstance(payload, list) and len(payload) == 2
+                and isinstance(payload[0], int) and isinstance(payload[1], str)):
+            raise ValueError("Jeton de calendrier invalide")
+        user_id, nonce = payload
+        current = CalendarService._nonce(user_id)
+        if current is None or not hmac.compare_digest(nonce, current):
+            raise ValueError("Jeton de calendrier invalide")
+        return user_id
+
+    @staticmethod
+    def _version(key):
+        """Version stockée sous une clé (créée si absente du cache)"""
+        cache = get_cache()
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, uuid.uuid4().hex, ttl=current_app.config['CALENDAR_CACHE_TTL'])
+            version = cache.get(key)
+        return version
+
+    @staticmethod
+    def get_version(user_id):
+        """Version courante du calendrier d'un utilisateur"""
+        return CalendarService._version(f"calendar:{user_id}:version")
+
+    @staticmethod
+    def invalidate(user_ids, planning_ids=(), schedule_ids=()):
+        """
+        Signaler une modification (à appeler après le commit)
+
+        Args:
+            user_ids: Utilisateur(s) dont le calendrier a changé
+            planning_ids: Plannings dont les sessions ont changé
+            schedule_ids: Emplois du temps dont les cours ont changé
+        """
+        if isinstance(user_ids, (int, str)):
+            user_ids = [user_ids]
+        keys = [f"calendar:planning:{planning_id}:version" for planning_id in planning_ids]
+        keys += [f"calendar:schedule:{schedule_id}:version" for schedule_id in schedule_ids]
+        keys += [f"calendar:{int(user_id)}:version" for user_id in user_ids]
+
+        cache = get_cache()
+        _check_shared_cache(cache)
+        ttl = current_app.config['CALENDAR_CACHE_TTL']
+        for key in keys:
+            cache.set(key, uuid.uuid4().hex, ttl=ttl)
+
+    @staticmethod
+    def get_feed(user_id, version):
+        """
+        Flux .ics d'une version du calendrier, depuis le cache si possible
+
+        Args:
+            user_id: ID de l'utilisateur
+            version: Version renvoyée par get_version()
+
+        Returns:
+            str: Calendrier iCalendar
+        """
+        cache = get_cache()
+        key = f"calendar:{user_id}:feed:{version}"
+        feed = cache.get(key)
+        if feed is None:
+            feed = CalendarService.render(user_id)
+            cache.set(key, feed, ttl=current_app.config['CALENDAR_CACHE_TTL'])
+        return feed
+
+    @staticmethod
+    def render(user_id):
+        """Assembler le flux à partir des sections (en cache ou recalculées)"""
+        schedule_ids = db.session.execute(
+            select(Schedule.id).where(Schedule.user_id == user_id).order_by(Schedule.date_import)
+        ).scalars().all()
+        planning_ids = db.session.execute(
+            select(Planning.id).where(Planning.user_id == user_id, Planning.actif.is_(True))
+        ).scalars().all()
+
+        events = [CalendarService._section('schedule', schedule_id) for schedule_id in schedule_ids]
+        events += [CalendarService._section('planning', planning_id) for planning_id in planning_ids]
+        config = current_app.config
+        return ics.calendar('Planning d\'étude', config['CALENDAR_TIMEZONE'], events)
+
+    @staticmethod
+    def _section(kind, section_id):
+        """Événements d'un emploi du temps ou d'un planning, depuis le cache si possible"""
+        cache = get_cache()
+        version = CalendarService._version(f"calendar:{kind}:{section_id}:version")
+        key = f"calendar:{kind}:{section_id}:{version}"
+        section = cache.get(key)
+        if section is None:
+            if kind == 'schedule':
+                section = CalendarService._render_schedule(section_id)
+            else:
+                section = CalendarService._render_planning(section_id)
+            cache.set(key, section, ttl=current_app.config['CALENDAR_CACHE_TTL'])
+        return section
+
+    @staticmethod
+    def _render_schedule(schedule_id):
+        """Un événement hebdomadaire par cours, à partir de la semaine d'import"""
+        date_import = db.session.execute(
+            select(Schedule.date_import).where(Schedule.id == schedule_id)
+        ).scalar() or datetime.utcnow()
+        courses = db.session.execute(
+            select(Course.id, Course.jour, Course.heure_debut, Course.heure_fin,
+                   Course.matiere, Course.salle, Course.enseignant)
+            .where(Course.schedule_id == schedule_id)
+        ).all()
+
+        rrule = f"FREQ=WEEKLY;COUNT={current_app.config['CALENDAR_COURSE_WEEKS']}"
+        events = []
+        for course in courses:
+            day = ics.weekday(course.jour)
+            if day is None:
+                continue
+            code, index = day
+            first = ics.first_weekday(date_import.date(), index)
+            events.append(ics.event(
+                uid=f"course-{course.id}@study-assistant",
+                dtstamp=date_import,
+                start=datetime.combine(first, course.heure_debut),
+                end=datetime.combine(first, course.heure_fin),
+                summary=course.matiere,
+                description=course.enseignant,
+                location=course.salle,
+                rrule=f"{rrule};BYDAY={code}",
+            ))
+        return ''.join(events)
+
+    @staticmethod
+    def _render_planning(planning_id):
+        """Un événement par session du planning"""
+        sessions = db.session.execute(
+            select(Session.id, Session.date, Session.heure_debut, Session.heure_fin, Session.matiere,
+                   Session.description, Session.completee, Session.updated_at, Task.titre)
+            .outerjoin(Task, Session.task_id == Task.id)
+            .where(Session.planning_id == planning_id)
+        ).all()
+
+        events = []
+        for session in sessions:
+            end = datetime.combine(session.date, session.heure_fin)
+            start = datetime.combine(session.date, session.heure_debut)
+            if end <= start:
+                end += timedelta(days=1)
+            description = '\n'.join(
+                part for part in (session.titre, session.description,
+                                  'Session terminée' if session.completee else None) if part
+            )
+            events.append(ics.event(
+                uid=f"session-{session.id}@study-assistant",
+                dtstamp=session.updated_at or start,
+                start=start,
+                end=end,
+                summary=session.matiere or session.titre or 'Session d\'étude',
+                description=description,
+                status='CONFIRMED',
+            ))
+        return ''.join(events)
@@ -0,0 +1,341 @@
+"""
+Service d'export et d'import des données d'un utilisateur
+
+Format : NDJSON (un objet JSON par ligne), éventuellement compressé en gzip.
+La première ligne décrit l'export ; chaque ligne suivante contient une ligne
+de table :
+
+    {"format": "study-assistant-export", "version": 1, "exported_at": ..., "user": {...}}
+    {"table": "subjects", "row": {"id": 3, "titre": "Mathématiques", ...}}
+    {"table": "tasks", "row": {...}}
+
+Les tables sont écrites parents d'abord (EXPORT_TABLES). Les valeurs sont
+celles des colonnes, dates et heures complètes en ISO 8601.
+
+Export : les lignes sont lues par une requête SQL par table, sans l'ORM, avec
+yield_per (curseur côté serveur sous PostgreSQL) et écrites par blocs de
+CHUNK_SIZE octets : la mémoire utilisée ne dépend pas de la taille du compte.
+
+Import : le fichier est lu ligne par ligne ; les lignes reçoivent de nouveaux
+IDs (les références entre tables sont renumérotées) et sont écrites par lots
+avec app.utils.bulk (COPY sous PostgreSQL, executemany ailleurs), dans une
+seule transaction. Seules les correspondances d'IDs des tables référencées
+(matières, tâches, emplois du temps, plannings) sont gardées en mémoire.
+"""
+import zlib
+from datetime import date, datetime, time
+
+import orjson
+from sqlalchemy import Date, DateTime, Time, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.services.calendar_service import CalendarService
+from app.services.notification_service import NotificationService
+from app.services.statistics_service import StatisticsService
+from app.utils.bulk import bulk_insert, reserve_ids
+from app.utils.serializers import dump
+
+EXPORT_FORMAT = 'study-assistant-export'
+EXPORT_VERSION = 1
+
+# Tables exportées, dans l'ordre d'écriture (parents d'abord)
+EXPORT_TABLES = ('subjects', 'tasks', 'schedules', 'courses', 'plannings', 'sessions', 'notifications')
+
+# Colonnes de clé étrangère renumérotées à l'import : colonne -> table référencée
+FOREIGN_KEYS = {
+    'tasks': {'subject_id': 'subjects'},
+    'courses': {'schedule_id': 'schedules'},
+    'sessions': {'planning_id': 'plannings', 'task_id': 'tasks'},
+}
+
+# Tables dont les IDs sont référencés par d'autres tables
+REFERENCED_TABLES = {'subjects', 'schedules', 'tasks', 'plannings'}
+
+# Lignes lues par aller-retour avec la base (export)
+YIELD_PER = 1000
+
+# Taille des blocs envoyés au client (export)
+CHUNK_SIZE = 64 * 1024
+
+# Lignes écrites par lot (import)
+IMPORT_BATCH_SIZE = 5000
+
+# Valeurs imposées à l'import : table -> {colonne: valeur}
+# (le planning actif du compte reste le seul actif)
+FORCED_VALUES = {
+    'plannings': {'actif': False},
+}
+
+_PARSERS = [
+    (DateTime, datetime.fromisoformat),
+    (Date, date.fromisoformat),
+    (Time, time.fromisoformat),
+]
+
+
+def _tables():
+    return db.metadata.tables
+
+
+def _export_query(name, user_id):
+    """Requête des lignes d'une table appartenant à l'utilisateur"""
+    tables = _tables()
+    table = tables[name]
+    if name == 'courses':
+        schedules = tables['schedules']
+        return select(table).join(schedules, table.c.schedule_id == schedules.c.id).where(
+            schedules.c.user_id == user_id
+        )
+    if name == 'sessions':
+        plannings = tables['plannings']
+        return select(table).join(plannings, table.c.planning_id == plannings.c.id).where(
+            plannings.c.user_id == user_id
+        )
+    return select(table).where(table.c.user_id == user_id)
+
+
+def _parser(column):
+    for column_type, parse in _PARSERS:
+        if isinstance(column.type, column_type):
+            return parse
+    return None
+
+
+def _default(column):
+    """Valeur par défaut (constante) d'une colonne absente de la ligne importée"""
+    if column.default is not None and column.default.is_scalar:
+        return column.default.arg
+    return None
+
+
+class _Importer:
+    """Renumérotation et écriture par lots des lignes importées"""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.now = datetime.utcnow()
+        self.connection = db.session.connection()
+        self.ids = {name: {} for name in REFERENCED_TABLES}
+        self.counts = {name: 0 for name in EXPORT_TABLES}
+        self.table = None
+        self.pending = []
+        self._columns = {}
+
+    def _layout(self, name):
+        """
+        Colonnes écrites pour une table, avec pour chacune la fonction de
+        conversion, la valeur par défaut et l'obligation d'une valeur
+        """
+        layout = self._columns.get(name)
+        if layout is None:
+            table = _tables()[name]
+            columns = [
+                (column.name, _parser(column), _default(column), not column.nullable)
+                for column in table.columns
+            ]
+            layout = self._columns[name] = (table, columns)
+        return layout
+
+    def add(self, name, row):
+        if name not in EXPORT_TABLES:
+            raise ValueError(f"Table inconnue : {name}")
+        if not isinstance(row, dict):
+            raise ValueError(f"Ligne invalide pour la table {name}")
+        if self.table is not None and name != self.table:
+            self.flush()
+        if name != self.table and self.counts[name]:
+            raise ValueError(f"Les lignes de la table {name} doivent être consécutives")
+        self.table = name
+        self.pending.append(row)
+        if len(self.pending) >= IMPORT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Écrire les lignes en attente"""
+        name, rows = self.table, self.pending
+        if not rows:
+            return
+        self.pending = []
+        table, columns = self._layout(name)
+        foreign_keys = FOREIGN_KEYS.get(name, {})
+        forced = FORCED_VALUES.get(name, {})
+        new_ids = reserve_ids(self.connection, table, len(rows))
+        mapping = self.ids.get(name)
+
+        values = []
+        for row, new_id in zip(rows, new_ids):
+            if mapping is not None and row.get('id') is not None:
+                mapping[row['id']] = new_id
+            record = []
+            for column, parse, default, required in columns:
+                if column == 'id':
+                    value = new_id
+                elif column == 'user_id':
+                    value = self.user_id
+                elif column == 'updated_at':
+                    # Lignes nouvelles pour ce compte : visibles par la synchronisation
+                    value = self.now
+                elif column in forced:
+                    value = forced[column]
+                else:
+                    value = row.get(column)
+                    if value is None:
+                        value = default
+                        if value is None and required:
+                            raise ValueError(f"{name}.{column} manquant (ligne {row.get('id')})")
+                    elif column in foreign_keys:
+                        target = self.ids[foreign_keys[column]]
+                        if value not in target:
+                            raise ValueError(f"{name}.{column} = {value} ne correspond à aucune ligne importée")
+                        value = target[value]
+                    elif parse is not None:
+                        try:
+                            value = parse(value)
+                        except (TypeError, ValueError):
+                            raise ValueError(f"Valeur invalide pour {name}.{column} : {value!r}")
+                record.append(value)
+            values.append(tuple(record))
+
+        bulk_insert(self.connection, table, [column[0] for column in columns], values)
+        self.counts[name] += len(values)
+
+
+class ExportService:
+    """Service gérant l'export et l'import des données d'un utilisateur"""
+
+    @staticmethod
+    def iter_records(user_id):
+        """
+        Parcourir les données d'un utilisateur ligne par ligne
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+
+        Yields:
+            bytes: Une ligne NDJSON (en-tête puis une ligne par ligne de table)
+
+        Raises:
+            ValueError: Si l'utilisateur n'existe pas
+        """
+        from app.models.user import User
+
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        user = db.session.get(User, user_id)
+        if user is None:
+            raise ValueError("Utilisateur non trouvé")
+
+        yield orjson.dumps({
+            'format': EXPORT_FORMAT,
+            'version': EXPORT_VERSION,
+            'exported_at': datetime.utcnow(),
+            'tables': list(EXPORT_TABLES),
+            'user': dump(user),
+        }) + b'\n'
+
+        for name in EXPORT_TABLES:
+            prefix = b'{"table":"' + name.encode() + b'","row":'
+            result = db.session.execute(
+                _export_query(name, user_id), execution_options={'yield_per': YIELD_PER}
+            )
+            for partition in result.partitions():
+                for row in partition:
+                    yield prefix + orjson.dumps(row._asdict()) + b'}\n'
+
+    @staticmethod
+    def stream_export(user_id, compress=False):
+        """
+        Export d'un utilisateur en blocs d'environ CHUNK_SIZE octets
+
+        La vérification de l'utilisateur a lieu avant le premier bloc, si
+        bien qu'une erreur peut encore être renvoyée comme réponse normale.
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            compress: Compresser en gzip
+
+        Returns:
+            generator: Blocs d'octets (NDJSON ou gzip)
+
+        Raises:
+            ValueError: Si l'utilisateur n'existe pas
+        """
+        records = ExportService.iter_records(user_id)
+        header = next(records)
+
+        def chunks():
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+            buffer, size = [header], len(header)
+            for line in records:
+                buffer.append(line)
+                size += len(line)
+                if size >= CHUNK_SIZE:
+                    data = b''.join(buffer)
+                    buffer, size = [], 0
+                    data = compressor.compress(data) if compressor else data
+                    if data:
+                        yield data
+            data = b''.join(buffer)
+            yield compressor.compress(data) + compressor.flush() if compressor else data
+
+        return chunks()
+
+    @staticmethod
+    def import_records(user_id, lines):
+        """
+        Importer un export dans le compte d'un utilisateur
+
+        Les données importées s'ajoutent à celles du compte, avec de nouveaux
+        IDs ; les plannings importés sont inactifs. Tout est écrit dans une
+        seule transaction : en cas d'erreur, rien n'est importé.
+
+        Args:
+            user_id: ID de l'utilisateur destinataire (string ou int)
+            lines: Itérable de lignes NDJSON (bytes ou str), en-tête compris
+
+        Returns:
+            dict: Nombre de lignes importées par table
+
+        Raises:
+            ValueError: Si le fichier n'est pas un export valide
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        lines = iter(lines)
+        try:
+            header = orjson.loads(next(lines))
+        except StopIteration:
+            raise ValueError("Fichier d'export vide")
+        except orjson.JSONDecodeError:
+            raise ValueError("En-tête d'export invalide")
+        if not isinstance(header, dict) or header.get('format') != EXPORT_FORMAT:
+            raise ValueError("Ce fichier n'est pas un export de l'application")
+        if header.get('version') != EXPORT_VERSION:
+            raise ValueError(f"Version d'export non prise en charge : {header.get('version')}")
+
+        importer = _Importer(user_id)
+        try:
+            for number, line in enumerate(lines, start=2):
+                if not line.strip():
+                    continue
+                try:
+                    record = orjson.loads(line)
+                    name, row = record['table'], record['row']
+                except (orjson.JSONDecodeError, KeyError, TypeError):
+                    raise ValueError(f"Ligne {number} invalide")
+                importer.add(name, row)
+            importer.flush()
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            raise ValueError(f"Données incohérentes : {e.orig}")
+        except Exception:
+            db.session.rollback()
+            raise
+
+        StatisticsService.rebuild([user_id])
+        NotificationService._invalidate_many([user_id])
+        CalendarService.invalidate(user_id)
+        return importer.counts
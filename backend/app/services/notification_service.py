@@ -0,0 +1,352 @@
+"""
+Service de notifications
+Gère la lecture groupée des notifications et la génération des rappels
+"""
+from app import db
+from app.models.notification import Notification
+from app.models.planning import Planning
+from app.models.session import Session
+from app.models.task import Task
+from app.ml.planner import ETAT_TERMINEE
+from app.utils.cache import get_cache
+from app.utils.pagination import paginate, DEFAULT_LIMIT
+from app.utils.serializers import dump_many
+from sqlalchemy import select, update, insert, tuple_, func
+from datetime import datetime, timedelta
+import uuid
+
+# Délai entre le rappel et le début d'une session d'étude
+SESSION_REMINDER_LEAD = timedelta(hours=1)
+
+# Délai entre l'alerte et l'échéance d'une tâche
+TASK_REMINDER_LEAD = timedelta(hours=24)
+
+# Nombre de lignes lues et insérées par lot pendant un balayage
+SWEEP_BATCH_SIZE = 5000
+
+# Nombre de notifications récentes gardées en cache par utilisateur
+RECENT_CACHE_SIZE = 20
+
+# Durée de vie des entrées du cache (filet de sécurité en cas d'écriture concurrente)
+CACHE_TTL = 300
+
+
+class NotificationService:
+    """Service pour consulter, marquer et générer les notifications"""
+
+    @staticmethod
+    def _cache_keys(user_id):
+        """Clés de cache (compteur, récentes, version) d'un utilisateur"""
+        prefix = f"notifications:{user_id}"
+        return f"{prefix}:unread", f"{prefix}:recent", f"{prefix}:version"
+
+    @staticmethod
+    def _invalidate(user_id, unread_delta=None, reset_unread=False):
+        """
+        Mettre à jour le cache après une écriture
+
+        Le compteur est ajusté sur place, la liste des récentes est effacée et
+        la version (ETag) change.
+        """
+        cache = get_cache()
+        unread_key, recent_key, version_key = NotificationService._cache_keys(user_id)
+        if reset_unread:
+            cache.set(unread_key, 0, ttl=CACHE_TTL)
+        elif unread_delta:
+            cache.incr_if_exists(unread_key, unread_delta)
+        cache.delete(recent_key)
+        cache.set(version_key, uuid.uuid4().hex, ttl=CACHE_TTL)
+
+    @staticmethod
+    def _invalidate_many(user_ids):
+        """Effacer en une seule commande le cache de plusieurs utilisateurs"""
+        keys = [key for user_id in user_ids for key in NotificationService._cache_keys(user_id)]
+        get_cache().delete(*keys)
+
+    @staticmethod
+    def get_version(user_id):
+        """
+        Version courante des notifications d'un utilisateur (sans requête SQL)
+
+        Returns:
+            str: Jeton qui change à chaque écriture
+        """
+        cache = get_cache()
+        _, _, version_key = NotificationService._cache_keys(user_id)
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, uuid.uuid4().hex, ttl=CACHE_TTL)
+            version = cache.get(version_key)
+        return version
+
+    @staticmethod
+    def get_unread_summary(user_id):
+        """
+        Nombre de notifications non lues et notifications récentes, via le cache
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+
+        Returns:
+            dict: {'unread': int, 'recent': list}
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        cache = get_cache()
+        unread_key, recent_key, _ = NotificationService._cache_keys(user_id)
+
+        unread = cache.get(unread_key)
+        if unread is None:
+            unread = db.session.execute(
+                select(func.count(Notification.id))
+                .where(Notification.user_id == user_id, Notification.lue.is_(False))
+            ).scalar()
+            cache.set(unread_key, unread, ttl=CACHE_TTL)
+
+        recent = cache.get(recent_key)
+        if recent is None:
+            recent = NotificationService.get_notifications(user_id, limit=RECENT_CACHE_SIZE)
+            cache.set(recent_key, recent, ttl=CACHE_TTL)
+
+        return {'unread': unread, 'recent': recent}
+
+    @staticmethod
+    def get_notifications(user_id, unread_only=False, limit=50):
+        """
+        Récupérer les notifications d'un utilisateur
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            unread_only: Ne renvoyer que les notifications non lues
+            limit: Nombre maximum de notifications
+
+        Returns:
+            list: Notifications sérialisées, les plus récentes d'abord
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        query = Notification.query.filter(Notification.user_id == user_id)
+        if unread_only:
+            query = query.filter(Notification.lue.is_(False))
+
+        notifications = query.order_by(Notification.date_envoi.desc(), Notification.id.desc()).limit(limit)
+        return dump_many(notifications)
+
+    @staticmethod
+    def list_notifications(user_id, lue=None, limit=DEFAULT_LIMIT, cursor=None):
+        """
+        Lister les notifications d'un utilisateur, page par page
+
+        Les plus récentes d'abord, par curseur sur (created_at, id) ; l'index
+        (user_id, created_at, id) et son équivalent partiel limité aux non
+        lues couvrent le tri.
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            lue: Filtrer sur l'état de lecture (None pour toutes)
+            limit: Taille de la page
+            cursor: Curseur renvoyé par la page précédente
+
+        Returns:
+            dict: {'notifications': [...], 'next_cursor': str ou None}
+
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        query = Notification.query.filter(Notification.user_id == user_id)
+        if lue is not None:
+            query = query.filter(Notification.lue.is_(lue))
+
+        notifications, next_cursor = paginate(
+            query, [Notification.created_at, Notification.id], limit, cursor, descending=True
+        )
+        return {
+            'notifications': dump_many(notifications),
+            'next_cursor': next_cursor
+        }
+
+    @staticmethod
+    def mark_as_read(user_id, notification_ids=None):
+        """
+        Marquer des notifications comme lues en une seule requête UPDATE
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            notification_ids: IDs à marquer (toutes les non lues si None)
+
+        Returns:
+            int: Nombre de notifications modifiées
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        statement = (
+            update(Notification)
+            .where(Notification.user_id == user_id, Notification.lue.is_(False))
+            .values(lue=True)
+            .execution_options(synchronize_session=False)
+        )
+        if notification_ids is not None:
+            if not notification_ids:
+                return 0
+            statement = statement.where(Notification.id.in_(notification_ids))
+
+        result = db.session.execute(statement)
+        db.session.commit()
+
+        NotificationService._invalidate(
+            user_id,
+            unread_delta=-result.rowcount,
+            reset_unread=notification_ids is None
+        )
+        return result.rowcount
+
+    @staticmethod
+    def create_notifications(rows):
+        """
+        Insérer des notifications en une seule requête executemany
+
+        Le cache des utilisateurs concernés est effacé après le commit.
+
+        Args:
+            rows: Dictionnaires avec user_id, type, message et date_envoi
+
+        Returns:
+            int: Nombre de notifications créées
+        """
+        if not rows:
+            return 0
+        db.session.execute(insert(Notification), rows)
+        db.session.commit()
+        NotificationService._invalidate_many({row['user_id'] for row in rows})
+        return len(rows)
+
+    @staticmethod
+    def _session_reminders(now, horizon):
+        """Rappels des sessions d'étude à venir, par lots (keyset sur sessions.id)"""
+        last_id = 0
+        while True:
+            batch = db.session.execute(
+                select(Session.id, Planning.user_id, Session.date, Session.heure_debut, Session.matiere)
+                .join(Planning, Planning.id == Session.planning_id)
+                .where(
+                    Planning.actif.is_(True),
+                    Session.completee.is_(False),
+                    Session.date >= now.date(),
+                    Session.date <= (now + horizon + SESSION_REMINDER_LEAD).date(),
+                    Session.id > last_id
+                )
+                .order_by(Session.id)
+                .limit(SWEEP_BATCH_SIZE)
+            ).all()
+            if not batch:
+                return
+
+            rows = []
+            for _session_id, user_id, jour, heure_debut, matiere in batch:
+                start = datetime.combine(jour, heure_debut)
+                date_envoi = start - SESSION_REMINDER_LEAD
+                if start > now and date_envoi <= now + horizon:
+                    rows.append({
+                        'user_id': user_id,
+                        'type': 'rappel',
+                        'message': f"Session d'étude à {heure_debut.strftime('%H:%M')} : {matiere or 'révision'}",
+                        'date_envoi': date_envoi
+                    })
+            yield rows
+            last_id = batch[-1][0]
+
+    @staticmethod
+    def _task_reminders(now, horizon):
+        """Alertes des échéances de tâches à venir, par lots (keyset sur tasks.id)"""
+        last_id = 0
+        while True:
+            batch = db.session.execute(
+                select(Task.id, Task.user_id, Task.titre, Task.date_limite)
+                .where(
+                    Task.etat != ETAT_TERMINEE,
+                    Task.date_limite > now,
+                    Task.date_limite <= now + horizon + TASK_REMINDER_LEAD,
+                    Task.id > last_id
+                )
+                .order_by(Task.id)
+                .limit(SWEEP_BATCH_SIZE)
+            ).all()
+            if not batch:
+                return
+
+            yield [
+                {
+                    'user_id': user_id,
+                    'type': 'alerte',
+                    'message': f"Échéance proche : {titre} ({date_limite.strftime('%d/%m %H:%M')})",
+                    'date_envoi': date_limite - TASK_REMINDER_LEAD
+                }
+                for _task_id, user_id, titre, date_limite in batch
+            ]
+            last_id = batch[-1][0]
+
+    @staticmethod
+    def _without_duplicates(rows):
+        """Retirer les rappels déjà créés lors d'un balayage précédent"""
+        if not rows:
+            return rows
+
+        def key(row):
+            return row['user_id'], row['type'], row['date_envoi'], row['message']
+
+        keys = {key(row) for row in rows}
+        existing = set(db.session.execute(
+            select(Notification.user_id, Notification.type, Notification.date_envoi, Notification.message)
+            .where(
+                Notification.date_envoi.between(
+                    min(row['date_envoi'] for row in rows),
+                    max(row['date_envoi'] for row in rows)
+                ),
+                tuple_(
+                    Notification.user_id, Notification.type, Notification.date_envoi, Notification.message
+                ).in_(keys)
+            )
+        ).all())
+
+        unique = []
+        for row in rows:
+            if key(row) not in existing:
+                existing.add(key(row))
+                unique.append(row)
+        return unique
+
+    @staticmethod
+    def generate_reminders(now=None, horizon=timedelta(hours=1)):
+        """
+        Balayage périodique : créer les rappels des sessions et échéances à venir
+
+        Les sessions et tâches concernées sont lues par lots indexés (dates et
+        IDs), jamais utilisateur par utilisateur ; chaque lot est dédoublonné
+        sur (user_id, type, date_envoi, message) puis inséré en une seule
+        requête. À lancer au moins une fois par `horizon` (voir la
+        planification Celery beat).
+
+        Args:
+            now: Instant du balayage (par défaut maintenant)
+            horizon: Fenêtre couverte par ce balayage
+
+        Returns:
+            int: Nombre de notifications créées
+        """
+        now = now or datetime.utcnow()
+        created = 0
+        for batches in (
+            NotificationService._session_reminders(now, horizon),
+            NotificationService._task_reminders(now, horizon)
+        ):
+            for rows in batches:
+                created += NotificationService.create_notifications(
+                    NotificationService._without_duplicates(rows)
+                )
+        return created
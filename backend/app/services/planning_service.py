@@ -0,0 +1,549 @@
+"""
+Service de planification
+Génère les plannings d'étude à partir des tâches et de l'emploi du temps
+"""
+from app import db
+from app.models.planning import Planning
+from app.models.session import Session
+from app.models.task import Task
+from app.models.schedule import Schedule, Course
+from app.ml.planner import StudyPlanner, ETAT_TERMINEE
+from app.ml.workload import predict_hours
+from app.services.calendar_service import CalendarService
+from app.services.statistics_service import StatisticsService, session_fact
+from app.services.sync_service import SyncService
+from app.utils.serialization import load_plannings, serialize_planning
+from app.utils.pagination import paginate, DEFAULT_LIMIT
+from app.utils.serializers import dump, dump_many
+from flask import current_app
+from sqlalchemy import insert, update, delete
+from sqlalchemy.orm import joinedload
+from datetime import datetime, date, time
+
+
+def _parse_date(value, field):
+    """Convertir une date ISO (YYYY-MM-DD) en objet date"""
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError(f"Le champ {field} doit être une date au format AAAA-MM-JJ")
+
+
+class PlanningService:
+    """Service pour générer et consulter les plannings d'étude"""
+
+    @staticmethod
+    def _user_courses(user_id):
+        """Cours de tous les emplois du temps de l'utilisateur"""
+        return Course.query.join(Schedule).filter(Schedule.user_id == user_id).all()
+
+    @staticmethod
+    def parse_period(date_debut, date_fin):
+        """
+        Valider la période d'un planning
+
+        Args:
+            date_debut: Premier jour (date ou AAAA-MM-JJ)
+            date_fin: Dernier jour (date ou AAAA-MM-JJ)
+
+        Returns:
+            tuple: (date_debut, date_fin) en objets date
+
+        Raises:
+            ValueError: Si les dates sont invalides
+        """
+        date_debut = _parse_date(date_debut, 'date_debut')
+        date_fin = _parse_date(date_fin, 'date_fin')
+        if date_fin < date_debut:
+            raise ValueError("La date de fin doit être postérieure à la date de début")
+        return date_debut, date_fin
+
+    @staticmethod
+    def generate_planning(user_id, date_debut, date_fin, titre=None, now=None):
+        """
+        Générer un nouveau planning d'étude
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            date_debut: Premier jour du planning (date ou AAAA-MM-JJ)
+            date_fin: Dernier jour du planning (date ou AAAA-MM-JJ)
+            titre: Titre du planning (optionnel)
+            now: Instant à partir duquel planifier (par défaut maintenant)
+
+        Returns:
+            dict: Planning généré et tâches qui n'ont pas pu être planifiées
+
+        Raises:
+            ValueError: Si les dates sont invalides
+        """
+        # Convertir en int si c'est une string
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        date_debut, date_fin = PlanningService.parse_period(date_debut, date_fin)
+
+        # Tâches ouvertes avec leur matière (une seule requête)
+        tasks = (
+            Task.query.options(joinedload(Task.subject))
+            .filter(Task.user_id == user_id, Task.etat != ETAT_TERMINEE)
+            .filter(Task.date_limite >= datetime.combine(date_debut, datetime.min.time()))
+            .all()
+        )
+        courses = PlanningService._user_courses(user_id)
+
+        # Heures d'étude prévues par le modèle de charge (une prédiction groupée)
+        hours = predict_hours(user_id, tasks)
+        rows, unscheduled = StudyPlanner().plan(tasks, date_debut, date_fin, courses, now=now, hours=hours)
+
+        # Les sessions non complétées des plannings désactivés sortent des statistiques
+        removed = StatisticsService.counted_sessions(
+            Planning.user_id == user_id, Planning.actif.is_(True), Session.completee.is_(False)
+        )
+
+        # Un seul planning actif par utilisateur
+        db.session.execute(
+            update(Planning)
+            .where(Planning.user_id == user_id, Planning.actif.is_(True))
+            .values(actif=False)
+        )
+
+        planning = Planning(
+            user_id=user_id,
+            date_debut=date_debut,
+            date_fin=date_fin,
+            actif=True
+        )
+        if titre:
+            planning.titre = titre
+        db.session.add(planning)
+        db.session.flush()
+
+        # Insertion groupée de toutes les sessions
+        if rows:
+            for row in rows:
+                row['planning_id'] = planning.id
+            db.session.execute(insert(Session), rows)
+
+        tasks_by_id = {task.id: task for task in tasks}
+        StatisticsService.record_sessions(
+            added=[PlanningService._row_fact(user_id, row, tasks_by_id[row['task_id']]) for row in rows],
+            removed=removed
+        )
+        db.session.commit()
+        CalendarService.invalidate(user_id)
+
+        return {
+            'planning': serialize_planning(planning.id),
+            'unscheduled_task_ids': [task.id for task in unscheduled]
+        }
+
+    @staticmethod
+    def replan_task(user_id, task_id, now=None):
+        """
+        Replanifier uniquement les sessions touchées par la modification d'une tâche
+
+        Les sessions concernées sont les sessions futures non terminées de la
+        tâche. Si elles ne tiennent plus avant la nouvelle échéance, les sessions
+        des tâches moins urgentes situées dans la fenêtre [maintenant, échéance]
+        sont aussi libérées puis replacées. Le reste du planning n'est pas modifié.
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            task_id: ID de la tâche modifiée
+            now: Instant à partir duquel replanifier (par défaut maintenant)
+
+        Returns:
+            dict: Planning concerné et IDs des sessions insérées, mises à jour
+                et supprimées, plus les tâches qui n'ont pas pu être replacées
+
+        Raises:
+            ValueError: Si la tâche n'existe pas
+        """
+        # Convertir en int si c'est une string
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        now = now or datetime.utcnow()
+
+        task = Task.query.filter_by(id=task_id, user_id=user_id).first()
+        if not task:
+            raise ValueError("Tâche non trouvée")
+
+        diff = {'planning_id': None, 'inserted': [], 'updated': [], 'deleted': [], 'unscheduled_task_ids': []}
+
+        planning = (
+            Planning.query.filter_by(user_id=user_id, actif=True)
+            .order_by(Planning.created_at.desc(), Planning.id.desc())
+            .first()
+        )
+        if not planning:
+            return diff
+        diff['planning_id'] = planning.id
+
+        # Sessions déplaçables : futures et non terminées
+        sessions = (
+            Session.query.options(joinedload(Session.task))
+            .filter_by(planning_id=planning.id)
+            .all()
+        )
+        movable = [
+            session for session in sessions
+            if not session.completee and datetime.combine(session.date, session.heure_debut) >= now
+        ]
+        affected = [session for session in movable if session.task_id == task.id]
+
+        # Tâche terminée : ses sessions à venir sont simplement supprimées
+        if task.etat == ETAT_TERMINEE:
+            diff['deleted'] = [session.id for session in affected]
+            if affected:
+                removed = [PlanningService._session_fact(user_id, session) for session in affected]
+                db.session.execute(delete(Session).where(Session.id.in_(diff['deleted'])))
+                SyncService.record_deletions(user_id, 'sessions', diff['deleted'])
+                StatisticsService.record_sessions(removed=removed)
+                db.session.commit()
+                CalendarService.invalidate(user_id, planning_ids=[planning.id])
+            return diff
+
+        planner = StudyPlanner()
+        needed = planner.sessions_needed(task, predict_hours(user_id, [task])[task.id])
+
+        # Les sessions qui tiennent encore avant l'échéance restent en place
+        still_valid = [
+            session for session in affected
+            if datetime.combine(session.date, session.heure_fin) <= task.date_limite
+        ][:needed]
+        valid_ids = {session.id for session in still_valid}
+        affected = [session for session in affected if session.id not in valid_ids]
+        needed -= len(still_valid)
+
+        courses = PlanningService._user_courses(user_id)
+        affected_ids = {session.id for session in affected}
+        kept = [session for session in sessions if session.id not in affected_ids]
+        free = planner.free_time(planning.date_debut, planning.date_fin, courses, kept)
+        lo = free.slot_of(max(now, datetime.combine(planning.date_debut, time.min)))
+
+        demands = [(task, needed)]
+        placements, unscheduled = planner.repack(free, demands, lo)
+
+        if unscheduled:
+            # Pas assez de place : libérer la fenêtre occupée par des tâches moins urgentes
+            deadline = task.date_limite.date()
+            displaced = [
+                session for session in movable
+                if session.task_id and session.task_id != task.id
+                and session.date <= deadline
+                and session.task.date_limite > task.date_limite
+            ]
+            for start in placements[task.id]:
+                free.release(start, planner.session_slots)
+            for session in displaced:
+                free.release(*PlanningService._session_span(free, session))
+
+            counts = {task.id: needed}
+            others = {}
+            for session in displaced:
+                counts[session.task_id] = counts.get(session.task_id, 0) + 1
+                others[session.task_id] = session.task
+            demands = [(task, counts[task.id])] + [(other, counts[other.id]) for other in others.values()]
+            placements, unscheduled = planner.repack(free, demands, lo)
+            affected.extend(displaced)
+
+        diff['unscheduled_task_ids'] = [t.id for t in unscheduled]
+        tasks_by_id = {t.id: t for t, _ in demands}
+
+        # Réutiliser les lignes existantes de chaque tâche avant d'en insérer de nouvelles
+        old_by_task = {}
+        for session in sorted(affected, key=lambda s: (s.date, s.heure_debut)):
+            old_by_task.setdefault(session.task_id, []).append(session)
+
+        updates, inserts = [], []
+        for task_key, starts in placements.items():
+            old_sessions = old_by_task.get(task_key, [])
+            for index, start in enumerate(starts):
+                row = planner.session_row(free, tasks_by_id[task_key], start)
+                if index < len(old_sessions):
+                    old = old_sessions[index]
+                    if (old.date, old.heure_debut, old.heure_fin) != (row['date'], row['heure_debut'], row['heure_fin']):
+                        updates.append({
+                            'id': old.id,
+                            'date': row['date'],
+                            'heure_debut': row['heure_debut'],
+                            'heure_fin': row['heure_fin']
+                        })
+                else:
+                    row['planning_id'] = planning.id
+                    inserts.append(row)
+            diff['deleted'].extend(session.id for session in old_sessions[len(starts):])
+
+        # Statistiques : anciennes positions retirées, nouvelles ajoutées (lues avant
+        # l'UPDATE groupé, qui rafraîchit les objets de la session)
+        by_id = {session.id: session for session in affected}
+        moved = [by_id[row['id']] for row in updates]
+        removed = [PlanningService._session_fact(user_id, by_id[session_id]) for session_id in diff['deleted']]
+        removed += [PlanningService._session_fact(user_id, session) for session in moved]
+        added = [PlanningService._row_fact(user_id, row, tasks_by_id[row['task_id']]) for row in inserts]
+        added += [
+            session_fact(user_id, row['date'], row['heure_debut'], row['heure_fin'], session.task.subject_id)
+            for row, session in zip(updates, moved)
+        ]
+
+        # Écritures groupées dans une seule transaction
+        if updates:
+            db.session.execute(update(Session), updates)
+        if inserts:
+            diff['inserted'] = db.session.execute(
+                insert(Session).returning(Session.id, sort_by_parameter_order=True), inserts
+            ).scalars().all()
+        if diff['deleted']:
+            db.session.execute(delete(Session).where(Session.id.in_(diff['deleted'])))
+            SyncService.record_deletions(user_id, 'sessions', diff['deleted'])
+        StatisticsService.record_sessions(added=added, removed=removed)
+        db.session.commit()
+        if updates or inserts or diff['deleted']:
+            CalendarService.invalidate(user_id, planning_ids=[planning.id])
+
+        diff['updated'] = [row['id'] for row in updates]
+        return diff
+
+    @staticmethod
+    def _session_fact(user_id, session):
+        """Session existante (tâche chargée) au format des statistiques"""
+        subject_id = session.task.subject_id if session.task else None
+        return session_fact(user_id, session.date, session.heure_debut, session.heure_fin, subject_id, session.completee)
+
+    @staticmethod
+    def _row_fact(user_id, row, task):
+        """Ligne de session produite par le planificateur au format des statistiques"""
+        return session_fact(user_id, row['date'], row['heure_debut'], row['heure_fin'], task.subject_id)
+
+    @staticmethod
+    def set_session_completed(user_id, session_id, completee=True):
+        """
+        Marquer une session d'étude comme complétée (ou non)
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            session_id: ID de la session
+            completee: Nouvel état
+
+        Returns:
+            dict: Session mise à jour
+
+        Raises:
+            ValueError: Si la session n'existe pas
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        session = (
+            Session.query.options(joinedload(Session.task))
+            .join(Planning, Planning.id == Session.planning_id)
+            .filter(Session.id == session_id, Planning.user_id == user_id)
+            .first()
+        )
+        if not session:
+            raise ValueError("Session non trouvée")
+
+        completee = bool(completee)
+        if bool(session.completee) != completee:
+            fact = session_fact(
+                user_id, session.date, session.heure_debut, session.heure_fin,
+                session.task.subject_id if session.task else None, completee=True
+            )
+            if session.planning.actif:
+                change = {'completed': [fact]} if completee else {'uncompleted': [fact]}
+            else:
+                # Dans un planning désactivé, seules les sessions complétées sont comptées
+                change = {'added': [fact]} if completee else {'removed': [fact]}
+            session.completee = completee
+            StatisticsService.record_sessions(**change)
+            db.session.commit()
+            CalendarService.invalidate(user_id, planning_ids=[session.planning_id])
+
+        return dump(session)
+
+    @staticmethod
+    def set_sessions_completed(user_id, items):
+        """
+        Marquer plusieurs sessions comme complétées (ou non) en une transaction
+
+        Les sessions sont lues par une seule requête et modifiées par un
+        UPDATE groupé (executemany par clé primaire) ; un élément invalide
+        est signalé dans 'errors' sans empêcher les autres.
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            items: Liste de {"id": ..., "completee": true/false}
+
+        Returns:
+            dict: {'updated': [sessions modifiées], 'unchanged': [ids],
+                'errors': [{'index', 'error'}]}
+
+        Raises:
+            ValueError: Si la requête dépasse BULK_MAX_ITEMS éléments
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        items = list(items)
+        max_items = current_app.config['BULK_MAX_ITEMS']
+        if len(items) > max_items:
+            raise ValueError(f"{max_items} éléments au plus par requête")
+
+        errors, wanted = [], {}
+        for index, item in enumerate(items):
+            session_id = item.get('id') if isinstance(item, dict) else None
+            if not isinstance(session_id, int) or isinstance(session_id, bool):
+                errors.append({'index': index, 'error': "Le champ id doit être un entier"})
+            elif not isinstance(item.get('completee', True), bool):
+                errors.append({'index': index, 'error': "Le champ completee doit être un booléen"})
+            elif session_id in wanted:
+                errors.append({'index': index, 'error': "Session présente plusieurs fois dans la requête"})
+            else:
+                wanted[session_id] = (index, item.get('completee', True))
+
+        sessions = (
+            Session.query.options(joinedload(Session.task), joinedload(Session.planning))
+            .join(Planning, Planning.id == Session.planning_id)
+            .filter(Session.id.in_(wanted), Planning.user_id == user_id)
+            .all()
+        ) if wanted else []
+        found = {session.id: session for session in sessions}
+
+        updates, unchanged, planning_ids = [], [], set()
+        change = {'completed': [], 'uncompleted': [], 'added': [], 'removed': []}
+        for session_id, (index, completee) in wanted.items():
+            session = found.get(session_id)
+            if session is None:
+                errors.append({'index': index, 'error': "Session non trouvée"})
+                continue
+            if bool(session.completee) == completee:
+                unchanged.append(session_id)
+                continue
+            fact = session_fact(
+                user_id, session.date, session.heure_debut, session.heure_fin,
+                session.task.subject_id if session.task else None, completee=True
+            )
+            if session.planning.actif:
+                change['completed' if completee else 'uncompleted'].append(fact)
+            else:
+                # Dans un planning désactivé, seules les sessions complétées sont comptées
+                change['added' if completee else 'removed'].append(fact)
+            updates.append({'id': session_id, 'completee': completee})
+            planning_ids.add(session.planning_id)
+
+        if updates:
+            try:
+                db.session.execute(update(Session), updates)
+                StatisticsService.record_sessions(**change)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            CalendarService.invalidate(user_id, planning_ids=sorted(planning_ids))
+
+        # Relecture groupée après le commit (une requête au lieu d'une par session)
+        changed = (
+            Session.query.options(joinedload(Session.task).joinedload(Task.subject))
+            .populate_existing()
+            .filter(Session.id.in_([row['id'] for row in updates]))
+            .order_by(Session.id)
+            .all()
+        ) if updates else []
+        errors.sort(key=lambda error: error['index'])
+        return {'updated': dump_many(changed), 'unchanged': unchanged, 'errors': errors}
+
+    @staticmethod
+    def _session_span(free, session):
+        """Créneau de départ et longueur d'une session dans un FreeTime"""
+        start = free.slot_of(datetime.combine(session.date, session.heure_debut))
+        end = free.slot_of(datetime.combine(session.date, session.heure_fin))
+        return start, end - start
+
+    @staticmethod
+    def get_user_plannings(user_id):
+        """
+        Récupérer les plannings d'un utilisateur avec leurs sessions
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+
+        Returns:
+            list: Plannings sérialisés
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        return dump_many(load_plannings(Planning.user_id == user_id))
+
+    @staticmethod
+    def get_planning(user_id, planning_id):
+        """
+        Récupérer un planning de l'utilisateur
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            planning_id: ID du planning
+
+        Returns:
+            dict: Planning sérialisé ou None
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        plannings = load_plannings(Planning.id == planning_id, Planning.user_id == user_id)
+        return dump(plannings[0]) if plannings else None
+
+    @staticmethod
+    def list_sessions(user_id, planning_id=None, completee=None, date_debut=None,
+                      limit=DEFAULT_LIMIT, cursor=None):
+        """
+        Lister les sessions d'un planning par date et heure, page par page
+
+        La pagination se fait par curseur sur (date, heure_debut, id), couvert
+        par l'index (planning_id, date, heure_debut, id).
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            planning_id: ID du planning (par défaut le planning actif)
+            completee: Filtrer sur l'état de complétion (None pour toutes)
+            date_debut: Premier jour (date ou AAAA-MM-JJ, optionnel)
+            limit: Taille de la page
+            cursor: Curseur renvoyé par la page précédente
+
+        Returns:
+            dict: {'planning_id', 'sessions', 'next_cursor'}, ou None si le
+                planning demandé n'existe pas
+
+        Raises:
+            ValueError: Si la date ou le curseur est invalide
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        planning = Planning.query.filter(Planning.user_id == user_id)
+        if planning_id is not None:
+            planning = planning.filter(Planning.id == planning_id).first()
+            if planning is None:
+                return None
+        else:
+            planning = planning.filter(Planning.actif.is_(True)).order_by(Planning.id.desc()).first()
+            if planning is None:
+                return {'planning_id': None, 'sessions': [], 'next_cursor': None}
+
+        query = (
+            Session.query
+            .options(joinedload(Session.task).joinedload(Task.subject))
+            .filter(Session.planning_id == planning.id)
+        )
+        if completee is not None:
+            query = query.filter(Session.completee.is_(completee))
+        if date_debut is not None:
+            query = query.filter(Session.date >= _parse_date(date_debut, 'date_debut'))
+
+        sessions, next_cursor = paginate(
+            query, [Session.date, Session.heure_debut, Session.id], limit, cursor
+        )
+        return {
+            'planning_id': planning.id,
+            'sessions': dump_many(sessions),
+            'next_cursor': next_cursor
+        }
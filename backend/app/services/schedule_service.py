@@ -0,0 +1,260 @@
+"""
+Service d'emploi du temps
+Gère l'import des emplois du temps PDF et la création des cours
+"""
+import os
+import uuid
+from itertools import islice
+from flask import current_app
+from werkzeug.utils import secure_filename
+from sqlalchemy import insert
+from app import db
+from app.models.schedule import Schedule, Course
+from app.ml.timetable_parser import iter_courses, PARSER_VERSION, PDFReadError
+from app.utils.pdf_cache import TimetableCache, CHUNK_SIZE
+from app.utils.serializers import dump, dump_many
+from app.services.calendar_service import CalendarService
+from app.services.sync_service import SyncService
+
+# Nombre de cours insérés par requête executemany
+INSERT_BATCH_SIZE = 500
+
+COURSE_FIELDS = ('jour', 'heure_debut', 'heure_fin', 'matiere', 'salle', 'enseignant')
+
+
+def _collect(courses, sink):
+    """Rendre les cours un par un en les ajoutant à `sink`"""
+    for course in courses:
+        sink.append(course)
+        yield course
+
+
+class ScheduleService:
+    """Service pour importer et consulter les emplois du temps"""
+
+    @staticmethod
+    def get_cache():
+        """Cache des emplois du temps déjà analysés"""
+        return TimetableCache(
+            current_app.config['PDF_CACHE_FOLDER'],
+            current_app.config['PDF_CACHE_MAX_BYTES'],
+            version=PARSER_VERSION
+        )
+
+    @staticmethod
+    def save_upload(user_id, file):
+        """
+        Enregistrer le PDF envoyé dans UPLOAD_FOLDER en calculant son empreinte
+
+        Args:
+            user_id: ID de l'utilisateur
+            file: Fichier reçu (werkzeug FileStorage)
+
+        Returns:
+            tuple: (chemin relatif à UPLOAD_FOLDER, empreinte SHA-256)
+
+        Raises:
+            ValueError: Si le fichier est absent ou n'est pas un PDF
+        """
+        if not file or not file.filename:
+            raise ValueError("Aucun fichier reçu")
+
+        filename = secure_filename(file.filename)
+        if not filename.lower().endswith('.pdf'):
+            raise ValueError("Le fichier doit être un PDF")
+
+        relative_path = os.path.join(str(user_id), f"{uuid.uuid4().hex}_{filename}")
+        absolute_path = os.path.join(current_app.config['UPLOAD_FOLDER'], relative_path)
+        os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
+
+        # Écrire et hacher en un seul passage sur le flux reçu
+        hasher = TimetableCache.new_hasher()
+        with open(absolute_path, 'wb') as handle:
+            for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b''):
+                hasher.update(chunk)
+                handle.write(chunk)
+        return relative_path, hasher.hexdigest()
+
+    @staticmethod
+    def insert_courses(schedule_id, courses):
+        """
+        Insérer des cours par lots (executemany) sans les charger tous en mémoire
+
+        Args:
+            schedule_id: ID de l'emploi du temps
+            courses: Itérable de tuples (jour, heure_debut, heure_fin, matiere, salle, enseignant)
+
+        Returns:
+            int: Nombre de cours insérés
+        """
+        courses = iter(courses)
+        total = 0
+        while True:
+            batch = [
+                dict(zip(COURSE_FIELDS, course), schedule_id=schedule_id)
+                for course in islice(courses, INSERT_BATCH_SIZE)
+            ]
+            if not batch:
+                return total
+            db.session.execute(insert(Course), batch)
+            total += len(batch)
+
+    @staticmethod
+    def create_schedule(user_id, file):
+        """
+        Enregistrer le PDF et créer l'emploi du temps (sans ses cours)
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            file: Fichier reçu (werkzeug FileStorage)
+
+        Returns:
+            tuple: (Schedule créé, empreinte SHA-256 du PDF)
+
+        Raises:
+            ValueError: Si le fichier est invalide
+        """
+        # Convertir en int si c'est une string
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        relative_path, digest = ScheduleService.save_upload(user_id, file)
+
+        schedule = Schedule(user_id=user_id, fichier_pdf=relative_path)
+        db.session.add(schedule)
+        db.session.commit()
+        return schedule, digest
+
+    @staticmethod
+    def _discard(user_id, schedule_id, absolute_path):
+        """Supprimer un emploi du temps dont l'import a échoué, avec son PDF"""
+        db.session.rollback()
+        schedule = db.session.get(Schedule, schedule_id)
+        if schedule is not None:
+            db.session.delete(schedule)
+            SyncService.record_deletions(user_id, 'schedules', [schedule_id])
+            db.session.commit()
+            CalendarService.invalidate(user_id, schedule_ids=[schedule_id])
+        try:
+            os.remove(absolute_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def import_courses(schedule_id, digest):
+        """
+        Extraire et insérer les cours d'un emploi du temps déjà enregistré
+
+        Si un PDF identique a déjà été analysé, ses cours sont copiés depuis
+        le cache sans nouvelle analyse. En cas d'échec (PDF illisible ou sans
+        cours, mais aussi erreur de la base ou du pool d'analyse), l'emploi du
+        temps et son fichier sont supprimés.
+
+        Args:
+            schedule_id: ID de l'emploi du temps
+            digest: Empreinte SHA-256 du PDF
+
+        Returns:
+            dict: ID de l'emploi du temps, de son propriétaire et nombre de cours
+
+        Raises:
+            ValueError: Si le PDF est illisible ou ne contient aucun cours
+            Exception: Toute autre erreur, propagée après la suppression
+        """
+        schedule = db.session.get(Schedule, schedule_id)
+        if not schedule:
+            raise ValueError("Emploi du temps non trouvé")
+        user_id = schedule.user_id
+        absolute_path = os.path.join(current_app.config['UPLOAD_FOLDER'], schedule.fichier_pdf)
+
+        cache = ScheduleService.get_cache()
+        cached = cache.get(digest)
+        parsed = []
+
+        try:
+            if cached is not None:
+                courses = cached
+            else:
+                # Conserver les tuples au passage pour alimenter le cache
+                courses = _collect(
+                    iter_courses(absolute_path, current_app.config['PDF_IMPORT_WORKERS']),
+                    parsed
+                )
+            total = ScheduleService.insert_courses(schedule.id, courses)
+            error = None if total else "Aucun cours trouvé dans le PDF"
+            if total:
+                db.session.commit()
+        except PDFReadError:
+            # Levée par iter_courses pendant l'insertion : seules les erreurs de
+            # lecture sont attribuées au fichier
+            error = "Impossible de lire l'emploi du temps PDF"
+        except Exception:
+            ScheduleService._discard(user_id, schedule_id, absolute_path)
+            raise
+
+        if error:
+            ScheduleService._discard(user_id, schedule_id, absolute_path)
+            raise ValueError(error)
+
+        CalendarService.invalidate(user_id, schedule_ids=[schedule_id])
+
+        if cached is None:
+            cache.put(digest, parsed)
+
+        return {'schedule_id': schedule_id, 'user_id': user_id, 'courses': total}
+
+    @staticmethod
+    def import_pdf(user_id, file):
+        """
+        Importer un emploi du temps PDF de façon synchrone
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            file: Fichier reçu (werkzeug FileStorage)
+
+        Returns:
+            dict: Emploi du temps créé avec ses cours
+
+        Raises:
+            ValueError: Si le fichier est invalide ou ne contient aucun cours
+        """
+        schedule, digest = ScheduleService.create_schedule(user_id, file)
+        ScheduleService.import_courses(schedule.id, digest)
+        return ScheduleService.get_schedule(schedule.user_id, schedule.id)
+
+    @staticmethod
+    def get_user_schedules(user_id):
+        """
+        Récupérer les emplois du temps d'un utilisateur
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+
+        Returns:
+            list: Emplois du temps sans leurs cours
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        schedules = (
+            Schedule.query.filter_by(user_id=user_id)
+            .order_by(Schedule.date_import.desc())
+            .all()
+        )
+        return dump_many(schedules, exclude=('courses',))
+
+    @staticmethod
+    def get_schedule(user_id, schedule_id):
+        """
+        Récupérer un emploi du temps de l'utilisateur avec ses cours
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            schedule_id: ID de l'emploi du temps
+
+        Returns:
+            dict: Emploi du temps ou None
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        schedule = Schedule.query.filter_by(id=schedule_id, user_id=user_id).first()
+        return dump(schedule) if schedule else None
@@ -0,0 +1,346 @@
+"""
+Service de statistiques
+Maintient les agrégats quotidiens (sessions et tâches) et sert le tableau de bord
+"""
+from app import db
+from app.models.planning import Planning
+from app.models.session import Session
+from app.models.statistics import DailyStat, TaskStat
+from app.models.subject import Subject
+from app.models.task import Task
+from app.models.user import User
+from app.ml.planner import ETAT_TERMINEE
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.dialects import postgresql, sqlite
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+import numpy as np
+import pandas as pd
+
+# Nombre d'utilisateurs recalculés par lot lors d'une reconstruction
+REBUILD_BATCH_SIZE = 500
+
+# Période par défaut du tableau de bord (jours)
+DEFAULT_PERIOD_DAYS = 30
+
+SESSION_COUNTERS = ('sessions_planifiees', 'sessions_completees', 'minutes_planifiees', 'minutes_etudiees')
+TASK_COUNTERS = ('taches_ouvertes', 'taches_terminees')
+
+_DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def session_minutes(jour, heure_debut, heure_fin):
+    """Durée d'une session en minutes"""
+    return int((datetime.combine(jour, heure_fin) - datetime.combine(jour, heure_debut)).total_seconds() // 60)
+
+
+def session_fact(user_id, jour, heure_debut, heure_fin, subject_id, completee=False):
+    """Tuple (user_id, jour, subject_id, minutes, completee) décrivant une session comptée"""
+    return user_id, jour, subject_id or 0, session_minutes(jour, heure_debut, heure_fin), bool(completee)
+
+
+def task_fact(task):
+    """Tuple (user_id, jour d'échéance, priorite, terminée) décrivant une tâche"""
+    return task.user_id, task.date_limite.date(), task.priorite or 1, task.etat == ETAT_TERMINEE
+
+
+class StatisticsService:
+    """
+    Service pour les statistiques d'étude
+
+    Une session est comptée si son planning est actif ou si elle est
+    complétée : les sessions terminées restent dans l'historique même après
+    la génération d'un nouveau planning. Les services qui écrivent des
+    sessions ou des tâches appellent record_sessions / record_tasks avec
+    les lignes ajoutées et retirées ; les agrégats sont mis à jour par une
+    seule requête d'upsert, dans la transaction de l'appelant.
+    """
+
+    @staticmethod
+    def _upsert(model, counters, deltas):
+        """
+        Ajouter des deltas aux compteurs d'un modèle d'agrégats (INSERT ... ON CONFLICT)
+
+        Args:
+            model: DailyStat ou TaskStat
+            counters: Noms des colonnes compteurs
+            deltas: dict {clé primaire (tuple): {compteur: delta}}
+        """
+        keys = [column.name for column in model.__table__.primary_key.columns]
+        rows = [
+            {**dict(zip(keys, key)), **{name: values.get(name, 0) for name in counters}}
+            for key, values in sorted(deltas.items())
+            if any(values.values())
+        ]
+        if not rows:
+            return
+
+        dialect = db.session.get_bind(model).dialect.name
+        if dialect not in _DIALECT_INSERTS:
+            raise ValueError(f"Base de données non supportée pour les statistiques : {dialect}")
+        statement = _DIALECT_INSERTS[dialect](model)
+        statement = statement.on_conflict_do_update(
+            index_elements=keys,
+            set_={name: getattr(model, name) + statement.excluded[name] for name in counters}
+        )
+        # Lignes triées par clé : verrous pris dans le même ordre par les transactions concurrentes
+        db.session.execute(statement, rows)
+
+    @staticmethod
+    def record_sessions(added=(), removed=(), completed=(), uncompleted=()):
+        """
+        Mettre à jour les agrégats de sessions
+
+        Args:
+            added: Sessions qui entrent dans les statistiques (session_fact)
+            removed: Sessions qui en sortent (session_fact)
+            completed: Sessions comptées qui viennent d'être complétées
+            uncompleted: Sessions comptées qui ne sont plus complétées
+        """
+        deltas = defaultdict(lambda: dict.fromkeys(SESSION_COUNTERS, 0))
+
+        for facts, sign in ((added, 1), (removed, -1)):
+            for user_id, jour, subject_id, minutes, completee in facts:
+                counters = deltas[(user_id, jour, subject_id)]
+                counters['sessions_planifiees'] += sign
+                counters['minutes_planifiees'] += sign * minutes
+                if completee:
+                    counters['sessions_completees'] += sign
+                    counters['minutes_etudiees'] += sign * minutes
+
+        for facts, sign in ((completed, 1), (uncompleted, -1)):
+            for user_id, jour, subject_id, minutes, _completee in facts:
+                counters = deltas[(user_id, jour, subject_id)]
+                counters['sessions_completees'] += sign
+                counters['minutes_etudiees'] += sign * minutes
+
+        StatisticsService._upsert(DailyStat, SESSION_COUNTERS, deltas)
+
+    @staticmethod
+    def record_tasks(added=(), removed=()):
+        """
+        Mettre à jour les agrégats de tâches
+
+        Un changement d'état, d'échéance ou de priorité s'enregistre comme le
+        retrait de l'ancienne version et l'ajout de la nouvelle.
+
+        Args:
+            added: Tâches ajoutées ou nouvelles versions (task_fact)
+            removed: Tâches supprimées ou anciennes versions (task_fact)
+        """
+        deltas = defaultdict(lambda: dict.fromkeys(TASK_COUNTERS, 0))
+        for facts, sign in ((added, 1), (removed, -1)):
+            for user_id, jour, priorite, terminee in facts:
+                counter = 'taches_terminees' if terminee else 'taches_ouvertes'
+                deltas[(user_id, jour, priorite)][counter] += sign
+        StatisticsService._upsert(TaskStat, TASK_COUNTERS, deltas)
+
+    @staticmethod
+    def counted_sessions(*criteria):
+        """
+        Sessions comptées dans les statistiques, sous forme de session_fact
+
+        Args:
+            criteria: Filtres SQLAlchemy supplémentaires sur Session / Planning
+
+        Returns:
+            list: Tuples (user_id, jour, subject_id, minutes, completee)
+        """
+        rows = db.session.execute(
+            select(
+                Planning.user_id, Session.date, Session.heure_debut, Session.heure_fin,
+                Task.subject_id, Session.completee
+            )
+            .join(Planning, Planning.id == Session.planning_id)
+            .outerjoin(Task, Task.id == Session.task_id)
+            .where((Planning.actif.is_(True)) | (Session.completee.is_(True)), *criteria)
+        ).all()
+        return [session_fact(*row) for row in rows]
+
+    @staticmethod
+    def _session_frame(user_ids):
+        """Sessions comptées des utilisateurs, agrégées par (user_id, jour, subject_id)"""
+        frame = pd.DataFrame(
+            db.session.execute(
+                select(
+                    Planning.user_id, Session.date.label('jour'), Task.subject_id,
+                    Session.heure_debut, Session.heure_fin, Session.completee
+                )
+                .join(Planning, Planning.id == Session.planning_id)
+                .outerjoin(Task, Task.id == Session.task_id)
+                .where(
+                    Planning.user_id.in_(user_ids),
+                    (Planning.actif.is_(True)) | (Session.completee.is_(True))
+                )
+            ).all(),
+            columns=['user_id', 'jour', 'subject_id', 'heure_debut', 'heure_fin', 'completee']
+        )
+        if frame.empty:
+            return []
+
+        # Durées vectorisées : heures converties en minutes depuis minuit
+        def minutes(column):
+            return np.fromiter(
+                (value.hour * 60 + value.minute for value in frame[column]), dtype=np.int64, count=len(frame)
+            )
+
+        frame['minutes'] = minutes('heure_fin') - minutes('heure_debut')
+        frame['completee'] = frame['completee'].fillna(False).astype(bool)
+        frame['subject_id'] = frame['subject_id'].fillna(0).astype(np.int64)
+        frame['minutes_etudiees'] = np.where(frame['completee'], frame['minutes'], 0)
+
+        grouped = frame.groupby(['user_id', 'jour', 'subject_id'], sort=False).agg(
+            sessions_planifiees=('minutes', 'size'),
+            sessions_completees=('completee', 'sum'),
+            minutes_planifiees=('minutes', 'sum'),
+            minutes_etudiees=('minutes_etudiees', 'sum')
+        )
+        return grouped.reset_index().to_dict('records')
+
+    @staticmethod
+    def _task_frame(user_ids):
+        """Tâches des utilisateurs, agrégées par (user_id, jour d'échéance, priorite)"""
+        frame = pd.DataFrame(
+            db.session.execute(
+                select(Task.user_id, Task.date_limite, Task.priorite, Task.etat)
+                .where(Task.user_id.in_(user_ids))
+            ).all(),
+            columns=['user_id', 'date_limite', 'priorite', 'etat']
+        )
+        if frame.empty:
+            return []
+
+        frame['jour'] = pd.to_datetime(frame['date_limite']).dt.date
+        frame['priorite'] = frame['priorite'].fillna(1).astype(np.int64)
+        frame['taches_terminees'] = (frame['etat'] == ETAT_TERMINEE).astype(np.int64)
+        frame['taches_ouvertes'] = 1 - frame['taches_terminees']
+
+        grouped = frame.groupby(['user_id', 'jour', 'priorite'], sort=False)[list(TASK_COUNTERS)].sum()
+        return grouped.reset_index().to_dict('records')
+
+    @staticmethod
+    def rebuild(user_ids=None, batch_size=REBUILD_BATCH_SIZE):
+        """
+        Recalculer entièrement les agrégats à partir des sessions et des tâches
+
+        Les utilisateurs sont traités par lots (keyset sur users.id) : pour
+        chaque lot, les lignes sont agrégées avec pandas, les anciens agrégats
+        supprimés et les nouveaux insérés, dans une transaction par lot.
+
+        Args:
+            user_ids: Utilisateurs à recalculer (tous si None)
+            batch_size: Nombre d'utilisateurs par lot
+
+        Returns:
+            dict: Nombre d'utilisateurs et de lignes d'agrégats écrites
+        """
+        result = {'users': 0, 'daily_stats': 0, 'task_stats': 0}
+        last_id = 0
+        while True:
+            query = select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size)
+            if user_ids is not None:
+                query = query.where(User.id.in_(user_ids))
+            batch = db.session.execute(query).scalars().all()
+            if not batch:
+                return result
+
+            daily_rows = StatisticsService._session_frame(batch)
+            task_rows = StatisticsService._task_frame(batch)
+
+            db.session.execute(delete(DailyStat).where(DailyStat.user_id.in_(batch)))
+            db.session.execute(delete(TaskStat).where(TaskStat.user_id.in_(batch)))
+            if daily_rows:
+                db.session.execute(insert(DailyStat), daily_rows)
+            if task_rows:
+                db.session.execute(insert(TaskStat), task_rows)
+            db.session.commit()
+
+            result['users'] += len(batch)
+            result['daily_stats'] += len(daily_rows)
+            result['task_stats'] += len(task_rows)
+            last_id = batch[-1]
+
+    @staticmethod
+    def get_dashboard(user_id, date_debut=None, date_fin=None, today=None):
+        """
+        Statistiques du tableau de bord, lues uniquement dans les agrégats
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            date_debut: Premier jour (par défaut il y a 30 jours)
+            date_fin: Dernier jour (par défaut aujourd'hui)
+            today: Jour de référence pour les retards (par défaut aujourd'hui)
+
+        Returns:
+            dict: Temps d'étude par matière, taux de complétion, série
+                quotidienne et tâches en retard par priorité
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        today = today or date.today()
+        date_fin = date_fin or today
+        date_debut = date_debut or date_fin - timedelta(days=DEFAULT_PERIOD_DAYS - 1)
+
+        period = (
+            DailyStat.user_id == user_id,
+            DailyStat.jour.between(date_debut, date_fin)
+        )
+        sums = [func.sum(getattr(DailyStat, name)).label(name) for name in SESSION_COUNTERS]
+
+        by_subject = db.session.execute(
+            select(DailyStat.subject_id, Subject.titre, Subject.couleur, *sums)
+            .outerjoin(Subject, Subject.id == DailyStat.subject_id)
+            .where(*period)
+            .group_by(DailyStat.subject_id, Subject.titre, Subject.couleur)
+            .order_by(func.sum(DailyStat.minutes_etudiees).desc())
+        ).all()
+
+        by_day = db.session.execute(
+            select(DailyStat.jour, *sums).where(*period).group_by(DailyStat.jour).order_by(DailyStat.jour)
+        ).all()
+
+        overdue = db.session.execute(
+            select(TaskStat.priorite, func.sum(TaskStat.taches_ouvertes))
+            .where(TaskStat.user_id == user_id, TaskStat.jour < today)
+            .group_by(TaskStat.priorite)
+            .having(func.sum(TaskStat.taches_ouvertes) > 0)
+        ).all()
+
+        planifiees = sum(row.sessions_planifiees for row in by_day)
+        completees = sum(row.sessions_completees for row in by_day)
+
+        return {
+            'periode': {'date_debut': date_debut.isoformat(), 'date_fin': date_fin.isoformat()},
+            'sessions': {
+                'planifiees': planifiees,
+                'completees': completees,
+                'taux_completion': round(completees / planifiees, 3) if planifiees else None,
+                'minutes_planifiees': sum(row.minutes_planifiees for row in by_day),
+                'minutes_etudiees': sum(row.minutes_etudiees for row in by_day)
+            },
+            'matieres': [
+                {
+                    'subject_id': row.subject_id or None,
+                    'titre': row.titre,
+                    'couleur': row.couleur,
+                    'minutes_etudiees': row.minutes_etudiees,
+                    'minutes_planifiees': row.minutes_planifiees,
+                    'sessions_completees': row.sessions_completees,
+                    'sessions_planifiees': row.sessions_planifiees
+                }
+                for row in by_subject
+            ],
+            'jours': [
+                {
+                    'jour': row.jour.isoformat(),
+                    'minutes_etudiees': row.minutes_etudiees,
+                    'sessions_completees': row.sessions_completees,
+                    'sessions_planifiees': row.sessions_planifiees
+                }
+                for row in by_day
+            ],
+            'taches_en_retard': {str(priorite): count for priorite, count in overdue}
+        }
@@ -0,0 +1,34 @@
+"""
+Service des matières
+Gère la consultation paginée des matières
+"""
+from app.models.subject import Subject
+from app.utils.pagination import paginate, DEFAULT_LIMIT
+from app.utils.serializers import dump_many
+
+
+class SubjectService:
+    """Service pour consulter les matières"""
+
+    @staticmethod
+    def list_subjects(user_id, limit=DEFAULT_LIMIT, cursor=None):
+        """
+        Lister les matières d'un utilisateur par titre, page par page
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            limit: Taille de la page
+            cursor: Curseur renvoyé par la page précédente
+
+        Returns:
+            dict: {'subjects': [...], 'next_cursor': str ou None}
+
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        query = Subject.query.filter(Subject.user_id == user_id)
+        subjects, next_cursor = paginate(query, [Subject.titre, Subject.id], limit, cursor)
+        return {'subjects': dump_many(subjects), 'next_cursor': next_cursor}
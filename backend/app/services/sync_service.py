@@ -0,0 +1,174 @@
+"""
+Service de synchronisation incrémentale
+Renvoie aux clients hors ligne les lignes modifiées ou supprimées depuis leur dernier passage
+
+Chaque entité a son curseur : (updated_at, id) de la dernière ligne lue,
+opaque pour le client (voir app.utils.pagination). Les suppressions sont
+lues dans la table deletions (traces écrites par record_deletions dans la
+transaction de la suppression), avec le curseur 'deleted'.
+
+updated_at est posé par l'application au moment de l'écriture, mais la ligne
+n'est visible qu'au commit : une transaction lente peut rendre visible une
+ligne plus ancienne que le curseur d'un client. Le curseur renvoyé en fin de
+lecture recule donc de SYNC_LAG_SECONDS : les lignes des dernières secondes
+sont renvoyées une seconde fois (le client les remplace), aucune n'est
+perdue. Pour la même raison, les lectures restent sur la base principale
+(une réplique en retard ferait avancer les curseurs au-delà de lignes
+qu'elle n'a pas encore reçues).
+"""
+from app import db
+from app.models.deletion import Deletion
+from app.models.notification import Notification
+from app.models.planning import Planning
+from app.models.schedule import Course, Schedule
+from app.models.session import Session
+from app.models.subject import Subject
+from app.models.task import Task
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.serializers import dump_many
+from flask import current_app
+from sqlalchemy import delete, insert, tuple_
+from datetime import datetime, timedelta
+
+# Entités synchronisées : nom (table) -> (modèle, relations omises des lignes)
+SYNC_ENTITIES = {
+    'subjects': (Subject, ()),
+    'tasks': (Task, ('subject',)),
+    'schedules': (Schedule, ('courses',)),
+    'courses': (Course, ()),
+    'plannings': (Planning, ('sessions',)),
+    'sessions': (Session, ('task',)),
+    'notifications': (Notification, ()),
+}
+
+# Curseur des suppressions
+DELETED = 'deleted'
+
+
+class SyncService:
+    """Service pour la synchronisation incrémentale des données d'un utilisateur"""
+
+    @staticmethod
+    def record_deletions(user_id, entity, ids, now=None):
+        """
+        Tracer des suppressions (dans la transaction de l'appelant)
+
+        Args:
+            user_id: Propriétaire des lignes supprimées
+            entity: Nom de l'entité (clé de SYNC_ENTITIES)
+            ids: IDs des lignes supprimées
+        """
+        ids = list(ids)
+        if not ids:
+            return
+        deleted_at = now or datetime.utcnow()
+        db.session.execute(insert(Deletion), [
+            {'user_id': int(user_id), 'entity': entity, 'entity_id': entity_id, 'deleted_at': deleted_at}
+            for entity_id in ids
+        ])
+
+    @staticmethod
+    def prune_deletions(now=None):
+        """
+        Supprimer les traces plus anciennes que SYNC_TOMBSTONE_DAYS
+
+        Returns:
+            int: Nombre de traces supprimées
+        """
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=current_app.config['SYNC_TOMBSTONE_DAYS'])
+        result = db.session.execute(delete(Deletion).where(Deletion.deleted_at < cutoff))
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _owned(model, user_id):
+        """Requête des lignes d'une entité appartenant à l'utilisateur"""
+        if model is Course:
+            return Course.query.join(Schedule, Schedule.id == Course.schedule_id).filter(Schedule.user_id == user_id)
+        if model is Session:
+            return Session.query.join(Planning, Planning.id == Session.planning_id).filter(Planning.user_id == user_id)
+        return model.query.filter(model.user_id == user_id)
+
+    @staticmethod
+    def _read(query, columns, since, limit, horizon):
+        """
+        Lire une page de lignes après `since`, triées par `columns`
+
+        Returns:
+            tuple: (lignes, curseur suivant, reste-t-il des lignes)
+        """
+        if since is not None:
+            query = query.filter(tuple_(*columns) > tuple(since))
+        rows = query.order_by(*columns).limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            return rows, encode_cursor([getattr(last, column.key) for column in columns]), True
+        return rows, encode_cursor([horizon, 0]), False
+
+    @staticmethod
+    def sync(user_id, cursors=None, now=None):
+        """
+        Lignes modifiées et supprimées depuis les curseurs du client
+
+        Sans curseur, une entité est lue depuis le début (premier passage,
+        page par page). Si le curseur des suppressions est plus ancien que
+        la rétention des traces (ou absent alors que d'autres curseurs sont
+        fournis), le client a pu manquer des suppressions : 'reset' vaut
+        true et tout est relu depuis le début.
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            cursors: {entité ou 'deleted': curseur renvoyé par l'appel précédent}
+            now: Instant de la lecture
+
+        Returns:
+            dict: {'reset': bool, 'has_more': bool, 'cursors': {...},
+                'changes': {entité: {'changed': [...], 'deleted': [ids]}}}
+                (seules les entités modifiées figurent dans 'changes')
+
+        Raises:
+            ValueError: Si une entité ou un curseur est inconnu
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        now = now or datetime.utcnow()
+        config = current_app.config
+        cursors = {name: cursor for name, cursor in (cursors or {}).items() if cursor}
+        unknown = set(cursors) - set(SYNC_ENTITIES) - {DELETED}
+        if unknown:
+            raise ValueError(f"Entités inconnues : {', '.join(sorted(unknown))}")
+
+        since = {
+            name: decode_cursor(cursor, [Deletion.deleted_at, Deletion.id] if name == DELETED
+                                else [SYNC_ENTITIES[name][0].updated_at, SYNC_ENTITIES[name][0].id])
+            for name, cursor in cursors.items()
+        }
+        cutoff = now - timedelta(days=config['SYNC_TOMBSTONE_DAYS'])
+        reset = bool(since) and (DELETED not in since or since[DELETED][0] < cutoff)
+        if reset:
+            since = {}
+
+        horizon = now - timedelta(seconds=config['SYNC_LAG_SECONDS'])
+        limit = config['SYNC_PAGE_SIZE']
+        changes, next_cursors, has_more = {}, {}, False
+
+        for name, (model, relations) in SYNC_ENTITIES.items():
+            rows, next_cursors[name], more = SyncService._read(
+                SyncService._owned(model, user_id), [model.updated_at, model.id],
+                since.get(name), limit, horizon
+            )
+            has_more |= more
+            if rows:
+                changes[name] = {'changed': dump_many(rows, exclude=relations), 'deleted': []}
+
+        deletions, next_cursors[DELETED], more = SyncService._read(
+            Deletion.query.filter(Deletion.user_id == user_id), [Deletion.deleted_at, Deletion.id],
+            since.get(DELETED), limit, horizon
+        )
+        has_more |= more
+        for deletion in deletions:
+            changes.setdefault(deletion.entity, {'changed': [], 'deleted': []})['deleted'].append(deletion.entity_id)
+
+        return {'reset': reset, 'has_more': has_more, 'cursors': next_cursors, 'changes': changes}
@@ -0,0 +1,329 @@
+"""
+Service des tâches
+Gère la consultation paginée des tâches et examens et leur écriture groupée
+"""
+from app import db
+from app.models.planning import Planning
+from app.models.session import Session
+from app.models.subject import Subject
+from app.models.task import Task
+from app.ml.planner import ETAT_TERMINEE
+from app.services.calendar_service import CalendarService
+from app.services.statistics_service import StatisticsService
+from app.services.sync_service import SyncService
+from app.utils.pagination import paginate, DEFAULT_LIMIT
+from app.utils.serializers import dump_many
+from flask import current_app
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.orm import joinedload
+from datetime import datetime
+
+# États possibles d'une tâche
+ETATS = ('à faire', 'en cours', ETAT_TERMINEE)
+
+# Champs modifiables d'une tâche
+TASK_FIELDS = ('titre', 'description', 'date_limite', 'priorite', 'etat', 'subject_id')
+
+TITRE_MAX_LENGTH = 200
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _task_values(item, current=None):
+    """
+    Valider les champs d'une tâche à créer (current=None) ou à modifier
+
+    Args:
+        item: Dictionnaire reçu du client
+        current: Valeurs actuelles de la tâche (modification)
+
+    Returns:
+        dict: Toutes les valeurs de TASK_FIELDS après modification
+
+    Raises:
+        ValueError: Si un champ est absent ou invalide
+    """
+    if not isinstance(item, dict):
+        raise ValueError("Chaque élément doit être un objet")
+    unknown = set(item) - set(TASK_FIELDS) - {'id'}
+    if unknown:
+        raise ValueError(f"Champs inconnus : {', '.join(sorted(unknown))}")
+
+    values = dict(current) if current else {
+        'titre': None, 'description': None, 'date_limite': None,
+        'priorite': 1, 'etat': ETATS[0], 'subject_id': None
+    }
+    values.update((field, item[field]) for field in TASK_FIELDS if field in item)
+
+    titre = values['titre']
+    if not isinstance(titre, str) or not titre.strip():
+        raise ValueError("Le titre est requis")
+    if len(titre) > TITRE_MAX_LENGTH:
+        raise ValueError(f"Le titre dépasse {TITRE_MAX_LENGTH} caractères")
+    if values['description'] is not None and not isinstance(values['description'], str):
+        raise ValueError("La description doit être un texte")
+
+    date_limite = values['date_limite']
+    if not isinstance(date_limite, datetime):
+        try:
+            values['date_limite'] = datetime.fromisoformat(date_limite)
+        except (TypeError, ValueError):
+            raise ValueError("Le champ date_limite doit être une date ISO 8601 (AAAA-MM-JJTHH:MM)")
+    if values['date_limite'].tzinfo is not None:
+        raise ValueError("Le champ date_limite doit être une heure locale, sans fuseau")
+
+    priorite = values['priorite']
+    if isinstance(priorite, bool) or not isinstance(priorite, int) or not 1 <= priorite <= 5:
+        raise ValueError("La priorité doit être un entier de 1 à 5")
+    if values['etat'] not in ETATS:
+        raise ValueError(f"État invalide (valeurs possibles : {', '.join(ETATS)})")
+    subject_id = values['subject_id']
+    if subject_id is not None and not _is_id(subject_id):
+        raise ValueError("Le champ subject_id doit être un entier")
+    return values
+
+
+def _fact(user_id, values):
+    """Valeurs d'une tâche au format des statistiques (voir task_fact)"""
+    return user_id, values['date_limite'].date(), values['priorite'] or 1, values['etat'] == ETAT_TERMINEE
+
+
+class TaskService:
+    """Service pour consulter et écrire les tâches"""
+
+    @staticmethod
+    def list_tasks(user_id, etat=None, subject_id=None, limit=DEFAULT_LIMIT, cursor=None):
+        """
+        Lister les tâches d'un utilisateur par échéance, page par page
+
+        La pagination se fait par curseur sur (date_limite, id) ; chaque
+        combinaison de filtres a son index composite (voir Task.__table_args__).
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            etat: Ne renvoyer que les tâches dans cet état
+            subject_id: Ne renvoyer que les tâches de cette matière
+            limit: Taille de la page
+            cursor: Curseur renvoyé par la page précédente
+
+        Returns:
+            dict: {'tasks': [...], 'next_cursor': str ou None}
+
+        Raises:
+            ValueError: Si un filtre ou le curseur est invalide
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        if etat is not None and etat not in ETATS:
+            raise ValueError(f"État invalide (valeurs possibles : {', '.join(ETATS)})")
+
+        query = Task.query.options(joinedload(Task.subject)).filter(Task.user_id == user_id)
+        if etat is not None:
+            query = query.filter(Task.etat == etat)
+        if subject_id is not None:
+            query = query.filter(Task.subject_id == subject_id)
+
+        tasks, next_cursor = paginate(query, [Task.date_limite, Task.id], limit, cursor)
+        return {'tasks': dump_many(tasks), 'next_cursor': next_cursor}
+
+    @staticmethod
+    def bulk_write(user_id, create=(), update_items=(), delete_ids=(), now=None):
+        """
+        Créer, modifier et supprimer des tâches en une seule transaction
+
+        Chaque élément est validé séparément : un élément invalide est
+        signalé dans 'errors' sans empêcher l'écriture des autres. Les
+        écritures valides sont groupées (INSERT ... RETURNING, UPDATE par
+        clé primaire et DELETE en executemany) puis validées par un seul
+        commit.
+
+        Sessions des tâches touchées :
+        - tâche passée à l'état terminée : ses sessions à venir non terminées
+          des plannings actifs sont supprimées (comme replan_task) ;
+        - tâche supprimée : ses sessions non terminées sont supprimées, les
+          sessions terminées restent dans l'historique, sans tâche.
+
+        Une nouvelle échéance ne déplace pas les sessions existantes : la
+        replanification reste explicite (POST /api/planning/tasks/<id>/replan).
+
+        Args:
+            user_id: ID de l'utilisateur (string ou int)
+            create: Tâches à créer (titre, date_limite requis)
+            update_items: Modifications ({"id": ..., champs à changer})
+            delete_ids: IDs des tâches à supprimer
+            now: Instant de référence pour les sessions à venir
+
+        Returns:
+            dict: {'created': [...], 'updated': [...], 'unchanged': [ids],
+                'deleted': [ids], 'errors': [{'operation', 'index', 'error'}]}
+
+        Raises:
+            ValueError: Si la requête dépasse BULK_MAX_ITEMS éléments
+        """
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        now = now or datetime.utcnow()
+        create, update_items, delete_ids = list(create), list(update_items), list(delete_ids)
+        max_items = current_app.config['BULK_MAX_ITEMS']
+        if len(create) + len(update_items) + len(delete_ids) > max_items:
+            raise ValueError(f"{max_items} éléments au plus par requête")
+
+        errors = []
+
+        def fail(operation, index, message):
+            errors.append({'operation': operation, 'index': index, 'error': message})
+
+        # Tâches existantes et matières référencées : une requête chacune
+        update_ids = [item.get('id') for item in update_items if isinstance(item, dict)]
+        existing_ids = [task_id for task_id in update_ids + delete_ids if _is_id(task_id)]
+        existing = {
+            row.id: row for row in db.session.execute(
+                select(Task.id, *(getattr(Task, field) for field in TASK_FIELDS))
+                .where(Task.user_id == user_id, Task.id.in_(existing_ids))
+            )
+        } if existing_ids else {}
+        subject_ids = {
+            item['subject_id'] for item in create + update_items
+            if isinstance(item, dict) and _is_id(item.get('subject_id'))
+        }
+        own_subjects = set(db.session.execute(
+            select(Subject.id).where(Subject.user_id == user_id, Subject.id.in_(subject_ids))
+        ).scalars()) if subject_ids else set()
+
+        def validate(item, current=None):
+            values = _task_values(item, current)
+            if values['subject_id'] is not None and values['subject_id'] not in own_subjects:
+                raise ValueError("Matière non trouvée")
+            return values
+
+        inserts = []
+        for index, item in enumerate(create):
+            try:
+                if isinstance(item, dict) and 'id' in item:
+                    raise ValueError("Le champ id n'est pas accepté à la création")
+                inserts.append(validate(item))
+            except ValueError as e:
+                fail('create', index, str(e))
+
+        seen = set()
+        updates, unchanged, added, removed = [], [], [], []
+        for index, item in enumerate(update_items):
+            try:
+                task_id = item.get('id') if isinstance(item, dict) else None
+                if not _is_id(task_id) or task_id not in existing:
+                    raise ValueError("Tâche non trouvée")
+                if task_id in seen:
+                    raise ValueError("Tâche présente plusieurs fois dans la requête")
+                seen.add(task_id)
+                current = existing[task_id]._asdict()
+                del current['id']
+                values = validate(item, current)
+            except ValueError as e:
+                fail('update', index, str(e))
+                continue
+            if values == current:
+                unchanged.append(task_id)
+                continue
+            updates.append({'id': task_id, **values, 'updated_at': now})
+            removed.append(_fact(user_id, current))
+            added.append(_fact(user_id, values))
+
+        deletes = []
+        for index, task_id in enumerate(delete_ids):
+            if not _is_id(task_id) or task_id not in existing:
+                fail('delete', index, "Tâche non trouvée")
+            elif task_id in seen:
+                fail('delete', index, "Tâche présente plusieurs fois dans la requête")
+            else:
+                seen.add(task_id)
+                deletes.append(task_id)
+                removed.append(_fact(user_id, existing[task_id]._asdict()))
+
+        # Tâches dont les sessions comptées changent (matière, état terminée, suppression)
+        previous = {row['id']: existing[row['id']] for row in updates}
+        resubjected = [row['id'] for row in updates if row['subject_id'] != previous[row['id']].subject_id]
+        finished = [
+            row['id'] for row in updates
+            if row['etat'] == ETAT_TERMINEE and previous[row['id']].etat != ETAT_TERMINEE
+        ]
+        touched = resubjected + finished + deletes
+        before = StatisticsService.counted_sessions(Session.task_id.in_(touched)) if touched else []
+
+        created_ids = []
+        try:
+            if inserts:
+                created_ids = db.session.execute(
+                    insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                    [{'user_id': user_id, **values, 'created_at': now, 'updated_at': now} for values in inserts]
+                ).scalars().all()
+                added += [_fact(user_id, values) for values in inserts]
+            if updates:
+                db.session.execute(update(Task), updates)
+
+            detached = []
+            if finished:
+                upcoming = or_(
+                    Session.date > now.date(),
+                    and_(Session.date == now.date(), Session.heure_debut >= now.time())
+                )
+                active = select(Planning.id).where(Planning.user_id == user_id, Planning.actif.is_(True))
+                dropped = db.session.execute(
+                    delete(Session)
+                    .where(Session.task_id.in_(finished), Session.completee.isnot(True),
+                           Session.planning_id.in_(active), upcoming)
+                    .returning(Session.id)
+                    .execution_options(synchronize_session=False)
+                ).scalars().all()
+                SyncService.record_deletions(user_id, 'sessions', dropped, now)
+            if deletes:
+                detached = db.session.execute(
+                    select(Session.id).where(Session.task_id.in_(deletes), Session.completee.is_(True))
+                ).scalars().all()
+                dropped = db.session.execute(
+                    delete(Session)
+                    .where(Session.task_id.in_(deletes), Session.completee.isnot(True))
+                    .returning(Session.id)
+                    .execution_options(synchronize_session=False)
+                ).scalars().all()
+                SyncService.record_deletions(user_id, 'sessions', dropped, now)
+                db.session.execute(
+                    update(Session).where(Session.id.in_(detached)).values(task_id=None)
+                    .execution_options(synchronize_session=False)
+                )
+                db.session.execute(
+                    delete(Task).where(Task.id.in_(deletes)).execution_options(synchronize_session=False)
+                )
+                SyncService.record_deletions(user_id, 'tasks', deletes, now)
+
+            if touched:
+                kept = [task_id for task_id in touched if task_id not in deletes]
+                after = StatisticsService.counted_sessions(
+                    or_(Session.task_id.in_(kept), Session.id.in_(detached))
+                )
+                StatisticsService.record_sessions(added=after, removed=before)
+            StatisticsService.record_tasks(added=added, removed=removed)
+
+            planning_ids = db.session.execute(
+                select(Planning.id).where(Planning.user_id == user_id, Planning.actif.is_(True))
+            ).scalars().all() if updates or deletes else []
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        if updates or deletes:
+            CalendarService.invalidate(user_id, planning_ids=planning_ids)
+
+        written = Task.query.options(joinedload(Task.subject)).populate_existing().filter(
+            Task.id.in_(created_ids + [row['id'] for row in updates])
+        ).all() if created_ids or updates else []
+        by_id = {task.id: task for task in written}
+        return {
+            'created': dump_many([by_id[task_id] for task_id in created_ids]),
+            'updated': dump_many([by_id[row['id']] for row in updates]),
+            'unchanged': unchanged,
+            'deleted': deletes,
+            'errors': errors
+        }
@@ -0,0 +1,88 @@
+"""
+File de tâches asynchrones (Celery)
+
+Les traitements longs (analyse des PDF, génération de planning) sont exécutés
+par un worker Celery au lieu du thread de la requête Flask. Sans
+CELERY_BROKER_URL, les tâches s'exécutent immédiatement dans le processus
+courant (mode eager) et leurs résultats restent consultables en mémoire :
+aucun Redis n'est nécessaire en développement ni pendant les tests.
+"""
+from datetime import timedelta
+from celery import Celery, Task
+from celery.schedules import crontab
+
+
+class FlaskTask(Task):
+    """Tâche Celery exécutée dans le contexte de l'application Flask"""
+
+    def __call__(self, *args, **kwargs):
+        with self.app.flask_app.app_context():
+            return self.run(*args, **kwargs)
+
+
+celery = Celery('study_assistant', task_cls=FlaskTask)
+
+
+def init_celery(app):
+    """
+    Configurer Celery à partir de la configuration Flask
+
+    Args:
+        app: Application Flask
+
+    Returns:
+        Celery: L'application Celery configurée
+    """
+    broker_url = app.config.get('CELERY_BROKER_URL')
+    eager = app.config.get('CELERY_TASK_ALWAYS_EAGER') or not broker_url
+
+    if eager:
+        celery.conf.update(
+            broker_url='memory://',
+            result_backend='cache+memory://',
+            task_always_eager=True,
+            task_store_eager_result=True,
+        )
+    else:
+        celery.conf.update(
+            broker_url=broker_url,
+            result_backend=app.config.get('CELERY_RESULT_BACKEND') or broker_url,
+            task_always_eager=False,
+        )
+
+    celery.conf.update(
+        task_serializer='json',
+        result_serializer='json',
+        accept_content=['json'],
+        result_expires=3600,
+        task_track_started=True,
+        task_acks_late=True,
+        worker_prefetch_multiplier=1,
+        beat_schedule={
+            # Le balayage couvre une heure : le lancer au moins toutes les heures
+            'generate-reminders': {
+                'task': 'notifications.generate_reminders',
+                'schedule': timedelta(minutes=15),
+            },
+            # Recalcul complet des statistiques (corrige toute dérive des mises à jour incrémentales)
+            'rebuild-statistics': {
+                'task': 'statistics.rebuild',
+                'schedule': crontab(hour=3, minute=0),
+            },
+            'train-workload-model': {
+                'task': 'ml.train_workload',
+                'schedule': crontab(hour=4, minute=0),
+            },
+            'prune-sync-deletions': {
+                'task': 'sync.prune_deletions',
+                'schedule': crontab(hour=4, minute=30),
+            },
+        },
+    )
+    celery.flask_app = app
+    app.extensions['celery'] = celery
+
+    # Enregistrer les tâches
+    from app.tasks import jobs  # noqa: F401
+
+    return celery
@@ -0,0 +1,56 @@
+"""
+Tâches asynchrones : analyse des emplois du temps et génération des plannings
+
+Chaque tâche renvoie un dictionnaire JSON contenant `user_id`, utilisé par
+l'API des jobs pour vérifier que le résultat appartient bien au demandeur.
+"""
+from app.tasks import celery
+from app.services.schedule_service import ScheduleService
+from app.services.planning_service import PlanningService
+from app.services.notification_service import NotificationService
+from app.services.statistics_service import StatisticsService
+from app.services.sync_service import SyncService
+from app.ml import workload
+
+
+@celery.task(name='schedules.import_courses')
+def import_schedule_courses(schedule_id, digest):
+    """Extraire les cours d'un emploi du temps PDF déjà enregistré"""
+    return ScheduleService.import_courses(schedule_id, digest)
+
+
+@celery.task(name='planning.generate')
+def generate_planning(user_id, date_debut, date_fin, titre=None):
+    """Générer un planning d'étude complet"""
+    result = PlanningService.generate_planning(user_id, date_debut, date_fin, titre)
+    planning = result['planning']
+    return {
+        'user_id': int(user_id),
+        'planning_id': planning['id'],
+        'sessions': len(planning['sessions']),
+        'unscheduled_task_ids': result['unscheduled_task_ids']
+    }
+
+
+@celery.task(name='notifications.generate_reminders')
+def generate_reminders():
+    """Balayage périodique des rappels (planifié par Celery beat)"""
+    return {'created': NotificationService.generate_reminders()}
+
+
+@celery.task(name='statistics.rebuild')
+def rebuild_statistics(user_ids=None):
+    """Recalculer les agrégats de statistiques (planifié chaque nuit par Celery beat)"""
+    return StatisticsService.rebuild(user_ids)
+
+
+@celery.task(name='ml.train_workload')
+def train_workload_model():
+    """Réentraîner le modèle de charge de travail (planifié chaque nuit par Celery beat)"""
+    return workload.train()
+
+
+@celery.task(name='sync.prune_deletions')
+def prune_deletions():
+    """Purger les traces de suppression expirées (planifié chaque nuit par Celery beat)"""
+    return {'deleted': SyncService.prune_deletions()}
@@ -0,0 +1,118 @@
+"""
+Insertion en masse de lignes avec IDs explicites
+
+Les lignes (tuples dans l'ordre des colonnes) sont écrites par le chemin le
+plus rapide de chaque base, dans la transaction de la connexion fournie :
+
+- PostgreSQL : COPY ... FROM STDIN au format texte ;
+- SQLite : executemany directement sur le curseur DBAPI, valeurs converties
+  colonne par colonne (mêmes formats de stockage que les types SQLite de
+  SQLAlchemy) ;
+- autres bases : INSERT groupé SQLAlchemy (executemany).
+
+Utilisé par l'import des données d'un utilisateur et par le générateur de
+données synthétiques (scripts/generate_data.py).
+"""
+import io
+from datetime import date
+from operator import methodcaller
+from sqlalchemy import Boolean, Date, DateTime, Time, func, insert, select, text
+
+# Échappement du format texte de COPY (\N représente NULL)
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+# Conversions SQLite en C
+_SQLITE_CONVERTERS = [
+    (DateTime, methodcaller('isoformat', ' ', 'microseconds')),
+    (Date, date.isoformat),
+    (Time, methodcaller('isoformat', 'microseconds')),
+    (Boolean, int),
+]
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    return str(value)
+
+
+def _copy(connection, table, columns, rows):
+    """Charger des lignes avec COPY (PostgreSQL)"""
+    buffer = io.StringIO()
+    buffer.writelines('\t'.join(map(_copy_value, row)) + '\n' for row in rows)
+    buffer.seek(0)
+    with connection.connection.driver_connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def _sqlite_converter(column):
+    for column_type, converter in _SQLITE_CONVERTERS:
+        if isinstance(column.type, column_type):
+            return converter
+    return None
+
+
+def _executemany(connection, table, columns, rows):
+    """Charger des lignes en executemany sur le curseur DBAPI (SQLite)"""
+    values = []
+    for column, column_values in zip(columns, zip(*rows)):
+        converter = _sqlite_converter(table.c[column])
+        if converter is None:
+            values.append(column_values)
+        elif None in column_values:
+            values.append([None if value is None else converter(value) for value in column_values])
+        else:
+            values.append(map(converter, column_values))
+
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.executemany(
+            f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            zip(*values)
+        )
+    finally:
+        cursor.close()
+
+
+def bulk_insert(connection, table, columns, rows):
+    """
+    Insérer des lignes dans une table sans passer par l'ORM
+
+    Args:
+        connection: Connexion SQLAlchemy (ex: db.session.connection())
+        table: Table SQLAlchemy
+        columns: Noms des colonnes, dans l'ordre des tuples
+        rows: Liste de tuples
+    """
+    if not rows:
+        return
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        _copy(connection, table, columns, rows)
+    elif dialect == 'sqlite':
+        _executemany(connection, table, columns, rows)
+    else:
+        connection.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+
+def reserve_ids(connection, table, count):
+    """
+    Réserver `count` nouveaux IDs pour une table
+
+    PostgreSQL : valeurs tirées de la séquence de la colonne id (sûr entre
+    transactions concurrentes). Ailleurs : IDs suivant le maximum actuel.
+
+    Returns:
+        list: IDs réservés
+    """
+    if count <= 0:
+        return []
+    if connection.dialect.name == 'postgresql':
+        return connection.execute(
+            text(f"SELECT nextval(pg_get_serial_sequence('{table.name}', 'id')) FROM generate_series(1, :count)"),
+            {'count': count}
+        ).scalars().all()
+    first = connection.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar() + 1
+    return list(range(first, first + count))
@@ -0,0 +1,213 @@
+"""
+Cache clé/valeur partagé : Redis si REDIS_URL est configuré, sinon LRU en mémoire
+
+Les valeurs sont des objets JSON. Le cache en mémoire est propre à chaque
+processus : il suffit en développement et en test, Redis est nécessaire pour
+partager les invalidations entre plusieurs workers.
+
+Si Redis ne répond pas (au démarrage ou plus tard), RedisCache bascule sur
+un cache en mémoire pendant FALLBACK_SECONDS puis réessaie : les requêtes
+continuent, sans partage entre processus pendant ce temps (`shared` vaut
+False). Les entrées Redis que le repli n'a pas pu invalider expirent avec
+leur durée de vie.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+# Durée (secondes) pendant laquelle le cache en mémoire remplace Redis après une erreur
+FALLBACK_SECONDS = 30
+
+
+class LocalCache:
+    """Cache LRU en mémoire avec expiration, sûr entre threads"""
+
+    # Écritures invisibles des autres processus
+    shared = False
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return item
+
+    def _set(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            item = self._get(key)
+            return item[0] if item else None
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._set(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        """Écrire seulement si la clé est absente ; renvoie True si écrite"""
+        with self._lock:
+            if self._get(key):
+                return False
+            self._set(key, value, ttl)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def incr_if_exists(self, key, delta=1):
+        """Incrémenter un compteur déjà présent ; renvoie None s'il est absent"""
+        with self._lock:
+            item = self._get(key)
+            if not item:
+                return None
+            value = item[0] + delta
+            self._data[key] = (value, item[1])
+            return value
+
+
+class RedisCache:
+    """Cache Redis (valeurs encodées en JSON), avec repli en mémoire si Redis ne répond pas"""
+
+    # INCRBY uniquement si la clé existe, en conservant son expiration
+    _INCR_IF_EXISTS = (
+        "if redis.call('exists', KEYS[1]) == 1 then "
+        "return redis.call('incrby', KEYS[1], ARGV[1]) end "
+        "return nil"
+    )
+
+    def __init__(self, client, prefix='sa:', fallback=None, logger=None):
+        from redis import RedisError
+
+        self.client = client
+        self.prefix = prefix
+        self.fallback = fallback if fallback is not None else LocalCache()
+        self._errors = RedisError
+        self._logger = logger
+        self._fallback_until = 0.0
+        self._incr_if_exists = client.register_script(self._INCR_IF_EXISTS)
+
+    @property
+    def shared(self):
+        """Redis est-il utilisé (et non le repli en mémoire) ?"""
+        return time.monotonic() >= self._fallback_until
+
+    def fail(self, error):
+        """Passer sur le cache en mémoire pendant FALLBACK_SECONDS"""
+        self._fallback_until = time.monotonic() + FALLBACK_SECONDS
+        if self._logger is not None:
+            self._logger.warning("Redis indisponible (%s), cache en mémoire pendant %d s", error, FALLBACK_SECONDS)
+
+    def get(self, key):
+        if self.shared:
+            try:
+                raw = self.client.get(self.prefix + key)
+                return json.loads(raw) if raw is not None else None
+            except self._errors as e:
+                self.fail(e)
+        return self.fallback.get(key)
+
+    def set(self, key, value, ttl=None):
+        if self.shared:
+            try:
+                self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+                return
+            except self._errors as e:
+                self.fail(e)
+        self.fallback.set(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        if self.shared:
+            try:
+                return bool(self.client.set(self.prefix + key, json.dumps(value), ex=ttl, nx=True))
+            except self._errors as e:
+                self.fail(e)
+        return self.fallback.add(key, value, ttl)
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        if self.shared:
+            try:
+                self.client.delete(*(self.prefix + key for key in keys))
+                return
+            except self._errors as e:
+                self.fail(e)
+        self.fallback.delete(*keys)
+
+    def incr_if_exists(self, key, delta=1):
+        if self.shared:
+            try:
+                return self._incr_if_exists(keys=[self.prefix + key], args=[delta])
+            except self._errors as e:
+                self.fail(e)
+        return self.fallback.incr_if_exists(key, delta)
+
+
+def init_cache(app):
+    """
+    Créer le cache de l'application
+
+    Redis est utilisé si REDIS_URL est défini, sinon un LRU en mémoire. Si
+    Redis est injoignable au démarrage, le cache commence en repli et la
+    connexion est retentée à la première opération après FALLBACK_SECONDS
+    (chaque worker gunicorn se reconnecte donc seul après le fork).
+
+    Tous les processus qui écrivent dans la même base (workers gunicorn,
+    workers Celery, beat) doivent partager le même cache, donc le même
+    REDIS_URL : les invalidations (notifications, flux .ics) et les clés
+    d'idempotence écrites par un processus ne sont vues des autres que par
+    le cache partagé. Avec le cache en mémoire, une écriture faite par un
+    worker Celery laisse les données périmées côté web jusqu'à l'expiration
+    des entrées. (Les profils utilisateur ont leur propre cache par
+    processus, borné par USER_CACHE_TTL.)
+
+    Args:
+        app: Application Flask
+
+    Returns:
+        LocalCache | RedisCache: Le cache installé dans app.extensions['cache']
+    """
+    cache = None
+    local = LocalCache(app.config.get('CACHE_MAX_ENTRIES', 10000))
+    redis_url = app.config.get('REDIS_URL')
+    if redis_url:
+        try:
+            import redis
+        except ImportError:
+            app.logger.warning("Paquet redis absent, cache en mémoire utilisé")
+        else:
+            client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            cache = RedisCache(client, fallback=local, logger=app.logger)
+            try:
+                client.ping()
+            except redis.RedisError as e:
+                cache.fail(e)
+
+    if cache is None:
+        cache = local
+
+    app.extensions['cache'] = cache
+    return cache
+
+
+def get_cache():
+    """Cache de l'application courante"""
+    return current_app.extensions['cache']
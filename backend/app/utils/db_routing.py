@@ -0,0 +1,82 @@
+"""
+Routage des lectures vers la réplique
+
+Les routes en lecture seule sont décorées avec @read_replica : pendant leur
+exécution, les requêtes de la session partent vers le bind 'replica' s'il est
+configuré (DATABASE_REPLICA_URL). Les flush (INSERT/UPDATE/DELETE via l'ORM)
+restent toujours sur la base principale, et sans réplique tout passe par la
+base principale.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from flask_sqlalchemy.session import Session
+from app.config import REPLICA_BIND
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+class RoutingSession(Session):
+    """Session Flask-SQLAlchemy qui envoie les lectures vers la réplique si demandé"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _use_replica.get() and not self._flushing:
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_replica(view):
+    """
+    Exécuter une vue en lecture seule sur la réplique
+
+    À placer au-dessus de @jwt_required() pour que le chargement de
+    l'utilisateur courant passe aussi par la réplique (sauf la lecture qui
+    remplit le cache des profils, voir primary()). La vue ne doit rien
+    écrire : une réplique peut avoir quelques instants de retard sur la base
+    principale.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = _use_replica.set(True)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+@contextmanager
+def primary():
+    """
+    Lire sur la base principale, même dans une vue @read_replica
+
+    Pour les lectures qui alimentent un cache partagé entre requêtes : une
+    réplique en retard y remettrait une version antérieure à la dernière
+    invalidation.
+    """
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def replica_stream(chunks):
+    """
+    Itérer une réponse en flux en lisant sur la réplique
+
+    Le corps d'une réponse en flux est produit après le retour de la vue, donc
+    hors de @read_replica : ce générateur rétablit le routage à chaque bloc.
+    """
+    chunks = iter(chunks)
+    while True:
+        token = _use_replica.set(True)
+        try:
+            chunk = next(chunks, None)
+        finally:
+            _use_replica.reset(token)
+        if chunk is None:
+            return
+        yield chunk
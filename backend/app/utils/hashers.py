@@ -0,0 +1,194 @@
+"""
+Hachage des mots de passe : PBKDF2, bcrypt ou scrypt, avec coût configurable
+
+L'algorithme et son coût sont choisis par déploiement (PASSWORD_HASHER,
+PASSWORD_HASH_COST). Les hachages existants restent vérifiables quel que soit
+leur algorithme et sont refaits au nouveau réglage lors de la connexion.
+
+Les calculs passent par un pool de threads borné (PASSWORD_HASH_WORKERS) :
+hashlib et bcrypt libèrent le GIL, donc les hachages s'exécutent en parallèle
+sans jamais occuper plus de cœurs que prévu lors d'un pic de connexions. Le
+pool est propre à chaque processus : la borne de la machine est
+PASSWORD_HASH_WORKERS × nombre de workers, d'où le défaut de gunicorn.conf.py
+(CPU ÷ workers).
+"""
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+import bcrypt
+
+from app.utils.metrics import metrics
+
+
+class PBKDF2Hasher:
+    """PBKDF2-HMAC-SHA256 au format werkzeug (pbkdf2:sha256:<itérations>$sel$hachage)"""
+
+    name = 'pbkdf2'
+    default_cost = 600000
+
+    # Format de l'ancien repli sans werkzeug : pbkdf2:sha256$<sel b64>$<hachage b64>
+    LEGACY_ITERATIONS = 100000
+
+    def __init__(self, cost=None):
+        self.cost = cost or self.default_cost
+
+    @staticmethod
+    def identify(encoded):
+        return encoded.startswith('pbkdf2:')
+
+    def hash(self, password):
+        return generate_password_hash(password, method=f'pbkdf2:sha256:{self.cost}')
+
+    def verify(self, encoded, password):
+        method = encoded.split('$', 1)[0]
+        if method == 'pbkdf2:sha256':
+            return self._verify_legacy(encoded, password)
+        return check_password_hash(encoded, password)
+
+    def _verify_legacy(self, encoded, password):
+        try:
+            _method, salt, hashb64 = encoded.split('$', 2)
+            dk = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), self.LEGACY_ITERATIONS)
+            return hmac.compare_digest(base64.b64encode(dk).decode(), hashb64)
+        except Exception:
+            return False
+
+    def cost_of(self, encoded):
+        parts = encoded.split('$', 1)[0].split(':')
+        return int(parts[2]) if len(parts) > 2 else self.LEGACY_ITERATIONS
+
+
+class ScryptHasher:
+    """scrypt au format werkzeug (scrypt:<n>:<r>:<p>$sel$hachage), coût = n"""
+
+    name = 'scrypt'
+    default_cost = 32768
+
+    def __init__(self, cost=None):
+        self.cost = cost or self.default_cost
+
+    @staticmethod
+    def identify(encoded):
+        return encoded.startswith('scrypt:')
+
+    def hash(self, password):
+        return generate_password_hash(password, method=f'scrypt:{self.cost}:8:1')
+
+    def verify(self, encoded, password):
+        return check_password_hash(encoded, password)
+
+    def cost_of(self, encoded):
+        return int(encoded.split('$', 1)[0].split(':')[1])
+
+
+class BcryptHasher:
+    """bcrypt ($2b$<rounds>$...), coût = nombre de tours (log2)"""
+
+    name = 'bcrypt'
+    default_cost = 12
+
+    def __init__(self, cost=None):
+        self.cost = cost or self.default_cost
+
+    @staticmethod
+    def identify(encoded):
+        return encoded.startswith(('$2a$', '$2b$', '$2y$'))
+
+    def hash(self, password):
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=self.cost)).decode('ascii')
+
+    def verify(self, encoded, password):
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), encoded.encode('ascii'))
+        except ValueError:
+            return False
+
+    def cost_of(self, encoded):
+        return int(encoded.split('$')[2])
+
+
+HASHERS = {
+    hasher.name: hasher
+    for hasher in (PBKDF2Hasher, BcryptHasher, ScryptHasher)
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _config(key, default=None):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def get_hasher(name=None, cost=None):
+    """
+    Hasher configuré pour les nouveaux mots de passe
+
+    Args:
+        name: 'pbkdf2', 'bcrypt' ou 'scrypt' (par défaut PASSWORD_HASHER, sinon
+            scrypt, l'algorithme par défaut de werkzeug utilisé jusqu'ici)
+        cost: Coût de l'algorithme (par défaut PASSWORD_HASH_COST)
+
+    Raises:
+        ValueError: Si l'algorithme est inconnu
+    """
+    name = name or _config('PASSWORD_HASHER') or 'scrypt'
+    if name not in HASHERS:
+        raise ValueError(f"Algorithme de hachage inconnu : {name}")
+    return HASHERS[name](cost or _config('PASSWORD_HASH_COST'))
+
+
+def identify_hasher(encoded):
+    """Hasher capable de vérifier un hachage existant (ou None)"""
+    for hasher in HASHERS.values():
+        if hasher.identify(encoded):
+            return hasher()
+    return None
+
+
+def _run(function, *args):
+    """Exécuter un calcul de hachage dans le pool borné"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = _config('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+    return _executor.submit(function, *args).result()
+
+
+def hash_password(password):
+    """Hacher un mot de passe avec l'algorithme configuré"""
+    hasher = get_hasher()
+    with metrics.timed('hash', hasher.name):
+        return _run(hasher.hash, password)
+
+
+def verify_password(encoded, password):
+    """Vérifier un mot de passe contre un hachage de n'importe quel algorithme connu"""
+    if not encoded or password is None:
+        return False
+    hasher = identify_hasher(encoded)
+    if hasher is None:
+        return False
+    with metrics.timed('verify', hasher.name):
+        return _run(hasher.verify, encoded, password)
+
+
+def needs_rehash(encoded):
+    """Le hachage utilise-t-il un autre algorithme ou un autre coût que la configuration ?"""
+    current = get_hasher()
+    if not current.identify(encoded):
+        return True
+    try:
+        return current.cost_of(encoded) != current.cost
+    except (IndexError, ValueError):
+        return True
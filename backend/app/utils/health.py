@@ -0,0 +1,184 @@
+"""
+État de santé du processus pour les sondes de l'orchestrateur
+
+Les vérifications (base de données et pool de connexions, Redis, profondeur
+de la file Celery) sont exécutées par un thread d'arrière-plan toutes les
+HEALTH_CHECK_INTERVAL secondes, et jamais par les sondes elles-mêmes : une
+sonde ne fait que lire le dernier résultat en mémoire. Quel que soit le
+nombre de sondes par seconde, la base ne reçoit donc qu'un « SELECT 1 » par
+intervalle et par processus.
+
+Le processus n'est pas prêt si :
+- une base ne répond pas, ou son pool n'a plus de connexion libre ;
+- Redis est configuré mais injoignable ;
+- la file Celery dépasse HEALTH_MAX_QUEUE_DEPTH messages en attente ;
+- le dernier résultat est trop ancien (thread de vérification bloqué).
+
+Le thread est démarré dans chaque worker gunicorn juste après le fork (hook
+post_fork de gunicorn.conf.py), et la première vérification est lancée
+aussitôt : le worker est prêt dès qu'elle a réussi, sans attendre une sonde.
+Hors gunicorn, il est démarré à la première sonde du processus.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from kombu.exceptions import ChannelError
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+
+def _check_database(db):
+    """Pool et connectivité de chaque base (principale et réplique)"""
+    results = {}
+    for bind, engine in db.engines.items():
+        name = bind or 'default'
+        pool = engine.pool
+        result = {}
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            result['pool'] = {'checked_out': pool.checkedout(), 'capacity': capacity}
+            if pool._max_overflow >= 0 and pool.checkedout() >= capacity:
+                result.update(ok=False, error="Pool de connexions saturé")
+                results[name] = result
+                continue
+        try:
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+            result['ok'] = True
+        except Exception as e:
+            result.update(ok=False, error=str(e))
+        results[name] = result
+    return results
+
+
+def _check_redis(app):
+    """Cache Redis (ignoré si REDIS_URL n'est pas configuré)"""
+    cache = app.extensions.get('cache')
+    client = getattr(cache, 'client', None)
+    if client is None:
+        return {'ok': True, 'enabled': False}
+    try:
+        client.ping()
+        return {'ok': True, 'enabled': True}
+    except Exception as e:
+        return {'ok': False, 'enabled': True, 'error': str(e)}
+
+
+def _check_queue(app, max_depth):
+    """Messages en attente dans la file Celery par défaut (ignoré en mode eager)"""
+    celery = app.extensions.get('celery')
+    if celery is None or celery.conf.task_always_eager:
+        return {'ok': True, 'enabled': False}
+    queue = celery.conf.task_default_queue
+    try:
+        with celery.connection_for_read() as connection:
+            connection.ensure_connection(max_retries=1)
+            try:
+                depth = connection.default_channel.queue_declare(queue=queue, passive=True).message_count
+            except ChannelError as e:
+                # File absente : Redis supprime la liste vidée, RabbitMQ ne l'a pas encore déclarée
+                if not (e.reply_text or '').startswith('NOT_FOUND'):
+                    raise
+                depth = 0
+    except Exception as e:
+        return {'ok': False, 'enabled': True, 'error': str(e)}
+    return {'ok': depth <= max_depth, 'enabled': True, 'queue': queue, 'depth': depth, 'max_depth': max_depth}
+
+
+class HealthMonitor:
+    """Vérifications périodiques en arrière-plan et dernier état connu"""
+
+    def __init__(self):
+        self.interval = 2.0
+        self.max_queue_depth = 100
+        self._app = None
+        self._state = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Configurer les vérifications à partir de app.config
+
+        Clés lues : HEALTH_CHECK_INTERVAL, HEALTH_MAX_QUEUE_DEPTH.
+        """
+        self.interval = app.config.get('HEALTH_CHECK_INTERVAL', 2.0)
+        self.max_queue_depth = app.config.get('HEALTH_MAX_QUEUE_DEPTH', 100)
+        self._app = app
+        app.extensions['health'] = self
+
+    def start(self):
+        """Démarrer le thread de vérification dans ce processus (sans effet s'il tourne déjà)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._state = None
+                threading.Thread(target=self._check_forever, name='health-check', daemon=True).start()
+
+    def _check_forever(self):
+        while True:
+            try:
+                self._state = self.check()
+            except Exception as e:
+                self._app.logger.exception("Vérifications de santé impossibles : %s", e)
+            time.sleep(self.interval)
+
+    def check(self):
+        """
+        Exécuter toutes les vérifications maintenant
+
+        Returns:
+            dict: {'ready', 'checks', 'checked_at', 'monotonic'}
+        """
+        app = self._app
+        with app.app_context():
+            from app import db
+
+            checks = {
+                'database': _check_database(db),
+                'redis': _check_redis(app),
+                'queue': _check_queue(app, self.max_queue_depth),
+            }
+        ready = (
+            all(result['ok'] for result in checks['database'].values())
+            and checks['redis']['ok']
+            and checks['queue']['ok']
+        )
+        return {
+            'ready': ready,
+            'checks': checks,
+            'checked_at': datetime.now(timezone.utc).isoformat(),
+            'monotonic': time.monotonic(),
+        }
+
+    def readiness(self):
+        """
+        Dernier état connu, sans aucune entrée/sortie
+
+        Returns:
+            tuple: (prêt ?, corps de la réponse)
+        """
+        self.start()
+        state = self._state
+        if state is None:
+            return False, {'status': 'starting'}
+
+        age = time.monotonic() - state['monotonic']
+        # Résultat périmé : le thread de vérification est bloqué (ex. base sans réponse)
+        stale = age > 3 * self.interval + 5
+        ready = state['ready'] and not stale
+        body = {
+            'status': 'ready' if ready else 'not_ready',
+            'checked_at': state['checked_at'],
+            'age': round(age, 3),
+            'checks': state['checks'],
+        }
+        if stale:
+            body['error'] = "Vérifications en retard"
+        return ready, body
+
+
+health = HealthMonitor()
@@ -0,0 +1,126 @@
+"""
+Écriture de calendriers iCalendar (RFC 5545)
+
+Seul le sous-ensemble utilisé par le flux des plannings est couvert :
+événements simples ou hebdomadaires (RRULE), heures « flottantes » (heure
+locale de l'étudiant, sans fuseau), texte échappé et lignes repliées à 75
+octets, séparées par CRLF.
+"""
+from datetime import timedelta
+
+CRLF = '\r\n'
+
+# Jours de l'emploi du temps (sans accents, en minuscules) -> jour RRULE
+WEEKDAYS = {
+    'lundi': ('MO', 0),
+    'mardi': ('TU', 1),
+    'mercredi': ('WE', 2),
+    'jeudi': ('TH', 3),
+    'vendredi': ('FR', 4),
+    'samedi': ('SA', 5),
+    'dimanche': ('SU', 6),
+}
+
+_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', ';': '\\;', ',': '\\,', '\n': '\\n', '\r': ''})
+
+
+def escape_text(value):
+    """Échapper une valeur TEXT"""
+    return str(value).translate(_TEXT_ESCAPES)
+
+
+def fold(line):
+    """Replier une ligne de contenu à 75 octets (sans couper un caractère UTF-8)"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    start, limit = 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Reculer jusqu'au début d'un caractère UTF-8
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74
+    return (CRLF + ' ').join(parts)
+
+
+def format_datetime(value):
+    """Date et heure locales (flottantes)"""
+    return value.strftime('%Y%m%dT%H%M%S')
+
+
+def format_utc(value):
+    """Horodatage UTC (les dates de la base sont en UTC)"""
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+def weekday(jour):
+    """
+    Jour RRULE et indice (lundi = 0) d'un jour de l'emploi du temps
+
+    Returns:
+        tuple | None: ('MO', 0)..., ou None si le jour est inconnu
+    """
+    key = (jour or '').strip().lower().replace('é', 'e').replace('è', 'e')
+    return WEEKDAYS.get(key)
+
+
+def first_weekday(start, index):
+    """Premier jour d'indice `index` de la semaine de `start` (lundi = 0)"""
+    monday = start - timedelta(days=start.weekday())
+    return monday + timedelta(days=index)
+
+
+def event(uid, dtstamp, start, end, summary, description=None, location=None, rrule=None, status=None):
+    """
+    Bloc VEVENT (lignes repliées, terminées par CRLF)
+
+    Args:
+        uid: Identifiant stable de l'événement
+        dtstamp: Horodatage UTC de création
+        start, end: Début et fin (datetime locales)
+        summary: Titre
+        description, location, rrule, status: Propriétés optionnelles
+    """
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f'DTSTAMP:{format_utc(dtstamp)}',
+        f'DTSTART:{format_datetime(start)}',
+        f'DTEND:{format_datetime(end)}',
+        f'SUMMARY:{escape_text(summary)}',
+    ]
+    if rrule:
+        lines.append(f'RRULE:{rrule}')
+    if description:
+        lines.append(f'DESCRIPTION:{escape_text(description)}')
+    if location:
+        lines.append(f'LOCATION:{escape_text(location)}')
+    if status:
+        lines.append(f'STATUS:{status}')
+    lines.append('END:VEVENT')
+    return ''.join(fold(line) + CRLF for line in lines)
+
+
+def calendar(name, timezone, events, product='-//Assistant Intelligent//Planning//FR'):
+    """
+    Calendrier VCALENDAR complet
+
+    Args:
+        name: Nom affiché du calendrier
+        timezone: Fuseau des heures flottantes (X-WR-TIMEZONE, ex: Europe/Paris)
+        events: Blocs VEVENT déjà formatés
+    """
+    header = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{product}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(name)}',
+        f'X-WR-TIMEZONE:{timezone}',
+    ]
+    return ''.join(fold(line) + CRLF for line in header) + ''.join(events) + 'END:VCALENDAR' + CRLF
+
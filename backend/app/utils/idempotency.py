@@ -0,0 +1,112 @@
+"""
+Clés d'idempotence des routes d'écriture groupée
+
+Un client qui renvoie une requête (délai dépassé, connexion coupée) ajoute
+l'en-tête Idempotency-Key avec la même valeur : la réponse enregistrée lors
+du premier passage est renvoyée telle quelle, sans nouvelle écriture.
+
+La clé est réservée dans le cache partagé (add atomique) avant l'exécution de
+la vue, puis remplacée par la réponse une fois la transaction validée. Une
+deuxième requête arrivant pendant l'exécution reçoit 409 ; une clé réutilisée
+avec un autre corps reçoit 422. Les réponses 5xx ne sont pas enregistrées :
+la requête peut être rejouée.
+
+La garantie suppose un cache partagé entre workers (Redis). Si REDIS_URL est
+configuré mais que Redis ne répond pas, les requêtes avec une clé reçoivent
+503 (à renvoyer plus tard) ; sans REDIS_URL (développement), la clé n'est
+vérifiée que dans le processus courant et une erreur est journalisée.
+"""
+import hashlib
+from functools import wraps
+from flask import current_app, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from app.utils.cache import get_cache
+
+HEADER = 'Idempotency-Key'
+
+# Longueur maximale d'une clé fournie par le client
+MAX_KEY_LENGTH = 255
+
+# Durée de la réservation pendant l'exécution de la vue (secondes)
+PENDING_TTL = 60
+
+# Avertissement « cache non partagé » déjà journalisé par ce processus
+_unshared_cache_logged = False
+
+
+def _shared_cache_unavailable(cache):
+    """
+    Réponse 503 si Redis est configuré mais injoignable, None sinon
+
+    Sans REDIS_URL, journalise une fois par processus que les clés ne sont
+    pas partagées entre workers.
+    """
+    global _unshared_cache_logged
+    if cache.shared:
+        return None
+    if current_app.config.get('REDIS_URL'):
+        return jsonify({'error': "Cache partagé indisponible, réessayer plus tard"}), 503
+    if not _unshared_cache_logged:
+        _unshared_cache_logged = True
+        current_app.logger.error(
+            "%s : cache en mémoire, clés non partagées entre workers (configurer REDIS_URL)", HEADER
+        )
+    return None
+
+
+def idempotent(view):
+    """
+    Rejouer la réponse enregistrée d'une requête déjà traitée
+
+    À placer sous @jwt_required() : les clés sont propres à chaque utilisateur
+    et à chaque route. Sans en-tête Idempotency-Key, la vue est exécutée
+    normalement.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f"{HEADER} trop longue ({MAX_KEY_LENGTH} caractères au plus)"}), 400
+
+        cache = get_cache()
+        unavailable = _shared_cache_unavailable(cache)
+        if unavailable:
+            return unavailable
+        cache_key = f"idempotency:{get_jwt_identity()}:{request.endpoint}:{key}"
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+
+        reserved = cache.add(cache_key, {'fingerprint': fingerprint}, ttl=PENDING_TTL)
+        # Redis a pu tomber pendant la réservation (écrite alors dans le repli local)
+        unavailable = _shared_cache_unavailable(cache)
+        if unavailable:
+            if reserved:
+                cache.delete(cache_key)
+            return unavailable
+        if not reserved:
+            stored = cache.get(cache_key) or {}
+            if stored.get('fingerprint') != fingerprint:
+                return jsonify({'error': f"{HEADER} déjà utilisée pour une autre requête"}), 422
+            if 'status' not in stored:
+                return jsonify({'error': "Requête identique en cours de traitement"}), 409
+            response = make_response(jsonify(stored['body']), stored['status'])
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        try:
+            response = make_response(view(*args, **kwargs))
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        if response.status_code >= 500 or not response.is_json:
+            cache.delete(cache_key)
+        else:
+            cache.set(cache_key, {
+                'fingerprint': fingerprint,
+                'status': response.status_code,
+                'body': response.get_json()
+            }, ttl=current_app.config['IDEMPOTENCY_TTL'])
+        return response
+    return wrapper
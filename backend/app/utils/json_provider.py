@@ -0,0 +1,45 @@
+"""
+Fournisseur JSON de l'application basé sur orjson
+
+orjson encode directement en octets, en C, les types courants (dict, list,
+str, int, float, datetime, date, time, UUID, dataclasses) ; les réponses
+sont construites à partir de ces octets sans passer par une chaîne Python.
+
+Différences avec le fournisseur par défaut de Flask :
+- les clés ne sont pas triées ;
+- les dates brutes sont encodées en ISO 8601 (et non au format HTTP) ;
+- les réponses sont indentées seulement en mode debug.
+"""
+import decimal
+import orjson
+from flask.json.provider import JSONProvider
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj):
+    """Types non gérés nativement par orjson (comme le fournisseur de Flask)"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSONProvider Flask utilisant orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = OPTIONS | orjson.OPT_INDENT_2 if self._app.debug else OPTIONS
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=option), mimetype='application/json'
+        )
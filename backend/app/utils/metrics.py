@@ -0,0 +1,194 @@
+"""
+Métriques des requêtes HTTP au format Prometheus
+
+Pour chaque requête sont mesurés :
+- la durée totale, par endpoint, méthode et code de réponse ;
+- le nombre de requêtes SQL et le temps passé dans la base (événements
+  before/after_cursor_execute de SQLAlchemy) ;
+- le temps de sérialisation JSON des réponses (app.json.response).
+
+Le hachage des mots de passe (app/utils/hashers.py) est mesuré à part, par
+opération et par algorithme. Les mesures sont exposées sur /metrics.
+
+Désactivées (METRICS_ENABLED=False, par défaut), aucun hook ni écouteur
+SQLAlchemy n'est installé : le seul coût restant est l'appel à
+metrics.timed() autour du hachage, qui renvoie un contexte vide partagé.
+
+Avec gunicorn, chaque worker écrit ses mesures dans PROMETHEUS_MULTIPROC_DIR
+(voir gunicorn.conf.py) et /metrics agrège tous les workers.
+"""
+import os
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Mesures SQL de la requête HTTP en cours dans ce thread (None hors requête)
+_request_stats = ContextVar('request_stats', default=None)
+
+_NULL_TIMER = nullcontext()
+
+# Collecteurs Prometheus, créés une seule fois par processus
+_collectors = None
+
+
+class _RequestStats:
+    __slots__ = ('start', 'queries', 'sql_seconds', 'query_start')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.query_start = 0.0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.sql_seconds += time.perf_counter() - stats.query_start
+
+
+def _get_collectors():
+    """Histogrammes du registre par défaut (un seul jeu quel que soit le nombre d'applications)"""
+    global _collectors
+    if _collectors is None:
+        from prometheus_client import Histogram
+
+        _collectors = {
+            'duration': Histogram(
+                'http_request_duration_seconds', "Durée des requêtes HTTP",
+                ['endpoint', 'method', 'status']
+            ),
+            'sql_queries': Histogram(
+                'http_request_sql_queries', "Requêtes SQL par requête HTTP", ['endpoint'],
+                buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+            ),
+            'sql_seconds': Histogram(
+                'http_request_sql_seconds', "Temps passé dans la base par requête HTTP", ['endpoint'],
+                buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+            ),
+            'json_seconds': Histogram(
+                'json_serialization_seconds', "Durée de sérialisation JSON des réponses", ['endpoint'],
+                buckets=(.00005, .0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1)
+            ),
+            'password_seconds': Histogram(
+                'password_hashing_seconds', "Durée du hachage et de la vérification des mots de passe",
+                ['operation', 'scheme'],
+                buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+            ),
+        }
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    return _collectors
+
+
+class _Timer:
+    """Observer la durée d'un bloc dans un histogramme"""
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Metrics:
+    """Extension Flask enregistrant les métriques des requêtes et la route /metrics"""
+
+    def __init__(self):
+        self.enabled = False
+        self._collectors = None
+
+    def init_app(self, app):
+        """
+        Installer les hooks de mesure si METRICS_ENABLED est vrai
+
+        À appeler avant les autres extensions qui ajoutent des hooks
+        before_request (limiteur) : une requête refusée est ainsi mesurée.
+        """
+        self.enabled = app.config.get('METRICS_ENABLED', False)
+        app.extensions['metrics'] = self
+        if not self.enabled:
+            return
+
+        self._collectors = _get_collectors()
+        self._wrap_json_response(app)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/metrics', 'metrics', self.export)
+
+    def timed(self, operation, scheme):
+        """
+        Contexte mesurant une opération de hachage de mot de passe
+
+        Args:
+            operation: 'hash' ou 'verify'
+            scheme: Nom de l'algorithme
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self._collectors['password_seconds'].labels(operation, scheme))
+
+    def _wrap_json_response(self, app):
+        """Mesurer app.json.response (jsonify et dictionnaires renvoyés par les routes)"""
+        provider = app.json
+        response = provider.response
+        histogram = self._collectors['json_seconds']
+
+        def timed_response(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return response(*args, **kwargs)
+            finally:
+                if _request_stats.get() is not None:
+                    histogram.labels(request.endpoint or 'none').observe(time.perf_counter() - start)
+
+        provider.response = timed_response
+
+    def _before_request(self):
+        _request_stats.set(_RequestStats())
+
+    def _after_request(self, response):
+        stats = _request_stats.get()
+        if stats is None:
+            return response
+        endpoint = request.endpoint or 'none'
+        collectors = self._collectors
+        collectors['duration'].labels(endpoint, request.method, response.status_code).observe(
+            time.perf_counter() - stats.start
+        )
+        collectors['sql_queries'].labels(endpoint).observe(stats.queries)
+        collectors['sql_seconds'].labels(endpoint).observe(stats.sql_seconds)
+        return response
+
+    def _teardown_request(self, exc):
+        _request_stats.set(None)
+
+    def export(self):
+        """Route /metrics : toutes les mesures au format texte Prometheus"""
+        from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+        registry = REGISTRY
+        if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+            from prometheus_client import multiprocess
+
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+
+
+metrics = Metrics()
@@ -0,0 +1,129 @@
+"""
+Pagination par curseur (keyset)
+
+Une page est lue avec une condition sur les colonnes de tri, par exemple
+(date_limite, id) > (valeurs de la dernière ligne), et non avec OFFSET : la
+base descend directement dans l'index composite correspondant, et le coût
+d'une page ne dépend pas de sa position (la page 500 coûte autant que la
+page 1).
+
+Le curseur est opaque pour le client : c'est la liste JSON des valeurs de
+tri de la dernière ligne renvoyée, encodée en base64 (URL-safe).
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+
+from sqlalchemy import tuple_
+
+# Taille de page par défaut et maximale
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def parse_limit(value):
+    """
+    Valider la taille de page demandée
+
+    Args:
+        value: Valeur du paramètre limit (int ou None)
+
+    Returns:
+        int: Taille de page entre 1 et MAX_LIMIT
+    """
+    if value is None:
+        return DEFAULT_LIMIT
+    if value < 1:
+        raise ValueError("Le paramètre limit doit être un entier positif")
+    return min(value, MAX_LIMIT)
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value, column):
+    """Convertir une valeur du curseur dans le type Python de la colonne"""
+    python_type = column.type.python_type
+    if value is None:
+        return None
+    if python_type in (datetime, date, time):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values):
+    """
+    Encoder les valeurs de tri d'une ligne en curseur opaque
+
+    Args:
+        values: Valeurs des colonnes de tri
+
+    Returns:
+        str: Curseur (base64 URL-safe, sans remplissage)
+    """
+    payload = json.dumps([_encode_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, columns):
+    """
+    Décoder un curseur pour les colonnes de tri données
+
+    Args:
+        cursor: Curseur reçu du client
+        columns: Colonnes de tri (dans l'ordre)
+
+    Returns:
+        list: Valeurs typées des colonnes
+
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(payload)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [_decode_value(value, column) for value, column in zip(values, columns)]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Curseur de pagination invalide")
+
+
+def paginate(query, columns, limit=DEFAULT_LIMIT, cursor=None, descending=False):
+    """
+    Lire une page d'une requête ORM triée par `columns`
+
+    La dernière colonne doit être unique (l'ID) pour que l'ordre soit total.
+    Une ligne de plus que la page est lue pour savoir s'il reste une suite.
+
+    Args:
+        query: Requête (Query) déjà filtrée
+        columns: Colonnes de tri, couvertes par un index composite
+        limit: Taille de la page
+        cursor: Curseur de la page précédente (None pour la première page)
+        descending: Tri décroissant (les plus récents d'abord)
+
+    Returns:
+        tuple: (lignes de la page, curseur de la page suivante ou None)
+
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    if cursor:
+        values = tuple(decode_cursor(cursor, columns))
+        keys = tuple_(*columns)
+        query = query.filter(keys < values if descending else keys > values)
+
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in columns])
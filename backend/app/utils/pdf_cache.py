@@ -0,0 +1,110 @@
+"""
+Cache disque des emplois du temps déjà analysés
+
+Les cours extraits d'un PDF sont stockés sous l'empreinte SHA-256 du fichier :
+un même PDF envoyé par plusieurs étudiants n'est analysé qu'une fois. Les
+entrées sont des fichiers JSON ; la date de modification sert d'horodatage
+LRU et les plus anciennes sont supprimées au-delà de la taille maximale.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from datetime import time
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _format_time(value):
+    return value.strftime('%H:%M')
+
+
+def _parse_time(value):
+    hours, minutes = value.split(':')
+    return time(int(hours), int(minutes))
+
+
+class TimetableCache:
+    """Cache LRU sur disque : empreinte du PDF -> tuples de cours"""
+
+    def __init__(self, directory, max_bytes, version=1):
+        """
+        Args:
+            directory: Dossier du cache (créé si besoin)
+            max_bytes: Taille totale maximale des entrées
+            version: Version de l'analyseur (invalide les entrées plus anciennes)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def new_hasher():
+        """Objet de hachage utilisé pour les empreintes"""
+        return hashlib.sha256()
+
+    def _path(self, digest):
+        return os.path.join(self.directory, f"{digest}.v{self.version}.json")
+
+    def get(self, digest):
+        """
+        Lire les cours associés à une empreinte
+
+        Returns:
+            list: Tuples (jour, heure_debut, heure_fin, matiere, salle, enseignant) ou None
+        """
+        path = self._path(digest)
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                rows = json.load(handle)
+            # Marquer l'entrée comme récemment utilisée
+            os.utime(path, None)
+        except (OSError, ValueError):
+            return None
+        return [
+            (jour, _parse_time(debut), _parse_time(fin), matiere, salle, enseignant)
+            for jour, debut, fin, matiere, salle, enseignant in rows
+        ]
+
+    def put(self, digest, courses):
+        """Enregistrer les cours d'une empreinte puis appliquer la taille maximale"""
+        rows = [
+            [jour, _format_time(debut), _format_time(fin), matiere, salle, enseignant]
+            for jour, debut, fin, matiere, salle, enseignant in courses
+        ]
+        # Écriture atomique : les lecteurs concurrents ne voient jamais un fichier partiel
+        handle, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8') as tmp:
+                json.dump(rows, tmp, ensure_ascii=False)
+            os.replace(tmp_path, self._path(digest))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """Supprimer les entrées les moins récemment utilisées au-delà de max_bytes"""
+        entries, total = [], 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,136 @@
+"""
+Profileur par échantillonnage des requêtes lentes
+
+Activé seulement si PROFILE_SLOW_REQUEST_MS > 0. Un thread d'arrière-plan
+relève toutes les PROFILE_INTERVAL_MS la pile de chaque thread qui traite une
+requête (sys._current_frames(), sans instrumenter le code). Lorsqu'une requête
+dépasse le seuil, ses échantillons sont écrits dans PROFILE_DIR au format
+« folded » (une pile par ligne, cadres séparés par « ; », suivie du nombre
+d'échantillons), lu par flamegraph.pl, speedscope ou inferno.
+
+Le thread dort tant qu'aucune requête n'est en cours ; il est démarré à la
+première requête de chaque processus (donc après le fork des workers
+gunicorn). Les workers gevent ne sont pas échantillonnés : leurs requêtes
+partagent un même thread système.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from flask import request
+
+# Profondeur maximale d'une pile relevée
+MAX_DEPTH = 128
+
+
+class SamplingProfiler:
+    """Extension Flask enregistrant un flame graph des requêtes lentes"""
+
+    def __init__(self):
+        self.enabled = False
+        self.threshold = 0.0
+        self.interval = 0.005
+        self.directory = None
+        self._active = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+        self._labels = {}
+        self._logger = None
+
+    def init_app(self, app):
+        """
+        Configurer le profileur à partir de app.config
+
+        Clés lues : PROFILE_SLOW_REQUEST_MS, PROFILE_INTERVAL_MS, PROFILE_DIR.
+        """
+        config = app.config
+        self.threshold = config.get('PROFILE_SLOW_REQUEST_MS', 0) / 1000
+        self.enabled = self.threshold > 0
+        app.extensions['profiler'] = self
+        if not self.enabled:
+            return
+
+        self.interval = config.get('PROFILE_INTERVAL_MS', 5) / 1000
+        self.directory = config.get('PROFILE_DIR', 'profiles')
+        self._logger = app.logger
+        os.makedirs(self.directory, exist_ok=True)
+
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+
+    def _ensure_sampler(self):
+        """Démarrer le thread d'échantillonnage dans ce processus"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._active = {}
+                threading.Thread(target=self._sample_forever, name='request-profiler', daemon=True).start()
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _fold(self, frame):
+        """Pile d'un cadre, de la racine à la feuille, au format folded"""
+        stack = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            stack.append(self._label(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        return ';'.join(stack)
+
+    def _sample_forever(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                if not self._active:
+                    self._wake.clear()
+                    continue
+                for ident, samples in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        samples[self._fold(frame)] += 1
+            del frames
+
+    def _before_request(self):
+        self._ensure_sampler()
+        request.environ['profiler.start'] = time.perf_counter()
+        with self._lock:
+            self._active[threading.get_ident()] = Counter()
+            self._wake.set()
+
+    def _teardown_request(self, exc):
+        with self._lock:
+            samples = self._active.pop(threading.get_ident(), None)
+        start = request.environ.get('profiler.start')
+        if samples is None or start is None:
+            return
+        elapsed = time.perf_counter() - start
+        if elapsed >= self.threshold and samples:
+            self._write(samples, elapsed)
+
+    def _write(self, samples, elapsed):
+        """Écrire les échantillons d'une requête lente dans PROFILE_DIR"""
+        endpoint = (request.endpoint or 'none').replace('.', '_')
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{endpoint}-{elapsed * 1000:.0f}ms-{os.getpid()}.folded"
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.writelines(f"{stack} {count}\n" for stack, count in samples.most_common())
+        except OSError as e:
+            self._logger.warning("Profil non enregistré (%s) : %s", path, e)
+            return
+        self._logger.info("Requête lente %s %s (%.0f ms) : profil %s",
+                          request.method, request.path, elapsed * 1000, path)
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,143 @@
+"""
+Limitation de débit : stockage partagé et coût par route
+
+Les compteurs sont stockés dans Redis (partagés entre workers et serveurs)
+avec l'algorithme « sliding-window-counter » de la bibliothèque limits : deux
+compteurs par clé, donc une mémoire constante quel que soit le nombre de
+requêtes. Si Redis est injoignable, les compteurs basculent temporairement
+sur un stockage en mémoire propre au processus.
+
+Chaque requête consomme un nombre d'unités qui dépend de la route : une
+connexion ou un envoi de PDF coûte plus cher qu'un appel à /health.
+
+Les limites sont analysées une seule fois au démarrage et chaque requête ne
+fait qu'un appel au stockage par limite (quelques dizaines de µs en mémoire,
+un aller-retour Redis sinon).
+"""
+import time
+from flask import abort, request
+from limits import parse_many
+from limits.errors import StorageError
+from limits.storage import MemoryStorage, storage_from_string
+from limits.strategies import STRATEGIES
+
+# Unités consommées par endpoint (1 par défaut, 0 = non limité)
+ROUTE_COSTS = {
+    'auth.login': 5,
+    'auth.register': 5,
+    'auth.change_password': 5,
+    'schedules.upload': 10,
+    'planning.generate': 5,
+    'planning.complete_sessions': 5,
+    'tasks.bulk_tasks': 5,
+    'export.export_data': 10,
+    'export.import_data': 10,
+    'metrics': 0,
+    'calendar.feed': 0,
+    'health.live': 0,
+    'health.ready': 0,
+}
+
+DEFAULT_COST = 1
+
+# Durée (secondes) pendant laquelle le stockage local remplace Redis après une erreur
+FALLBACK_SECONDS = 30
+
+
+def request_cost():
+    """Coût de la requête courante"""
+    return ROUTE_COSTS.get(request.endpoint, DEFAULT_COST)
+
+
+def storage_uri(config):
+    """
+    URI du stockage des compteurs
+
+    RATELIMIT_STORAGE_URI est prioritaire, puis REDIS_URL ; sans Redis les
+    compteurs restent en mémoire (propres à chaque processus).
+    """
+    return config.get('RATELIMIT_STORAGE_URI') or config.get('REDIS_URL') or 'memory://'
+
+
+def remote_address():
+    """Clé par défaut : adresse IP du client"""
+    return request.remote_addr or '127.0.0.1'
+
+
+class RateLimiter:
+    """
+    Extension Flask appliquant les limites par défaut à chaque requête
+
+    Les compteurs sont propres à chaque endpoint et à chaque clé (adresse IP
+    par défaut), comme les limites par défaut de Flask-Limiter.
+    """
+
+    def __init__(self, key_func=remote_address, cost_func=request_cost):
+        self.key_func = key_func
+        self.cost_func = cost_func
+        self.enabled = True
+        self.limits = []
+        self._limiter = None
+        self._local = None
+        self._fallback_until = 0.0
+        self._logger = None
+
+    def init_app(self, app):
+        """
+        Configurer le limiteur à partir de app.config
+
+        Clés lues : RATELIMIT_ENABLED, RATELIMIT_DEFAULT, RATELIMIT_STRATEGY,
+        RATELIMIT_STORAGE_URI, RATELIMIT_STORAGE_OPTIONS, RATELIMIT_KEY_PREFIX.
+        """
+        config = app.config
+        self.enabled = config.get('RATELIMIT_ENABLED', True)
+        self.limits = parse_many(config.get('RATELIMIT_DEFAULT', '200 per day;50 per hour'))
+        strategy = STRATEGIES[config.get('RATELIMIT_STRATEGY', 'sliding-window-counter')]
+
+        uri = config.get('RATELIMIT_STORAGE_URI', 'memory://')
+        if uri.startswith('memory://'):
+            storage = MemoryStorage()
+        else:
+            storage = storage_from_string(
+                uri,
+                wrap_exceptions=True,
+                key_prefix=config.get('RATELIMIT_KEY_PREFIX', 'sa-limits'),
+                **config.get('RATELIMIT_STORAGE_OPTIONS', {})
+            )
+        self._limiter = strategy(storage)
+        self._local = strategy(MemoryStorage())
+        self._logger = app.logger
+
+        app.before_request(self.check)
+        app.extensions['limiter'] = self
+
+    def hit(self, key, cost=1, scope=''):
+        """
+        Consommer `cost` unités pour `key` sur chaque limite par défaut
+
+        Returns:
+            RateLimitItem | None: La limite dépassée, ou None si la requête passe
+        """
+        limiter = self._limiter if time.monotonic() >= self._fallback_until else self._local
+        for limit in self.limits:
+            try:
+                allowed = limiter.hit(limit, scope, key, cost=cost)
+            except StorageError as e:
+                self._logger.warning("Stockage des limites indisponible (%s), compteurs en mémoire", e)
+                self._fallback_until = time.monotonic() + FALLBACK_SECONDS
+                limiter = self._local
+                allowed = limiter.hit(limit, scope, key, cost=cost)
+            if not allowed:
+                return limit
+        return None
+
+    def check(self):
+        """Vérifier les limites de la requête courante (hook before_request)"""
+        if not self.enabled or request.endpoint is None or request.method == 'OPTIONS':
+            return
+        cost = self.cost_func()
+        if not cost:
+            return
+        exceeded = self.hit(self.key_func(), cost, request.endpoint)
+        if exceeded is not None:
+            abort(429, description=f"Limite atteinte : {exceeded}")
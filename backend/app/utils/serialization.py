@@ -0,0 +1,96 @@
+"""
+Sérialisation groupée des graphes Planning → Session → Task → Subject
+
+Les méthodes to_dict() des modèles suivent les relations une par une
+(N+1 requêtes). Ce module charge le graphe complet en un nombre fixe de
+requêtes : une pour les plannings, une seule requête jointe pour les
+sessions avec leur tâche et leur matière.
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models.planning import Planning
+from app.models.session import Session
+from app.models.task import Task
+from app.utils.serializers import dump, dump_many
+
+
+def preload_sessions(plannings):
+    """
+    Précharger les sessions (avec tâche et matière) d'une liste de plannings
+
+    Les sessions sont attachées à chaque planning dans `_preloaded_sessions`,
+    attribut utilisé par Planning.to_dict() et app.utils.serializers à la place de la
+    relation dynamique.
+
+    Args:
+        plannings: Liste de plannings déjà chargés
+
+    Returns:
+        list: Les mêmes plannings, avec leurs sessions préchargées
+    """
+    plannings = list(plannings)
+    if not plannings:
+        return plannings
+
+    planning_ids = [planning.id for planning in plannings]
+
+    # Une seule requête jointe sessions ⟕ tasks ⟕ subjects
+    sessions = db.session.execute(
+        select(Session)
+        .where(Session.planning_id.in_(planning_ids))
+        .options(joinedload(Session.task).joinedload(Task.subject))
+        .order_by(Session.date, Session.heure_debut, Session.id)
+    ).scalars().all()
+
+    by_planning = {planning_id: [] for planning_id in planning_ids}
+    for session in sessions:
+        by_planning[session.planning_id].append(session)
+
+    for planning in plannings:
+        planning._preloaded_sessions = by_planning[planning.id]
+
+    return plannings
+
+
+def load_plannings(*criteria):
+    """
+    Charger des plannings et leur graphe complet en deux requêtes
+
+    Args:
+        *criteria: Conditions SQLAlchemy sur Planning (ex: Planning.user_id == 1)
+
+    Returns:
+        list: Plannings avec leurs sessions préchargées
+    """
+    plannings = db.session.execute(
+        select(Planning).where(*criteria).order_by(Planning.date_debut, Planning.id)
+    ).scalars().all()
+    return preload_sessions(plannings)
+
+
+def serialize_plannings(plannings):
+    """
+    Convertir des plannings en dictionnaires sans requête N+1
+
+    Args:
+        plannings: Liste de plannings
+
+    Returns:
+        list: Dictionnaires des plannings, sessions, tâches et matières
+    """
+    return dump_many(preload_sessions(plannings))
+
+
+def serialize_planning(planning_id):
+    """
+    Sérialiser un planning complet par son ID
+
+    Args:
+        planning_id: ID du planning
+
+    Returns:
+        dict: Le planning sérialisé ou None
+    """
+    plannings = load_plannings(Planning.id == planning_id)
+    return dump(plannings[0]) if plannings else None
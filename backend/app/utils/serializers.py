@@ -0,0 +1,184 @@
+"""
+Sérialiseurs précompilés des modèles
+
+Les méthodes to_dict() relisent chaque attribut et formatent chaque date à
+chaque appel. Ici, la projection colonne → clé d'un modèle est calculée une
+seule fois (à la première utilisation) et compilée en une fonction Python qui
+construit le dictionnaire en une expression, sans boucle ni test de type.
+
+Les dates (Date) et les heures (Time, format HH:MM) sont formatées par des
+fonctions mémoïsées : un planning de 10 000 sessions ne contient que quelques
+centaines de dates et d'heures distinctes, chacune n'est formatée qu'une fois.
+Les horodatages (DateTime) sont presque tous distincts et gardent isoformat().
+
+Le résultat est identique à celui de to_dict() (mêmes clés, mêmes valeurs
+JSON) : il peut être mis en cache ou envoyé tel quel à Celery.
+
+Usage :
+    dump(session)                        # comme session.to_dict()
+    dump_many(sessions)                  # liste de dictionnaires
+    dump_many(schedules, exclude=('courses',))
+"""
+from functools import lru_cache
+from sqlalchemy import Date, DateTime, Time, inspect
+
+from app.models import Course, Notification, Planning, Schedule, Session, Subject, Task, User
+
+# Sérialiseurs compilés, par (modèle, clés exclues)
+_compiled = {}
+
+# Déclarations enregistrées par register()
+_registry = {}
+
+
+@lru_cache(maxsize=8192)
+def _format_date(value):
+    return value.isoformat()
+
+
+@lru_cache(maxsize=4096)
+def _format_time(value):
+    return value.strftime('%H:%M')
+
+
+def _format_datetime(value):
+    return value.isoformat()
+
+
+def _formatter(column_type):
+    """Fonction de formatage d'un type de colonne (None si la valeur est déjà JSON)"""
+    if isinstance(column_type, DateTime):
+        return _format_datetime
+    if isinstance(column_type, Date):
+        return _format_date
+    if isinstance(column_type, Time):
+        return _format_time
+    return None
+
+
+def register(model, exclude=(), nested=None, collections=None):
+    """
+    Déclarer la projection d'un modèle
+
+    Args:
+        model: Classe du modèle
+        exclude: Colonnes à ne jamais sérialiser (ex: mot de passe)
+        nested: {clé: modèle} des relations simples (None si absente)
+        collections: {clé: (modèle, fonction renvoyant les objets liés)}
+    """
+    _registry[model] = {
+        'exclude': frozenset(exclude),
+        'nested': nested or {},
+        'collections': collections or {},
+    }
+
+
+def _compile(model, exclude):
+    """
+    Générer la fonction de sérialisation d'un modèle
+
+    Les attributs déjà chargés sont lus directement dans obj.__dict__ (sans
+    passer par les descripteurs de SQLAlchemy) ; si l'un manque (attribut
+    expiré ou relation non chargée), la variante avec getattr() est utilisée.
+    """
+    declaration = _registry[model]
+    namespace = {}
+    items = []
+
+    for position, attribute in enumerate(inspect(model).column_attrs):
+        key = attribute.key
+        if key in declaration['exclude'] or key in exclude:
+            continue
+        formatter = _formatter(attribute.columns[0].type)
+        if formatter is None:
+            items.append(f"{key!r}: {{get}}({key!r})")
+        else:
+            namespace[f'f{position}'] = formatter
+            items.append(f"{key!r}: None if (v{position} := {{get}}({key!r})) is None else f{position}(v{position})")
+
+    # Un objet lié à plusieurs lignes (la tâche de 50 sessions) n'est sérialisé qu'une fois
+    for position, (key, target) in enumerate(declaration['nested'].items()):
+        if key in exclude:
+            continue
+        namespace[f'n{position}'] = serializer(target)
+        items.append(
+            f"{key!r}: None if (r{position} := {{get}}({key!r})) is None "
+            f"else (memo.get(r{position}) or memo.setdefault(r{position}, n{position}(r{position}, memo)))"
+        )
+
+    for position, (key, (target, related)) in enumerate(declaration['collections'].items()):
+        if key in exclude:
+            continue
+        namespace[f'c{position}'] = serializer(target)
+        namespace[f'g{position}'] = related
+        items.append(f"{key!r}: [c{position}(item, memo) for item in g{position}(obj)]")
+
+    body = "{\n            " + ",\n            ".join(items).replace('{get}', 'get') + "\n        }"
+    source = (
+        "def dump(obj, memo):\n"
+        "    get = obj.__dict__.__getitem__\n"
+        "    try:\n"
+        f"        return {body}\n"
+        "    except KeyError:\n"
+        "        get = obj.__getattribute__\n"
+        f"        return {body}\n"
+    )
+    exec(compile(source, f'<serializer {model.__name__}>', 'exec'), namespace)
+    return namespace['dump']
+
+
+def serializer(model, exclude=()):
+    """
+    Fonction de sérialisation (compilée une fois) d'un modèle
+
+    La fonction prend l'objet et un dictionnaire `memo` des objets liés déjà
+    sérialisés ; préférer dump() et dump_many().
+
+    Args:
+        model: Classe du modèle enregistré
+        exclude: Clés à omettre (colonnes ou relations)
+
+    Raises:
+        KeyError: Si le modèle n'est pas enregistré
+    """
+    key = (model, frozenset(exclude))
+    function = _compiled.get(key)
+    if function is None:
+        function = _compiled[key] = _compile(model, key[1])
+    return function
+
+
+def dump(obj, exclude=()):
+    """Sérialiser un objet (équivalent de obj.to_dict())"""
+    return serializer(type(obj), exclude)(obj, {})
+
+
+def dump_many(objs, exclude=()):
+    """
+    Sérialiser une liste d'objets du même modèle
+
+    Les objets liés communs à plusieurs éléments (tâche, matière) sont
+    sérialisés une seule fois et le même dictionnaire est partagé.
+    """
+    objs = list(objs)
+    if not objs:
+        return []
+    function = serializer(type(objs[0]), exclude)
+    memo = {}
+    return [function(obj, memo) for obj in objs]
+
+
+def _planning_sessions(planning):
+    # Graphe préchargé par app.utils.serialization s'il existe (voir Planning.to_dict)
+    sessions = getattr(planning, '_preloaded_sessions', None)
+    return planning.sessions if sessions is None else sessions
+
+
+register(User, exclude=('mot_de_passe', 'calendar_nonce'))
+register(Subject)
+register(Task, nested={'subject': Subject})
+register(Session, nested={'task': Task})
+register(Planning, collections={'sessions': (Session, _planning_sessions)})
+register(Course)
+register(Schedule, collections={'courses': (Course, lambda schedule: schedule.courses)})
+register(Notification)
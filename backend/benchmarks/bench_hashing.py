@@ -0,0 +1,48 @@
+"""
+Benchmark : connexions par seconde et par cœur selon l'algorithme de hachage
+
+Chaque réglage (algorithme, coût) est mesuré sur un seul thread : le débit
+obtenu est celui d'un cœur, à multiplier par PASSWORD_HASH_WORKERS pour
+estimer la capacité d'un processus lors d'un pic de connexions.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_hashing
+"""
+import time
+from app.utils.hashers import get_hasher
+
+SETTINGS = [
+    ('pbkdf2', 100000),
+    ('pbkdf2', 600000),
+    ('scrypt', 16384),
+    ('scrypt', 32768),
+    ('bcrypt', 10),
+    ('bcrypt', 12),
+]
+
+# Durée minimale de mesure par réglage (secondes)
+MIN_SECONDS = 1.0
+
+
+def logins_per_second(hasher, password='correct horse battery staple'):
+    """Nombre de vérifications par seconde sur un thread"""
+    encoded = hasher.hash(password)
+    count = 0
+    start = time.perf_counter()
+    while True:
+        hasher.verify(encoded, password)
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return count / elapsed, elapsed / count * 1000
+
+
+def main():
+    print(f"{'algorithme':<10} {'coût':>8} {'ms/connexion':>13} {'connexions/s/cœur':>18}")
+    for name, cost in SETTINGS:
+        rate, ms = logins_per_second(get_hasher(name, cost))
+        print(f"{name:<10} {cost:>8} {ms:>13.1f} {rate:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
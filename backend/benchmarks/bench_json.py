@@ -0,0 +1,108 @@
+"""
+Benchmark : sérialisation JSON de 10 000 sessions
+
+Compare le chemin historique (Session.to_dict() puis le fournisseur JSON par
+défaut de Flask) aux sérialiseurs précompilés d'app.utils.serializers encodés
+par orjson (OrjsonProvider). Les sessions, leurs tâches et leurs matières sont
+chargées avant la mesure : seule la sérialisation est comparée. Les deux
+chemins doivent produire le même document JSON.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_json
+"""
+import json
+import statistics
+import sys
+import time
+from datetime import date, datetime, time as clock, timedelta
+from benchmarks.common import make_app
+
+SESSIONS = 10000
+RUNS = 5
+
+
+def seed(db):
+    """Un planning de SESSIONS sessions réparties sur 200 tâches et 10 matières"""
+    from app.models import Planning, Session, Subject, Task, User
+
+    user = User(nom='Bench', email='bench-json@example.com', mot_de_passe='x')
+    db.session.add(user)
+    db.session.flush()
+    subjects = [Subject(user_id=user.id, titre=f'Matière {i}') for i in range(10)]
+    db.session.add_all(subjects)
+    db.session.flush()
+    tasks = [
+        Task(user_id=user.id, subject_id=subjects[i % 10].id, titre=f'Tâche {i}',
+             date_limite=datetime(2026, 1, 1) + timedelta(days=i % 120))
+        for i in range(200)
+    ]
+    db.session.add_all(tasks)
+    planning = Planning(user_id=user.id, date_debut=date(2025, 9, 1), date_fin=date(2026, 6, 30))
+    db.session.add(planning)
+    db.session.flush()
+    db.session.add_all([
+        Session(planning_id=planning.id, task_id=tasks[i % 200].id,
+                date=date(2025, 9, 1) + timedelta(days=i % 300),
+                heure_debut=clock(8 + i % 10, 0), heure_fin=clock(9 + i % 10, 30),
+                matiere=f'Matière {i % 10}', description='Révision')
+        for i in range(SESSIONS)
+    ])
+    db.session.commit()
+    return planning.id
+
+
+def best_ms(function):
+    durations = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return min(durations), statistics.median(durations)
+
+
+def main():
+    app = make_app()
+    from flask.json.provider import DefaultJSONProvider
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload
+    from app import db
+    from app.models import Session, Task
+    from app.utils.serializers import dump_many
+
+    default_provider = DefaultJSONProvider(app)
+    with app.app_context():
+        planning_id = seed(db)
+        db.session.expunge_all()
+        sessions = db.session.execute(
+            select(Session).where(Session.planning_id == planning_id)
+            .options(joinedload(Session.task).joinedload(Task.subject))
+        ).scalars().all()
+
+        def legacy():
+            return default_provider.dumps({'sessions': [session.to_dict() for session in sessions]})
+
+        def compiled():
+            return app.json.dumps({'sessions': dump_many(sessions)})
+
+        if json.loads(legacy()) != json.loads(compiled()):
+            print('ÉCHEC : les deux chemins ne produisent pas le même document')
+            return 1
+
+        results = [
+            ('to_dict() seul', lambda: [session.to_dict() for session in sessions]),
+            ('dump_many() seul', lambda: dump_many(sessions)),
+            ('to_dict() + JSON Flask', legacy),
+            ('dump_many() + orjson', compiled),
+        ]
+        print(f"{SESSIONS} sessions (avec tâche et matière)")
+        timings = {}
+        for name, function in results:
+            best, median = best_ms(function)
+            timings[name] = best
+            print(f"{name:<24} meilleur {best:>7.1f} ms   médiane {median:>7.1f} ms")
+        print(f"accélération de bout en bout : ×{timings['to_dict() + JSON Flask'] / timings['dump_many() + orjson']:.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
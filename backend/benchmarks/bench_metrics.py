@@ -0,0 +1,49 @@
+"""
+Benchmark : surcoût des métriques par requête
+
+Compare la durée moyenne d'une requête GET /api/tasks (une requête SQL, une
+réponse JSON) avec METRICS_ENABLED désactivé puis activé, chaque mode dans
+une application distincte.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_metrics
+"""
+import os
+import statistics
+import time
+
+REQUESTS = 2000
+RUNS = 5
+
+
+def per_request_us(client, headers):
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        client.get('/api/tasks?limit=5', headers=headers)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def measure(enabled):
+    os.environ['METRICS_ENABLED'] = str(enabled)
+    os.environ['RATELIMIT_ENABLED'] = 'False'
+    from benchmarks.common import make_app
+
+    app = make_app()
+    client = app.test_client()
+    response = client.post('/api/auth/register', json={
+        'nom': 'Bench', 'email': 'bench@example.com', 'password': 'motdepasse'
+    })
+    headers = {'Authorization': f"Bearer {response.json['access_token']}"}
+    per_request_us(client, headers)
+    return statistics.median(per_request_us(client, headers) for _ in range(RUNS))
+
+
+def main():
+    disabled = measure(False)
+    enabled = measure(True)
+    print(f"métriques désactivées {disabled:.0f} µs, activées {enabled:.0f} µs, "
+          f"surcoût {enabled - disabled:.0f} µs par requête")
+
+
+if __name__ == '__main__':
+    main()
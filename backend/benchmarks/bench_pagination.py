@@ -0,0 +1,96 @@
+"""
+Benchmark : pagination par curseur des listes (page 1 contre page 500)
+
+Un utilisateur avec PAGES pages de tâches et de notifications ; la même page
+est lue avec le curseur (keyset) et avec OFFSET pour comparaison. Avec le
+curseur, la latence de la page 500 doit rester celle de la page 1.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_pagination
+"""
+import statistics
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+from benchmarks.common import make_app, timer
+
+PAGES = 500
+LIMIT = 50
+OTHER_USERS = 20
+REPEAT = 20
+
+
+def populate(db):
+    """Tâches et notifications de l'utilisateur 1, plus d'autres utilisateurs"""
+    from app.models import User, Subject, Task, Notification
+
+    n_users = OTHER_USERS + 1
+    per_user = PAGES * LIMIT
+    db.session.execute(insert(User), [
+        {'id': u, 'nom': f'u{u}', 'email': f'u{u}@example.com', 'mot_de_passe': 'x'} for u in range(1, n_users + 1)
+    ])
+    db.session.execute(insert(Subject), [{'id': u, 'user_id': u, 'titre': 'Matière'} for u in range(1, n_users + 1)])
+
+    start = datetime(2026, 1, 1)
+    for u in range(1, n_users + 1):
+        count = per_user if u == 1 else per_user // 10
+        db.session.execute(insert(Task), [
+            {'user_id': u, 'subject_id': u, 'titre': f'Tâche {i}', 'date_limite': start + timedelta(minutes=7 * i),
+             'etat': ('à faire', 'en cours', 'terminée')[i % 3]}
+            for i in range(count)
+        ])
+        db.session.execute(insert(Notification), [
+            {'user_id': u, 'type': 'rappel', 'message': f'Rappel {i}', 'date_envoi': start,
+             'created_at': start + timedelta(seconds=i), 'lue': i % 2 == 0}
+            for i in range(count)
+        ])
+    db.session.commit()
+
+
+def median_ms(function):
+    durations = []
+    for _ in range(REPEAT):
+        with timer() as elapsed:
+            function()
+        durations.append(elapsed['ms'])
+    return statistics.median(durations)
+
+
+def main():
+    from app import db
+    from app.models import Task
+    from app.services.notification_service import NotificationService
+    from app.services.task_service import TaskService
+
+    app = make_app()
+    with app.app_context():
+        populate(db)
+
+        lists = {
+            'tâches': lambda cursor: TaskService.list_tasks(1, limit=LIMIT, cursor=cursor),
+            'notifications': lambda cursor: NotificationService.list_notifications(1, limit=LIMIT, cursor=cursor),
+        }
+        for name, list_page in lists.items():
+            # Curseurs de chaque page, en parcourant la liste une fois
+            cursors = [None]
+            for _ in range(PAGES - 1):
+                cursors.append(list_page(cursors[-1])['next_cursor'])
+
+            first = median_ms(lambda: list_page(cursors[0]))
+            last = median_ms(lambda: list_page(cursors[PAGES - 1]))
+            print(f"{name} (curseur) : page 1 {first:.2f} ms, page {PAGES} {last:.2f} ms")
+
+        def offset_page(page):
+            tasks = (
+                Task.query.options(joinedload(Task.subject)).filter(Task.user_id == 1)
+                .order_by(Task.date_limite, Task.id).offset(page * LIMIT).limit(LIMIT).all()
+            )
+            return [task.to_dict() for task in tasks]
+
+        first = median_ms(lambda: offset_page(0))
+        last = median_ms(lambda: offset_page(PAGES - 1))
+        print(f"tâches (OFFSET, référence) : page 1 {first:.2f} ms, page {PAGES} {last:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark : génération d'un planning semestriel pour 200 tâches
+
+Mesure uniquement le moteur (app.ml.planner), sans base de données.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_planner
+"""
+import random
+import statistics
+import time as clock
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from app.ml.planner import StudyPlanner
+
+N_TASKS = 200
+RUNS = 20
+
+
+def make_inputs(seed=42):
+    """Tâches et cours synthétiques pour un semestre"""
+    rng = random.Random(seed)
+    start = date(2025, 9, 1)
+    tasks = [
+        SimpleNamespace(
+            id=i, titre=f'Tâche {i}', subject=None, etat='à faire',
+            priorite=rng.choice([1, 3, 5]),
+            date_limite=datetime.combine(start, time(12, 0)) + timedelta(days=rng.randint(7, 140))
+        )
+        for i in range(N_TASKS)
+    ]
+    courses = [
+        SimpleNamespace(jour=jour, heure_debut=time(8, 30), heure_fin=time(12, 0))
+        for jour in ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi']
+    ] + [
+        SimpleNamespace(jour=jour, heure_debut=time(13, 30), heure_fin=time(16, 45))
+        for jour in ['Lundi', 'Mercredi', 'Jeudi']
+    ]
+    return tasks, courses, start, date(2026, 1, 31)
+
+
+def main():
+    tasks, courses, date_debut, date_fin = make_inputs()
+    planner = StudyPlanner()
+    now = datetime.combine(date_debut, time.min)
+
+    durations = []
+    for _ in range(RUNS):
+        start = clock.perf_counter()
+        rows, unscheduled = planner.plan(tasks, date_debut, date_fin, courses, now=now)
+        durations.append((clock.perf_counter() - start) * 1000)
+
+    print(f"{N_TASKS} tâches, {len(rows)} sessions, {len(unscheduled)} non planifiées")
+    print(f"médiane {statistics.median(durations):.1f} ms, max {max(durations):.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
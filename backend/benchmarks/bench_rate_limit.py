@@ -0,0 +1,54 @@
+"""
+Benchmark : surcoût du limiteur de débit par requête
+
+Mesure la vérification des limites seule (limiter.check() dans un contexte de
+requête sur PATH, route au coût par défaut), déduction faite du coût du
+contexte de requête, avec les compteurs en mémoire ou dans Redis si
+RATELIMIT_STORAGE_URI / REDIS_URL est défini. L'objectif est un surcoût inférieur à 100 µs par requête.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_rate_limit
+"""
+import os
+import statistics
+import time
+
+REQUESTS = 5000
+RUNS = 5
+
+# Route soumise aux limites (DEFAULT_COST) ; /health et /metrics sont exemptés
+PATH = '/'
+
+
+def per_request_us(app, check=None):
+    """Durée moyenne d'un contexte de requête (et de la vérification)"""
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        with app.test_request_context(PATH, environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            if check:
+                check()
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def main():
+    # Limite assez large pour ne jamais atteindre 429 pendant la mesure
+    os.environ.setdefault('RATELIMIT_DEFAULT', '1000000 per day;1000000 per hour')
+    from benchmarks.common import make_app
+    from app import limiter
+    from app.utils.rate_limit import request_cost
+
+    app = make_app()
+    with app.test_request_context(PATH):
+        if not request_cost():
+            raise SystemExit(f"{PATH} est exempté du limiteur : rien à mesurer")
+
+    baseline = statistics.median(per_request_us(app) for _ in range(RUNS))
+    checked = statistics.median(per_request_us(app, limiter.check) for _ in range(RUNS))
+
+    print(f"stockage {app.config['RATELIMIT_STORAGE_URI']}, stratégie {app.config['RATELIMIT_STRATEGY']}")
+    print(f"contexte seul {baseline:.0f} µs, avec vérification {checked:.0f} µs, "
+          f"surcoût du limiteur {checked - baseline:.0f} µs par requête")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark : nombre de requêtes pour sérialiser un planning
+
+Compare Planning.to_dict() naïf (relation dynamique, N+1) au chargement groupé
+d'app.utils.serialization. Le nombre de requêtes du chemin groupé doit rester
+constant quand le nombre de sessions augmente.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_serialization
+"""
+import sys
+from datetime import date, datetime, time, timedelta
+from benchmarks.common import make_app, QueryCounter, timer
+
+SIZES = [10, 100, 300, 1000]
+
+
+def seed(db, n_sessions):
+    """Créer un utilisateur, des matières, des tâches et un planning de n sessions"""
+    from app.models import User, Subject, Task, Planning, Session
+
+    user = User(nom='Bench', email=f'bench{n_sessions}@example.com', mot_de_passe='x')
+    db.session.add(user)
+    db.session.flush()
+
+    subjects = [Subject(user_id=user.id, titre=f'Matière {i}') for i in range(10)]
+    db.session.add_all(subjects)
+    db.session.flush()
+
+    tasks = [
+        Task(user_id=user.id, subject_id=subjects[i % 10].id, titre=f'Tâche {i}',
+             date_limite=datetime(2026, 1, 1) + timedelta(days=i))
+        for i in range(max(1, n_sessions // 2))
+    ]
+    db.session.add_all(tasks)
+    db.session.flush()
+
+    planning = Planning(user_id=user.id, date_debut=date(2025, 9, 1), date_fin=date(2026, 1, 31))
+    db.session.add(planning)
+    db.session.flush()
+
+    db.session.add_all([
+        Session(planning_id=planning.id, task_id=tasks[i % len(tasks)].id,
+                date=date(2025, 9, 1) + timedelta(days=i % 150),
+                heure_debut=time(14, 0), heure_fin=time(16, 0), matiere='Bench')
+        for i in range(n_sessions)
+    ])
+    db.session.commit()
+    return planning.id
+
+
+def main():
+    app = make_app()
+    from app import db
+    from app.models import Planning
+    from app.utils.serialization import serialize_planning
+
+    eager_counts = []
+    print(f"{'sessions':>8} | {'naïf (req.)':>11} | {'naïf (ms)':>9} | {'groupé (req.)':>13} | {'groupé (ms)':>11}")
+    with app.app_context():
+        for n in SIZES:
+            planning_id = seed(db, n)
+
+            db.session.expunge_all()
+            with QueryCounter(db.engine) as naive, timer() as naive_t:
+                db.session.get(Planning, planning_id).to_dict()
+
+            db.session.expunge_all()
+            with QueryCounter(db.engine) as eager, timer() as eager_t:
+                serialize_planning(planning_id)
+
+            eager_counts.append(eager.count)
+            print(f"{n:>8} | {naive.count:>11} | {naive_t['ms']:>9.1f} | {eager.count:>13} | {eager_t['ms']:>11.1f}")
+
+    if len(set(eager_counts)) != 1:
+        print('ÉCHEC : le nombre de requêtes du chemin groupé dépend du nombre de sessions')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
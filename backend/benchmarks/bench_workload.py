@@ -0,0 +1,100 @@
+"""
+Benchmark : entraînement et inférence du modèle de charge de travail
+
+Génère un historique synthétique (utilisateurs, tâches terminées, sessions),
+entraîne le modèle, puis mesure le chargement en mmap et la prédiction
+groupée des tâches ouvertes d'un utilisateur.
+
+Usage (depuis backend/) :
+    python -m benchmarks.bench_workload
+"""
+import os
+import random
+import statistics
+import tempfile
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import insert
+from benchmarks.common import make_app, timer, QueryCounter
+
+N_USERS = 200
+TASKS_PER_USER = 40
+SESSIONS_PER_TASK = 4
+OPEN_TASKS = 200
+
+
+def populate(db, rng):
+    """Historique synthétique : le temps étudié dépend de la priorité et de l'utilisateur"""
+    from app.models import User, Subject, Task, Planning, Session
+
+    db.session.execute(insert(User), [
+        {'id': u, 'nom': f'u{u}', 'email': f'u{u}@example.com', 'mot_de_passe': 'x'} for u in range(1, N_USERS + 1)
+    ])
+    db.session.execute(insert(Subject), [
+        {'id': u * 10 + k, 'user_id': u, 'titre': f'Matière {k}'} for u in range(1, N_USERS + 1) for k in range(3)
+    ])
+    db.session.execute(insert(Planning), [
+        {'id': u, 'user_id': u, 'date_debut': date(2025, 9, 1), 'date_fin': date(2026, 1, 31), 'actif': True}
+        for u in range(1, N_USERS + 1)
+    ])
+
+    tasks, sessions, task_id = [], [], 0
+    for u in range(1, N_USERS + 1):
+        diligence = rng.uniform(0.5, 1.0)
+        for k in range(TASKS_PER_USER):
+            task_id += 1
+            priorite = rng.choice([1, 3, 5])
+            finished = k < TASKS_PER_USER - 5
+            tasks.append({
+                'id': task_id, 'user_id': u, 'subject_id': u * 10 + k % 3, 'titre': f'Tâche {task_id}',
+                'description': 'x' * rng.randint(0, 400), 'priorite': priorite,
+                'date_limite': datetime(2025, 9, 1) + timedelta(days=rng.randint(7, 140)),
+                'etat': 'terminée' if finished else 'à faire'
+            })
+            for s in range(SESSIONS_PER_TASK + priorite // 2):
+                sessions.append({
+                    'planning_id': u, 'task_id': task_id, 'date': date(2025, 9, 1) + timedelta(days=s),
+                    'heure_debut': time(10, 0), 'heure_fin': time(11, 30),
+                    'completee': finished and rng.random() < diligence
+                })
+    db.session.execute(insert(Task), tasks)
+    db.session.execute(insert(Session), sessions)
+    db.session.commit()
+    return len(tasks), len(sessions)
+
+
+def main():
+    from app import db
+    from app.ml import workload
+    from app.models import Task
+
+    os.environ['WORKLOAD_MODEL_PATH'] = os.path.join(tempfile.mkdtemp(), 'workload.joblib')
+    app = make_app()
+    with app.app_context():
+        n_tasks, n_sessions = populate(db, random.Random(42))
+
+        with timer() as elapsed:
+            result = workload.train()
+        print(f"{n_tasks} tâches, {n_sessions} sessions : entraînement {elapsed['ms']:.0f} ms, {result}")
+
+        with timer() as elapsed:
+            model = workload.WorkloadModel.load(app.config['WORKLOAD_MODEL_PATH'])
+        size = os.path.getsize(app.config['WORKLOAD_MODEL_PATH']) / 1024
+        print(f"chargement mmap {elapsed['ms']:.1f} ms ({size:.0f} Ko)")
+
+        # Tâches ouvertes d'un utilisateur (répétées pour atteindre OPEN_TASKS)
+        tasks = Task.query.filter_by(user_id=1).all()
+        tasks = (tasks * (OPEN_TASKS // len(tasks) + 1))[:OPEN_TASKS]
+        workload.predict_hours(1, tasks)
+
+        durations = []
+        with QueryCounter(db.engine) as counter:
+            for _ in range(20):
+                with timer() as elapsed:
+                    workload.predict_hours(1, tasks)
+                durations.append(elapsed['ms'])
+        print(f"prédiction de {OPEN_TASKS} tâches : médiane {statistics.median(durations):.1f} ms, "
+              f"{counter.count // 20} requêtes SQL par appel")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Outils partagés par les benchmarks (application SQLite, compteur de requêtes)
+"""
+import os
+import time
+from contextlib import contextmanager
+from sqlalchemy import event
+
+
+def make_app(database_url='sqlite://'):
+    """Créer une application sur une base SQLite jetable avec toutes les tables"""
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+class QueryCounter:
+    """Compter les requêtes SQL émises sur un moteur"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+@contextmanager
+def timer():
+    """Mesurer une durée en millisecondes"""
+    result = {'ms': 0.0}
+    start = time.perf_counter()
+    yield result
+    result['ms'] = (time.perf_counter() - start) * 1000
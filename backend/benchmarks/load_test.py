@@ -0,0 +1,110 @@
+"""
+Test de charge HTTP : /health, /api/auth/login et /api/auth/me
+
+Des threads clients envoient des requêtes en boucle pendant une durée fixe
+contre un serveur déjà lancé, puis le script affiche la latence p50/p99 par
+route et le débit total. Un compte de test est créé au premier lancement.
+
+Désactiver la limitation de débit côté serveur pendant la mesure :
+    RATELIMIT_ENABLED=False gunicorn -c gunicorn.conf.py run:app
+
+Usage (depuis backend/) :
+    python -m benchmarks.load_test --url http://localhost:5000 --concurrency 16 --duration 20
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+EMAIL = 'loadtest@example.com'
+PASSWORD = 'LoadTest123'
+
+
+def request(url, method='GET', body=None, token=None):
+    """Envoyer une requête ; renvoie (statut, corps décodé ou None)"""
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            return response.status, json.loads(response.read() or b'null')
+    except urllib.error.HTTPError as e:
+        return e.code, None
+
+
+def login(base_url):
+    """Jeton d'accès du compte de test (créé si nécessaire)"""
+    credentials = {'email': EMAIL, 'password': PASSWORD}
+    request(f'{base_url}/api/auth/register', 'POST', {'nom': 'Charge', 'prenom': 'Test', **credentials})
+    status, body = request(f'{base_url}/api/auth/login', 'POST', credentials)
+    if status != 200:
+        raise SystemExit(f"Connexion impossible ({status}) : limitation de débit active ?")
+    return body['access_token']
+
+
+def scenarios(base_url, token):
+    """Requêtes jouées à tour de rôle par chaque client"""
+    credentials = {'email': EMAIL, 'password': PASSWORD}
+    return [
+        ('/health', lambda: request(f'{base_url}/health')),
+        ('/api/auth/me', lambda: request(f'{base_url}/api/auth/me', token=token)),
+        ('/api/auth/login', lambda: request(f'{base_url}/api/auth/login', 'POST', credentials)),
+    ]
+
+
+def client(plan, deadline, latencies, statuses, lock):
+    index = 0
+    local_latencies = defaultdict(list)
+    local_statuses = Counter()
+    while time.perf_counter() < deadline:
+        name, call = plan[index % len(plan)]
+        index += 1
+        start = time.perf_counter()
+        status, _ = call()
+        local_latencies[name].append((time.perf_counter() - start) * 1000)
+        local_statuses[status] += 1
+    with lock:
+        for name, values in local_latencies.items():
+            latencies[name].extend(values)
+        statuses.update(local_statuses)
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1] if len(values) > 1 else values[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20)
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip('/')
+    plan = scenarios(base_url, login(base_url))
+    latencies, statuses, lock = defaultdict(list), Counter(), threading.Lock()
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(client, plan, deadline, latencies, statuses, lock)
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{args.concurrency} clients, {elapsed:.1f} s, {total} requêtes, {total / elapsed:.0f} req/s")
+    print(f"{'route':<18} {'requêtes':>9} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    for name, values in sorted(latencies.items()):
+        print(f"{name:<18} {len(values):>9} {percentile(values, 50):>9.1f} {percentile(values, 99):>9.1f}")
+    print("statuts :", dict(sorted(statuses.items())))
+
+
+if __name__ == '__main__':
+    main()
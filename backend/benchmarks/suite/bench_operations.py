@@ -0,0 +1,42 @@
+"""
+Benchmarks des opérations principales (connexion, profil, planning,
+notifications, génération de planning)
+"""
+from datetime import timedelta
+
+from scripts.generate_data import NOW, PASSWORD
+
+
+def test_login(benchmark, client, user):
+    response = benchmark(client.post, '/api/auth/login', json={'email': user['email'], 'password': PASSWORD})
+    assert response.status_code == 200
+
+
+def test_me(benchmark, client, headers):
+    response = benchmark(client.get, '/api/auth/me', headers=headers)
+    assert response.status_code == 200
+
+
+def test_planning_serialization(benchmark, client, headers, user):
+    response = benchmark(client.get, f"/api/planning/{user['planning_id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.json['planning']['sessions']
+
+
+def test_notification_listing(benchmark, client, headers):
+    response = benchmark(client.get, '/api/notifications', headers=headers)
+    assert response.status_code == 200
+    assert response.json['notifications']
+
+
+def test_plan_generation(benchmark, app, user):
+    from app.services.planning_service import PlanningService
+
+    def generate_planning():
+        with app.app_context():
+            return PlanningService.generate_planning(
+                user['id'], NOW.date(), NOW.date() + timedelta(days=27), now=NOW
+            )
+
+    result = benchmark.pedantic(generate_planning, rounds=5, warmup_rounds=1)
+    assert result['planning']['sessions']
@@ -0,0 +1,72 @@
+"""
+Fixtures de la suite pytest-benchmark
+
+La base est peuplée une fois par scripts/generate_data.py (si elle est vide)
+puis partagée par tous les benchmarks ; les opérations sont mesurées sur
+l'utilisateur qui a le plus de tâches.
+
+Variables d'environnement :
+    BENCH_DATABASE_URL  Base à utiliser (par défaut SQLite dans un répertoire
+                        temporaire : la suite fonctionne hors ligne)
+    BENCH_USERS         Utilisateurs générés si la base est vide (1000 par défaut)
+
+Usage (depuis backend/) :
+    pytest benchmarks/suite
+    pytest benchmarks/suite --benchmark-autosave     # résultats dans .benchmarks/
+    pytest benchmarks/suite --benchmark-compare      # comparer à la dernière sauvegarde
+    BENCH_DATABASE_URL=postgresql://... pytest benchmarks/suite
+"""
+import os
+
+import pytest
+from sqlalchemy import func, select
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """Application sur la base de benchmark, peuplée si nécessaire"""
+    os.environ['DATABASE_URL'] = (
+        os.getenv('BENCH_DATABASE_URL') or f"sqlite:///{tmp_path_factory.mktemp('bench') / 'bench.db'}"
+    )
+    os.environ['RATELIMIT_ENABLED'] = 'False'
+    from app import create_app, db
+    from app.models import User
+    from scripts.generate_data import generate
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if not db.session.execute(select(func.count(User.id))).scalar():
+            generate(db, int(os.getenv('BENCH_USERS', 1000)))
+    return app
+
+
+@pytest.fixture(scope='session')
+def user(app):
+    """Utilisateur mesuré : celui qui a le plus de tâches, avec son planning actif"""
+    from app import db
+    from app.models import Planning, Task, User
+
+    with app.app_context():
+        user_id = db.session.execute(
+            select(Task.user_id).group_by(Task.user_id).order_by(func.count().desc(), Task.user_id).limit(1)
+        ).scalar()
+        planning_id = db.session.execute(
+            select(Planning.id).where(Planning.user_id == user_id, Planning.actif.is_(True))
+        ).scalar()
+        return {'id': user_id, 'email': db.session.get(User, user_id).email, 'planning_id': planning_id}
+
+
+@pytest.fixture(scope='session')
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope='session')
+def headers(client, user):
+    """En-têtes d'authentification de l'utilisateur mesuré"""
+    from scripts.generate_data import PASSWORD
+
+    response = client.post('/api/auth/login', json={'email': user['email'], 'password': PASSWORD})
+    assert response.status_code == 200, response.json
+    return {'Authorization': f"Bearer {response.json['access_token']}"}
@@ -0,0 +1,93 @@
+"""
+Configuration gunicorn (serveur de production)
+
+Usage :
+    gunicorn -c gunicorn.conf.py run:app
+
+L'application est chargée une seule fois dans le processus maître
+(preload_app) puis partagée par copie sur écriture avec les workers. Chaque
+worker recrée ses connexions à la base après le fork, avec un pool SQLAlchemy
+dimensionné sur son nombre de threads.
+
+Variables d'environnement :
+    PORT                 Port d'écoute (5000)
+    GUNICORN_WORKERS     Nombre de processus (2 × CPU + 1)
+    GUNICORN_THREADS     Threads par worker gthread (4)
+    GUNICORN_WORKER_CLASS  gthread (défaut) ou gevent si installé
+    GUNICORN_TIMEOUT     Délai avant redémarrage d'un worker bloqué (30 s)
+    PASSWORD_HASH_WORKERS  Threads de hachage par worker (CPU ÷ workers, au moins 1)
+    PROMETHEUS_MULTIPROC_DIR  Répertoire des mesures partagées entre workers
+                         (/tmp/prometheus-<port>), vidé au démarrage
+"""
+import multiprocessing
+import os
+import shutil
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# Une connexion par thread, plus une marge pour les pics
+os.environ.setdefault('DB_POOL_SIZE', str(threads))
+os.environ.setdefault('DB_MAX_OVERFLOW', str(threads))
+
+# Pool de hachage propre à chaque worker : les cœurs sont répartis entre workers
+# (au moins un thread par worker) pour qu'un pic de connexions ne les dépasse pas
+os.environ.setdefault('PASSWORD_HASH_WORKERS', str(max(1, multiprocessing.cpu_count() // workers)))
+
+# Mesures Prometheus agrégées entre workers (à définir avant le chargement de l'app)
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', f"/tmp/prometheus-{os.getenv('PORT', '5000')}")
+
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recycler les workers régulièrement (fuites mémoire des bibliothèques PDF)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info')
+
+
+def _dispose_engine(close):
+    from app import db
+    from run import app
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=close)
+
+
+def on_starting(server):
+    """Repartir d'un répertoire de mesures vide (fichiers d'une exécution précédente)"""
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+
+def post_fork(server, worker):
+    """
+    Ne pas réutiliser dans le worker les connexions ouvertes par le maître, et
+    lancer les vérifications de santé avant la première sonde /health/ready
+    """
+    from app.utils.health import health
+
+    _dispose_engine(close=False)
+    health.start()
+
+
+def worker_exit(server, worker):
+    """Fermer proprement les connexions à la base à l'arrêt du worker"""
+    _dispose_engine(close=True)
+
+
+def child_exit(server, worker):
+    """Retirer les mesures propres à un worker arrêté"""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,47 @@
+"""Index composites des listes paginées par curseur
+
+Les tables sont créées par database/schema.sql (ou db.create_all()) ; cette
+première révision ajoute les index (colonnes de filtre, puis colonnes de
+tri) utilisés par TaskService.list_tasks, SubjectService.list_subjects,
+PlanningService.list_sessions et NotificationService.list_notifications.
+
+Sur PostgreSQL, les index sont créés avec CREATE INDEX CONCURRENTLY (hors
+transaction) pour ne pas bloquer les écritures ; IF NOT EXISTS rend la
+migration sans effet sur une base déjà initialisée avec schema.sql.
+
+Revision ID: 0001_list_indexes
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_list_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('idx_tasks_user_date_limite', 'tasks', ['user_id', 'date_limite', 'id']),
+    ('idx_tasks_user_etat_date_limite', 'tasks', ['user_id', 'etat', 'date_limite', 'id']),
+    ('idx_tasks_user_subject_date_limite', 'tasks', ['user_id', 'subject_id', 'date_limite', 'id']),
+    ('idx_subjects_user_titre', 'subjects', ['user_id', 'titre', 'id']),
+    ('idx_sessions_planning_date', 'sessions', ['planning_id', 'date', 'heure_debut', 'id']),
+    ('idx_notifications_user_created', 'notifications', ['user_id', 'created_at', 'id']),
+    ('idx_notifications_user_lue_created', 'notifications', ['user_id', 'lue', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _columns in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
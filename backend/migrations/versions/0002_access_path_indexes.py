@@ -0,0 +1,85 @@
+"""Index des clés étrangères et index partiels des accès fréquents
+
+Index ajoutés :
+- clés étrangères sans index : sessions.task_id, courses.schedule_id,
+  plannings.user_id (avec le tri date_debut de load_plannings),
+  schedules.user_id (avec le tri date_import de la liste) ;
+- index partiels, limités aux lignes réellement lues :
+  notifications non lues (compteur et liste), planning actif d'un
+  utilisateur, tâches ouvertes et sessions non complétées (balayage des
+  rappels) ;
+- notifications par date d'envoi (notifications récentes, dédoublonnage
+  des rappels).
+
+Index supprimés, couverts par le préfixe d'un index composite :
+tasks(user_id), sessions(planning_id), notifications(user_id), ainsi que
+notifications(lue) (booléen peu sélectif) et (user_id, lue, created_at, id),
+remplacé par l'index partiel des non lues. Chaque index supprimé l'est sous
+son nom de schema.sql (idx_*) et sous celui de db.create_all() (ix_*).
+
+Les requêtes concernées sont vérifiées par scripts/audit_query_plans.py.
+
+Revision ID: 0002_access_path_indexes
+Revises: 0001_list_indexes
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_access_path_indexes'
+down_revision = '0001_list_indexes'
+branch_labels = None
+depends_on = None
+
+
+def where(postgresql, sqlite):
+    """Condition d'un index partiel, écrite comme dans les requêtes de chaque dialecte"""
+    return {'postgresql_where': sa.text(postgresql), 'sqlite_where': sa.text(sqlite)}
+
+
+INDEXES = [
+    ('idx_sessions_task_id', 'sessions', ['task_id'], {}),
+    ('idx_courses_schedule_id', 'courses', ['schedule_id'], {}),
+    ('idx_plannings_user_date_debut', 'plannings', ['user_id', 'date_debut', 'id'], {}),
+    ('idx_schedules_user_date_import', 'schedules', ['user_id', 'date_import'], {}),
+    ('idx_plannings_user_actif', 'plannings', ['user_id', 'id'], where('actif IS true', 'actif IS 1')),
+    ('idx_notifications_user_unread', 'notifications', ['user_id', 'created_at', 'id'],
+     where('lue IS false', 'lue IS 0')),
+    ('idx_notifications_user_date_envoi', 'notifications', ['user_id', 'date_envoi', 'id'], {}),
+    ('idx_tasks_open_date_limite', 'tasks', ['date_limite', 'id'],
+     where("etat <> 'terminée'", "etat != 'terminée'")),
+    ('idx_sessions_pending_date', 'sessions', ['date', 'id'], where('completee IS false', 'completee IS 0')),
+]
+
+# Index redondants : (nom, table, colonnes) sous leurs noms schema.sql et create_all()
+REDUNDANT = [
+    ('idx_tasks_user_id', 'tasks', ['user_id']),
+    ('ix_tasks_user_id', 'tasks', ['user_id']),
+    ('idx_sessions_planning_id', 'sessions', ['planning_id']),
+    ('ix_sessions_planning_id', 'sessions', ['planning_id']),
+    ('idx_notifications_user_id', 'notifications', ['user_id']),
+    ('ix_notifications_user_id', 'notifications', ['user_id']),
+    ('idx_notifications_lue', 'notifications', ['lue']),
+    ('ix_notifications_lue', 'notifications', ['lue']),
+    ('idx_notifications_user_lue_created', 'notifications', ['user_id', 'lue', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True, **options)
+        for name, table, _columns in REDUNDANT:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT:
+            if name.startswith('idx_'):
+                op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        for name, table, _columns, _options in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,106 @@
+"""Colonnes updated_at, traces de suppression et index de la synchronisation
+
+Ajouts pour /api/sync (SyncService) :
+- colonne updated_at sur subjects, schedules, courses, plannings, sessions
+  et notifications (users et tasks l'ont déjà), initialisée à la date de
+  création de chaque ligne (date d'import de l'emploi du temps pour
+  schedules et courses) ;
+- table deletions : une trace par ligne supprimée (entité, ID, date),
+  purgée après SYNC_TOMBSTONE_DAYS jours ;
+- index (propriétaire, updated_at, id) de chaque entité, et
+  (user_id, deleted_at, id) des traces : une synchronisation sans
+  changement ne lit que la fin de ces index.
+
+courses(schedule_id) est remplacé par courses(schedule_id, updated_at, id),
+qui le couvre par son préfixe.
+
+Revision ID: 0003_sync_updated_at
+Revises: 0002_access_path_indexes
+Create Date: 2026-10-18 21:00:00
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_sync_updated_at'
+down_revision = '0002_access_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+# Table -> valeur initiale de updated_at
+BACKFILL = {
+    'subjects': 'created_at',
+    'schedules': 'date_import',
+    'courses': '(SELECT date_import FROM schedules WHERE schedules.id = courses.schedule_id)',
+    'plannings': 'created_at',
+    'sessions': 'created_at',
+    'notifications': 'created_at',
+}
+
+INDEXES = [
+    ('idx_subjects_user_updated', 'subjects', ['user_id', 'updated_at', 'id']),
+    ('idx_tasks_user_updated', 'tasks', ['user_id', 'updated_at', 'id']),
+    ('idx_schedules_user_updated', 'schedules', ['user_id', 'updated_at', 'id']),
+    ('idx_courses_schedule_updated', 'courses', ['schedule_id', 'updated_at', 'id']),
+    ('idx_plannings_user_updated', 'plannings', ['user_id', 'updated_at', 'id']),
+    ('idx_sessions_planning_updated', 'sessions', ['planning_id', 'updated_at', 'id']),
+    ('idx_notifications_user_updated', 'notifications', ['user_id', 'updated_at', 'id']),
+]
+
+# Index couvert par le préfixe de idx_courses_schedule_updated
+REDUNDANT = [
+    ('idx_courses_schedule_id', 'courses', ['schedule_id']),
+]
+
+
+def create_deletions():
+    op.create_table(
+        'deletions',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('entity', sa.String(30), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('idx_deletions_user_deleted', 'deletions', ['user_id', 'deleted_at', 'id'])
+    op.create_index('idx_deletions_deleted_at', 'deletions', ['deleted_at'])
+
+
+def upgrade():
+    # Tables déjà à jour si la base a été créée par schema.sql ou db.create_all()
+    inspector = sa.inspect(op.get_bind())
+    for table, source in BACKFILL.items():
+        if any(column['name'] == 'updated_at' for column in inspector.get_columns(table)):
+            continue
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute(
+            sa.text(f"UPDATE {table} SET updated_at = COALESCE({source}, :now)")
+            .bindparams(now=datetime.utcnow())
+        )
+
+    if not inspector.has_table('deletions'):
+        create_deletions()
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        for name, table, _columns in REDUNDANT:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        for name, table, _columns in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+    op.drop_table('deletions')
+    for table in BACKFILL:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column('updated_at')
@@ -0,0 +1,33 @@
+"""Nonce des jetons du flux iCalendar
+
+users.calendar_nonce : secret signé avec l'ID de l'utilisateur dans les
+jetons des URL .ics (CalendarService), créé à la première demande d'URL et
+remplacé par POST /api/calendar/token pour révoquer les URL déjà données.
+Les jetons émis avant cette révision (ID seul) ne sont plus acceptés.
+
+Revision ID: 0004_calendar_nonce
+Revises: 0003_sync_updated_at
+Create Date: 2026-10-18 23:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_calendar_nonce'
+down_revision = '0003_sync_updated_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Colonne déjà présente si la base a été créée par schema.sql ou db.create_all()
+    inspector = sa.inspect(op.get_bind())
+    if not any(column['name'] == 'calendar_nonce' for column in inspector.get_columns('users')):
+        op.add_column('users', sa.Column('calendar_nonce', sa.String(32), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch:
+        batch.drop_column('calendar_nonce')
@@ -0,0 +1,69 @@
+"""Tables des statistiques précalculées
+
+daily_stats (sessions par utilisateur, jour et matière) et task_stats (tâches
+par utilisateur, jour d'échéance et priorité), lues par /api/statistics et
+tenues à jour par StatisticsService. Leur clé primaire composite est la clé
+d'unicité utilisée par les mises à jour incrémentales (INSERT ... ON
+CONFLICT).
+
+Les tables sont créées vides : lancer une fois le recalcul complet après la
+mise à jour (tâche Celery statistics.rebuild, sinon exécutée chaque nuit),
+qui remplace aussi les agrégats écrits entre-temps par les mises à jour
+incrémentales.
+
+    celery -A worker.celery call statistics.rebuild
+
+Revision ID: 0005_statistics_tables
+Revises: 0004_calendar_nonce
+Create Date: 2026-10-19 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_statistics_tables'
+down_revision = '0004_calendar_nonce'
+branch_labels = None
+depends_on = None
+
+
+def create_daily_stats():
+    op.create_table(
+        'daily_stats',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('jour', sa.Date(), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sessions_planifiees', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sessions_completees', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('minutes_planifiees', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('minutes_etudiees', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'jour', 'subject_id'),
+    )
+
+
+def create_task_stats():
+    op.create_table(
+        'task_stats',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('jour', sa.Date(), nullable=False),
+        sa.Column('priorite', sa.Integer(), nullable=False),
+        sa.Column('taches_ouvertes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('taches_terminees', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('user_id', 'jour', 'priorite'),
+    )
+
+
+def upgrade():
+    # Tables déjà présentes si la base a été créée par schema.sql ou db.create_all()
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('daily_stats'):
+        create_daily_stats()
+    if not inspector.has_table('task_stats'):
+        create_task_stats()
+
+
+def downgrade():
+    op.drop_table('task_stats')
+    op.drop_table('daily_stats')
@@ -1,5 +1,11 @@
 """
 Point d'entrée de l'application Flask
+
+En production, l'application est servie par gunicorn :
+    gunicorn -c gunicorn.conf.py run:app
+
+`python run.py` lance le serveur de développement Werkzeug (DEBUG=True pour
+le rechargement automatique).
 """
 from app import create_app
 import os
@@ -7,11 +13,11 @@ import os
 app = create_app()
 
 if __name__ == '__main__':
-    port = int(os.getenv('PORT', 5001))  
-    debug = os.getenv('DEBUG', 'True') == 'True'
-    
+    port = int(os.getenv('PORT', 5001))
+    debug = os.getenv('DEBUG', 'False') == 'True'
+
     app.run(
         host='0.0.0.0',
         port=port,
         debug=debug
-    )
\ No newline at end of file
+    )
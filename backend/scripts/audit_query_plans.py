@@ -0,0 +1,206 @@
+"""
+Audit des plans d'exécution des requêtes représentatives
+
+Les appels de service les plus fréquents (listes paginées, tableau de bord,
+planification, balayage des rappels...) sont exécutés sur une base peuplée ;
+leurs requêtes SELECT sont capturées puis passées à EXPLAIN. Le script
+échoue (code de sortie 1) si l'une d'elles parcourt une table entière.
+
+- PostgreSQL : EXPLAIN (FORMAT JSON) avec enable_seqscan = off, pour que
+  seul un index inutilisable laisse un « Seq Scan » même sur une petite
+  base ; un parcours d'index sans condition (« Index Scan » sans Index Cond)
+  est aussi signalé.
+- SQLite : EXPLAIN QUERY PLAN ; une étape « SCAN <table> » est un parcours
+  complet (avec ou sans index).
+
+Une base vide est d'abord peuplée par scripts/generate_data.py (--users).
+
+Usage (depuis backend/) :
+    python -m scripts.audit_query_plans
+    DATABASE_URL=postgresql://... python -m scripts.audit_query_plans --users 500
+"""
+import argparse
+import os
+import re
+import sys
+from datetime import timedelta
+
+from sqlalchemy import event, func, select, text
+
+from scripts.generate_data import NOW, generate
+
+# Étapes SQLite qui ne lisent pas une table
+_SQLITE_SCAN = re.compile(r'^SCAN (?!CONSTANT ROW|\d+ CONSTANT ROWS|\()(\S+)')
+
+
+def representative_calls(user_id):
+    """(nom, appel) des lectures à auditer pour un utilisateur"""
+    from app import db
+    from app.ml import workload
+    from app.models import Planning, Schedule, Session, Task, User
+    from app.services.notification_service import NotificationService
+    from app.services.planning_service import PlanningService
+    from app.services.schedule_service import ScheduleService
+    from app.services.statistics_service import StatisticsService
+    from app.services.subject_service import SubjectService
+    from app.services.sync_service import SyncService
+    from app.services.task_service import TaskService
+
+    task_id = db.session.execute(select(func.min(Task.id)).where(Task.user_id == user_id)).scalar()
+    subject_id = db.session.execute(select(Task.subject_id).where(Task.id == task_id)).scalar()
+    schedule_id = db.session.execute(select(func.min(Schedule.id)).where(Schedule.user_id == user_id)).scalar()
+    email = db.session.get(User, user_id).email
+
+    def next_page(list_page):
+        return lambda: list_page(cursor=list_page()['next_cursor'])
+
+    def unread_summary():
+        NotificationService._invalidate_many([user_id])
+        return NotificationService.get_unread_summary(user_id)
+
+    def reminders():
+        for rows in NotificationService._session_reminders(NOW, timedelta(hours=1)):
+            NotificationService._without_duplicates(rows)
+        for rows in NotificationService._task_reminders(NOW, timedelta(hours=1)):
+            NotificationService._without_duplicates(rows)
+
+    return [
+        ('connexion (email)', lambda: User.query.filter_by(email=email).first()),
+        ('tâches par échéance', next_page(lambda cursor=None: TaskService.list_tasks(user_id, limit=10, cursor=cursor))),
+        ('tâches par état', lambda: TaskService.list_tasks(user_id, etat='à faire')),
+        ('tâches par matière', lambda: TaskService.list_tasks(user_id, subject_id=subject_id)),
+        ('matières', next_page(lambda cursor=None: SubjectService.list_subjects(user_id, limit=2, cursor=cursor))),
+        ('sessions du planning actif', next_page(
+            lambda cursor=None: PlanningService.list_sessions(user_id, limit=10, cursor=cursor)
+        )),
+        ('plannings et sessions', lambda: PlanningService.get_user_plannings(user_id)),
+        ('cours de l\'utilisateur', lambda: PlanningService._user_courses(user_id)),
+        ('emplois du temps', lambda: ScheduleService.get_user_schedules(user_id)),
+        ('emploi du temps et cours', lambda: ScheduleService.get_schedule(user_id, schedule_id)),
+        ('sessions d\'une tâche', lambda: db.session.execute(
+            select(Session.id).where(Session.task_id == task_id)
+        ).all()),
+        ('notifications', next_page(
+            lambda cursor=None: NotificationService.list_notifications(user_id, limit=10, cursor=cursor)
+        )),
+        ('notifications non lues', lambda: NotificationService.list_notifications(user_id, lue=False)),
+        ('compteur et récentes', unread_summary),
+        ('tableau de bord', lambda: StatisticsService.get_dashboard(user_id, today=NOW.date())),
+        ('agrégats (reconstruction)', lambda: (
+            StatisticsService._session_frame([user_id]), StatisticsService._task_frame([user_id])
+        )),
+        ('historique de charge', lambda: (
+            workload._task_frame(Task.user_id == user_id), workload._session_frame(Planning.user_id == user_id)
+        )),
+        ('balayage des rappels', reminders),
+        ('synchronisation incrémentale', lambda: SyncService.sync(
+            user_id, SyncService.sync(user_id, now=NOW)['cursors'], now=NOW
+        )),
+    ]
+
+
+class QueryRecorder:
+    """Capturer les requêtes SELECT émises sur un moteur"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.queries = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            self.queries.append((statement, parameters))
+
+    def __enter__(self):
+        self.queries = []
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def _postgresql_problems(node):
+    """Parcours complets d'un plan JSON PostgreSQL"""
+    problems = []
+    node_type = node.get('Node Type')
+    if node_type == 'Seq Scan':
+        problems.append(f"Seq Scan sur {node.get('Relation Name')}")
+    elif node_type in ('Index Scan', 'Index Only Scan') and 'Index Cond' not in node:
+        problems.append(f"parcours complet de l'index {node.get('Index Name')}")
+    for child in node.get('Plans', []):
+        problems.extend(_postgresql_problems(child))
+    return problems
+
+
+def explain(connection, statement, parameters):
+    """
+    Plan d'une requête et parcours complets qu'il contient
+
+    Returns:
+        tuple: (résumé du plan, liste des problèmes)
+    """
+    if connection.dialect.name == 'postgresql':
+        plan = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()[0]['Plan']
+        return plan['Node Type'], _postgresql_problems(plan)
+
+    steps = [row[3] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+    problems = [step for step in steps if _SQLITE_SCAN.match(step)]
+    return ' ; '.join(steps), problems
+
+
+def audit(db, user_id):
+    """
+    Exécuter les appels représentatifs et vérifier le plan de chaque requête
+
+    Returns:
+        int: Nombre de requêtes avec un parcours complet
+    """
+    failures = 0
+    connection = db.session.connection()
+    if connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql('SET enable_seqscan = off')
+
+    for name, call in representative_calls(user_id):
+        with QueryRecorder(db.engine) as recorder:
+            call()
+        seen = set()
+        for statement, parameters in recorder.queries:
+            if statement in seen:
+                continue
+            seen.add(statement)
+            summary, problems = explain(connection, statement, parameters)
+            failures += bool(problems)
+            status = 'SCAN' if problems else 'OK'
+            print(f"{status:<5}{name:<30}{' ; '.join(problems) or summary}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit des plans d'exécution (échoue sur un parcours complet)")
+    parser.add_argument('--users', type=int, default=200, help="Utilisateurs générés si la base est vide")
+    args = parser.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+    from app import create_app, db
+    from app.models import Task, User
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if not db.session.execute(select(func.count(User.id))).scalar():
+            generate(db, args.users)
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+
+        # Utilisateur le plus chargé
+        user_id = db.session.execute(
+            select(Task.user_id).group_by(Task.user_id).order_by(func.count().desc()).limit(1)
+        ).scalar()
+        failures = audit(db, user_id)
+
+    print(f"\n{failures} requête(s) avec un parcours complet" if failures else "\nAucun parcours complet")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+"""
+Générateur de données synthétiques à grande échelle
+
+Crée N utilisateurs avec des volumes réalistes de matières, emploi du temps
+(cours), tâches, plannings, sessions d'étude et notifications. Les IDs sont
+attribués ici, à la suite des IDs existants, ce qui permet de relier les
+lignes sans aller-retour avec la base ; chaque lot d'utilisateurs est chargé
+table par table :
+
+- PostgreSQL : COPY ... FROM STDIN, puis recalage des séquences ;
+- SQLite : executemany direct sur le curseur, valeurs converties colonne
+  par colonne ;
+- autres bases : INSERT groupé SQLAlchemy (executemany).
+
+(voir app/utils/bulk.py)
+
+Sur une base vide, les index secondaires sont supprimés pendant le
+chargement puis reconstruits en une fois.
+
+Tous les utilisateurs ont le mot de passe PASSWORD (haché une seule fois).
+Les agrégats statistiques sont reconstruits à la fin (--skip-statistics pour
+s'en passer).
+
+Usage (depuis backend/) :
+    python -m scripts.generate_data --users 5000
+    DATABASE_URL=postgresql://... python -m scripts.generate_data --users 20000
+"""
+import argparse
+import os
+import random
+import time as clock
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import func, select, text
+
+# Mot de passe de tous les utilisateurs générés
+PASSWORD = 'motdepasse'
+
+# Instant de référence (fixe pour que les benchmarks restent comparables)
+NOW = datetime(2026, 3, 2, 8, 0)
+
+# Utilisateurs générés et chargés par lot
+BATCH_USERS = 500
+
+JOURS = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi']
+MATIERES = [
+    'Mathématiques', 'Physique', 'Chimie', 'Informatique', 'Anglais', 'Économie',
+    'Histoire', 'Biologie', 'Statistiques', 'Philosophie', 'Droit', 'Gestion'
+]
+NIVEAUX = ['Licence 1', 'Licence 2', 'Licence 3', 'Master 1', 'Master 2']
+COULEURS = ['#0ea5e9', '#f97316', '#22c55e', '#a855f7', '#ef4444', '#eab308']
+ETATS = ['à faire', 'en cours', 'terminée']
+
+# Colonnes de chaque table, dans l'ordre des tuples générés (et ordre de chargement)
+COLUMNS = {
+    'users': ('id', 'nom', 'prenom', 'email', 'mot_de_passe', 'niveau', 'langue', 'created_at', 'updated_at'),
+    'subjects': ('id', 'user_id', 'titre', 'description', 'couleur', 'created_at', 'updated_at'),
+    'schedules': ('id', 'user_id', 'fichier_pdf', 'date_import', 'updated_at'),
+    'courses': ('id', 'schedule_id', 'jour', 'heure_debut', 'heure_fin', 'matiere', 'salle', 'enseignant',
+                'updated_at'),
+    'tasks': ('id', 'user_id', 'subject_id', 'titre', 'description', 'date_limite', 'priorite', 'etat',
+              'created_at', 'updated_at'),
+    'plannings': ('id', 'user_id', 'titre', 'date_debut', 'date_fin', 'actif', 'created_at', 'updated_at'),
+    'sessions': ('id', 'planning_id', 'task_id', 'date', 'heure_debut', 'heure_fin', 'matiere', 'description',
+                 'completee', 'created_at', 'updated_at'),
+    'notifications': ('id', 'user_id', 'type', 'message', 'date_envoi', 'lue', 'created_at', 'updated_at'),
+}
+TABLES = list(COLUMNS)
+
+
+class Generator:
+    """Lignes synthétiques d'un lot d'utilisateurs, en tuples ordonnés selon COLUMNS"""
+
+    def __init__(self, next_ids, password_hash, rng, now=NOW):
+        self.ids = dict(next_ids)
+        self.password_hash = password_hash
+        self.rng = rng
+        self.now = now
+
+    def _id(self, table):
+        self.ids[table] += 1
+        return self.ids[table]
+
+    def _between(self, low, high):
+        """Entier aléatoire entre low et high inclus (plus rapide que randint)"""
+        return low + int(self.rng.random() * (high - low + 1))
+
+    def _pick(self, values):
+        """Élément aléatoire d'une séquence (plus rapide que choice)"""
+        return values[int(self.rng.random() * len(values))]
+
+    def batch(self, n_users):
+        """
+        Générer les lignes de n_users utilisateurs
+
+        Returns:
+            dict: {table: [tuples de valeurs]}
+        """
+        rows = {table: [] for table in TABLES}
+        for _ in range(n_users):
+            self._user(rows)
+        return rows
+
+    def _user(self, rows):
+        rng, now = self.rng, self.now
+        today = now.date()
+        user_id = self._id('users')
+        created_at = now - timedelta(days=self._between(60, 400))
+        rows['users'].append((
+            user_id, f'Étudiant {user_id}', 'Test', f'etudiant{user_id}@example.com', self.password_hash,
+            self._pick(NIVEAUX), 'fr', created_at, created_at
+        ))
+
+        subjects = []
+        for titre in rng.sample(MATIERES, self._between(4, 8)):
+            subject_id = self._id('subjects')
+            subjects.append((subject_id, titre))
+            rows['subjects'].append((
+                subject_id, user_id, titre, f'Cours de {titre}', self._pick(COULEURS), created_at, created_at
+            ))
+
+        schedule_id = self._id('schedules')
+        rows['schedules'].append((schedule_id, user_id, f'edt_{user_id}.pdf', created_at, created_at))
+        for jour in JOURS:
+            for heure in sorted(rng.sample(range(8, 18, 2), self._between(2, 5))):
+                rows['courses'].append((
+                    self._id('courses'), schedule_id, jour, time(heure), time(heure + 2),
+                    self._pick(subjects)[1], f'B{self._between(100, 420)}', f'Enseignant {self._between(1, 80)}',
+                    created_at
+                ))
+
+        tasks = []
+        for k in range(self._between(20, 60)):
+            subject_id, titre = self._pick(subjects)
+            date_limite = now + timedelta(hours=self._between(-60 * 24, 90 * 24))
+            etat = 'terminée' if date_limite < now and rng.random() < 0.8 else self._pick(ETATS[:2])
+            task_id = self._id('tasks')
+            tasks.append((task_id, titre, date_limite.date()))
+            rows['tasks'].append((
+                task_id, user_id, subject_id, f'{titre} : devoir {k + 1}',
+                'Réviser le chapitre ' * self._between(1, 6), date_limite, self._pick([1, 3, 3, 5]), etat,
+                date_limite - timedelta(days=self._between(7, 30)), now
+            ))
+
+        # Plannings successifs de quatre semaines, le dernier est actif
+        n_plannings = self._between(1, 3)
+        for k in range(n_plannings):
+            planning_id = self._id('plannings')
+            date_debut = today - timedelta(days=28 * (n_plannings - k) - 14)
+            date_fin = date_debut + timedelta(days=27)
+            planned_at = datetime.combine(date_debut, time(7))
+            rows['plannings'].append((
+                planning_id, user_id, f'Planning {k + 1}', date_debut, date_fin, k == n_plannings - 1,
+                planned_at, planned_at
+            ))
+            for task_id, titre, jour_limite in tasks:
+                if not date_debut <= jour_limite <= date_fin + timedelta(days=14):
+                    continue
+                for _ in range(self._between(1, 4)):
+                    jour = date_debut + timedelta(days=self._between(0, 27))
+                    heure = self._pick([8, 10, 14, 16, 18, 20])
+                    rows['sessions'].append((
+                        self._id('sessions'), planning_id, task_id, jour, time(heure), time(heure + 1, 30),
+                        titre, 'Révision', jour < today and rng.random() < 0.75, planned_at, planned_at
+                    ))
+
+        for _ in range(self._between(20, 80)):
+            sent = now - timedelta(minutes=self._between(0, 60 * 24 * 60))
+            rows['notifications'].append((
+                self._id('notifications'), user_id, self._pick(['rappel', 'rappel', 'alerte', 'conseil']),
+                'Session d\'étude à venir', sent, sent < now - timedelta(days=2) or rng.random() < 0.5, sent, sent
+            ))
+
+
+def load(db, rows):
+    """Charger les lignes d'un lot, table par table, dans une transaction"""
+    from app.utils.bulk import bulk_insert
+
+    connection = db.session.connection()
+    for name in TABLES:
+        bulk_insert(connection, db.metadata.tables[name], COLUMNS[name], rows[name])
+    db.session.commit()
+
+
+@contextmanager
+def deferred_indexes(db, enabled=True):
+    """
+    Supprimer les index secondaires non uniques pendant un chargement initial
+
+    Construire un index en une fois après le chargement est bien plus rapide
+    que de le maintenir ligne par ligne. Seuls les index déclarés sur les
+    modèles sont concernés ; ils sont recréés même en cas d'erreur.
+    """
+    indexes = [
+        index for name in TABLES for index in db.metadata.tables[name].indexes if not index.unique
+    ] if enabled else []
+    connection = db.session.connection()
+    for index in indexes:
+        index.drop(connection, checkfirst=True)
+    db.session.commit()
+    try:
+        yield
+    finally:
+        db.session.rollback()
+        connection = db.session.connection()
+        for index in indexes:
+            index.create(connection, checkfirst=True)
+        db.session.commit()
+
+
+def _next_ids(db):
+    """Dernier ID de chaque table"""
+    return {
+        table: db.session.execute(select(func.coalesce(func.max(db.metadata.tables[table].c.id), 0))).scalar()
+        for table in TABLES
+    }
+
+
+def _reset_sequences(db):
+    """Recaler les séquences PostgreSQL après un chargement avec IDs explicites"""
+    if db.session.connection().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        ))
+    db.session.commit()
+
+
+def generate(db, n_users, seed=42, now=NOW, statistics=True, batch_users=BATCH_USERS):
+    """
+    Générer et charger n_users utilisateurs avec leurs données
+
+    Args:
+        db: Instance SQLAlchemy (dans un contexte d'application)
+        n_users: Nombre d'utilisateurs
+        seed: Graine du générateur aléatoire
+        now: Instant de référence des dates générées
+        statistics: Reconstruire les agrégats des nouveaux utilisateurs
+        batch_users: Utilisateurs par lot
+
+    Returns:
+        dict: Nombre de lignes chargées par table
+    """
+    from app.services.statistics_service import StatisticsService
+    from app.utils.hashers import hash_password
+
+    start_ids = _next_ids(db)
+    generator = Generator(start_ids, hash_password(PASSWORD), random.Random(seed), now)
+    counts = {table: 0 for table in TABLES}
+
+    with deferred_indexes(db, enabled=not any(start_ids.values())):
+        remaining = n_users
+        while remaining > 0:
+            rows = generator.batch(min(batch_users, remaining))
+            load(db, rows)
+            for table in TABLES:
+                counts[table] += len(rows[table])
+            remaining -= batch_users
+
+    _reset_sequences(db)
+    if statistics:
+        StatisticsService.rebuild(list(range(start_ids['users'] + 1, generator.ids['users'] + 1)))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générer des données synthétiques")
+    parser.add_argument('--users', type=int, default=1000, help="Nombre d'utilisateurs à créer")
+    parser.add_argument('--seed', type=int, default=42, help="Graine du générateur aléatoire")
+    parser.add_argument('--skip-statistics', action='store_true', help="Ne pas reconstruire les agrégats")
+    args = parser.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///generated.db')
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        from app.services.statistics_service import StatisticsService
+
+        db.create_all()
+        first_user = _next_ids(db)['users'] + 1
+        start = clock.perf_counter()
+        counts = generate(db, args.users, seed=args.seed, statistics=False)
+        elapsed = clock.perf_counter() - start
+
+        total = sum(counts.values())
+        for table, count in counts.items():
+            print(f"{table:<14}{count:>10}")
+        print(f"{'total':<14}{total:>10} lignes en {elapsed:.1f} s ({total / elapsed:,.0f} lignes/s)")
+
+        if not args.skip_statistics:
+            start = clock.perf_counter()
+            StatisticsService.rebuild(list(range(first_user, first_user + args.users)))
+            print(f"agrégats statistiques reconstruits en {clock.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
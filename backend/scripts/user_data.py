@@ -0,0 +1,68 @@
+"""
+Export et import des données d'un utilisateur en ligne de commande
+
+Même format que GET /api/export et POST /api/export/import (voir
+app/services/export_service.py). Un fichier se terminant par .gz est
+compressé (export) ou décompressé (import) ; « - » désigne la sortie ou
+l'entrée standard.
+
+Usage (depuis backend/) :
+    python -m scripts.user_data export --user-id 42 --output export-42.ndjson.gz
+    python -m scripts.user_data import --user-id 7 --input export-42.ndjson.gz
+"""
+import argparse
+import gzip
+import sys
+
+
+def export_user(user_id, output):
+    from app.services.export_service import ExportService
+
+    compress = output.endswith('.gz')
+    target = sys.stdout.buffer if output == '-' else open(output, 'wb')
+    try:
+        for chunk in ExportService.stream_export(user_id, compress=compress):
+            target.write(chunk)
+    finally:
+        if target is not sys.stdout.buffer:
+            target.close()
+
+
+def import_user(user_id, path):
+    from app.services.export_service import ExportService
+
+    if path == '-':
+        source = sys.stdin.buffer
+    elif path.endswith('.gz'):
+        source = gzip.open(path, 'rb')
+    else:
+        source = open(path, 'rb')
+    with source:
+        return ExportService.import_records(user_id, source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export et import des données d'un utilisateur")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help="Exporter les données d'un utilisateur")
+    export_parser.add_argument('--user-id', type=int, required=True)
+    export_parser.add_argument('--output', default='-', help="Fichier de sortie (.ndjson ou .ndjson.gz)")
+    import_parser = commands.add_parser('import', help="Importer un export dans le compte d'un utilisateur")
+    import_parser.add_argument('--user-id', type=int, required=True)
+    import_parser.add_argument('--input', default='-', help="Fichier d'export (.ndjson ou .ndjson.gz)")
+    args = parser.parse_args()
+
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        if args.command == 'export':
+            export_user(args.user_id, args.output)
+        else:
+            counts = import_user(args.user_id, args.input)
+            for table, count in counts.items():
+                print(f"{table:<14}{count:>10}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+"""
+Point d'entrée du worker Celery
+
+Usage :
+    celery -A worker.celery worker --pool=threads --concurrency=4 --loglevel=info
+
+Le pool de threads est recommandé : l'analyse des PDF utilise déjà son propre
+pool de processus (PDF_IMPORT_WORKERS).
+"""
+from app import create_app
+
+app = create_app()
+celery = app.extensions['celery']
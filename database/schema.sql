@@ -10,6 +10,7 @@ CREATE TABLE IF NOT EXISTS users (
     mot_de_passe VARCHAR(255) NOT NULL,
     niveau VARCHAR(50),
     langue VARCHAR(10) DEFAULT 'fr',
+    calendar_nonce VARCHAR(32),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -21,7 +22,8 @@ CREATE TABLE IF NOT EXISTS subjects (
     titre VARCHAR(100) NOT NULL,
     description TEXT,
     couleur VARCHAR(7) DEFAULT '#0ea5e9',
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Table Tâches/Examens
@@ -43,7 +45,8 @@ CREATE TABLE IF NOT EXISTS schedules (
     id SERIAL PRIMARY KEY,
     user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
     fichier_pdf VARCHAR(255),
-    date_import TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    date_import TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Table Cours (extraits de l'emploi du temps)
@@ -55,7 +58,8 @@ CREATE TABLE IF NOT EXISTS courses (
     heure_fin TIME NOT NULL,
     matiere VARCHAR(100) NOT NULL,
     salle VARCHAR(50),
-    enseignant VARCHAR(100)
+    enseignant VARCHAR(100),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Table Planning
@@ -66,7 +70,8 @@ CREATE TABLE IF NOT EXISTS plannings (
     date_debut DATE NOT NULL,
     date_fin DATE NOT NULL,
     actif BOOLEAN DEFAULT TRUE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Table Sessions d'Étude
@@ -80,7 +85,8 @@ CREATE TABLE IF NOT EXISTS sessions (
     matiere VARCHAR(100),
     description TEXT,
     completee BOOLEAN DEFAULT FALSE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Table Notifications
@@ -91,17 +97,74 @@ CREATE TABLE IF NOT EXISTS notifications (
     message TEXT NOT NULL,
     date_envoi TIMESTAMP NOT NULL,
     lue BOOLEAN DEFAULT FALSE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Table Suppressions (traces lues par la synchronisation incrémentale, purgées après 30 jours)
+CREATE TABLE IF NOT EXISTS deletions (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    entity VARCHAR(30) NOT NULL,
+    entity_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP NOT NULL
+);
+
+-- Table Statistiques quotidiennes (sessions agrégées par jour et par matière, 0 = sans matière)
+CREATE TABLE IF NOT EXISTS daily_stats (
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    jour DATE NOT NULL,
+    subject_id INTEGER NOT NULL DEFAULT 0,
+    sessions_planifiees INTEGER NOT NULL DEFAULT 0,
+    sessions_completees INTEGER NOT NULL DEFAULT 0,
+    minutes_planifiees INTEGER NOT NULL DEFAULT 0,
+    minutes_etudiees INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, jour, subject_id)
+);
+
+-- Table Statistiques des tâches (par jour d'échéance et priorité)
+CREATE TABLE IF NOT EXISTS task_stats (
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    jour DATE NOT NULL,
+    priorite INTEGER NOT NULL,
+    taches_ouvertes INTEGER NOT NULL DEFAULT 0,
+    taches_terminees INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, jour, priorite)
 );
 
 -- Index pour améliorer les performances
 CREATE INDEX idx_users_email ON users(email);
-CREATE INDEX idx_tasks_user_id ON tasks(user_id);
 CREATE INDEX idx_tasks_date_limite ON tasks(date_limite);
-CREATE INDEX idx_sessions_planning_id ON sessions(planning_id);
 CREATE INDEX idx_sessions_date ON sessions(date);
-CREATE INDEX idx_notifications_user_id ON notifications(user_id);
-CREATE INDEX idx_notifications_lue ON notifications(lue);
+
+-- Index composites des listes paginées par curseur (migration 0001_list_indexes)
+CREATE INDEX idx_tasks_user_date_limite ON tasks(user_id, date_limite, id);
+CREATE INDEX idx_tasks_user_etat_date_limite ON tasks(user_id, etat, date_limite, id);
+CREATE INDEX idx_tasks_user_subject_date_limite ON tasks(user_id, subject_id, date_limite, id);
+CREATE INDEX idx_subjects_user_titre ON subjects(user_id, titre, id);
+CREATE INDEX idx_sessions_planning_date ON sessions(planning_id, date, heure_debut, id);
+CREATE INDEX idx_notifications_user_created ON notifications(user_id, created_at, id);
+
+-- Clés étrangères et index partiels des accès fréquents (migration 0002_access_path_indexes)
+CREATE INDEX idx_sessions_task_id ON sessions(task_id);
+CREATE INDEX idx_plannings_user_date_debut ON plannings(user_id, date_debut, id);
+CREATE INDEX idx_schedules_user_date_import ON schedules(user_id, date_import);
+CREATE INDEX idx_plannings_user_actif ON plannings(user_id, id) WHERE actif IS true;
+CREATE INDEX idx_notifications_user_unread ON notifications(user_id, created_at, id) WHERE lue IS false;
+CREATE INDEX idx_notifications_user_date_envoi ON notifications(user_id, date_envoi, id);
+CREATE INDEX idx_tasks_open_date_limite ON tasks(date_limite, id) WHERE etat <> 'terminée';
+CREATE INDEX idx_sessions_pending_date ON sessions(date, id) WHERE completee IS false;
+
+-- Synchronisation incrémentale (migration 0003_sync_updated_at)
+CREATE INDEX idx_subjects_user_updated ON subjects(user_id, updated_at, id);
+CREATE INDEX idx_tasks_user_updated ON tasks(user_id, updated_at, id);
+CREATE INDEX idx_schedules_user_updated ON schedules(user_id, updated_at, id);
+CREATE INDEX idx_courses_schedule_updated ON courses(schedule_id, updated_at, id);
+CREATE INDEX idx_plannings_user_updated ON plannings(user_id, updated_at, id);
+CREATE INDEX idx_sessions_planning_updated ON sessions(planning_id, updated_at, id);
+CREATE INDEX idx_notifications_user_updated ON notifications(user_id, updated_at, id);
+CREATE INDEX idx_deletions_user_deleted ON deletions(user_id, deleted_at, id);
+CREATE INDEX idx_deletions_deleted_at ON deletions(deleted_at);
 
 -- Commentaires
 COMMENT ON TABLE users IS 'Table des utilisateurs de l''application';
@@ -111,4 +174,7 @@ COMMENT ON TABLE schedules IS 'Table des emplois du temps importés';
 COMMENT ON TABLE courses IS 'Table des cours extraits de l''emploi du temps';
 COMMENT ON TABLE plannings IS 'Table des plannings d''étude générés';
 COMMENT ON TABLE sessions IS 'Table des sessions d''étude planifiées';
-COMMENT ON TABLE notifications IS 'Table des notifications envoyées aux utilisateurs';
\ No newline at end of file
+COMMENT ON TABLE notifications IS 'Table des notifications envoyées aux utilisateurs';
+COMMENT ON TABLE daily_stats IS 'Agrégats quotidiens des sessions d''étude par matière';
+COMMENT ON TABLE task_stats IS 'Agrégats des tâches par jour d''échéance et priorité';
+COMMENT ON TABLE deletions IS 'Traces des lignes supprimées pour la synchronisation incrémentale';
\ No newline at end of file